@@ -41,15 +41,22 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'chore_tracker.tracing.TracingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'chore_tracker.replicas.ReplicaPinMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'chore_tracker.middleware.QueryInstrumentationMiddleware',
 ]
 
+# Raise instead of logging a warning when a view runs more queries than its query_budget;
+# the test suite turns this on so that it fails on N+1 regressions
+CHORE_TRACKER_ENFORCE_QUERY_BUDGETS = False
+
 ROOT_URLCONF = 'Chores.urls'
 
 TEMPLATES = [
@@ -78,9 +85,77 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        # Keep connections, and the page cache and mmap behind them, across requests
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    },
+    # Copy of the default database for reporting reads, kept current by refresh_replica;
+    # only used when CHORE_TRACKER_READ_REPLICA names it
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db-replica.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    },
+}
+
+DATABASE_ROUTERS = ['chore_tracker.replicas.ReplicaRouter']
+
+# Database alias the graph, calendar and points views read from, or None to read from default
+CHORE_TRACKER_READ_REPLICA = os.environ.get('CHORE_TRACKER_READ_REPLICA') or None
+
+# Seconds a client reads from the primary after writing, to see its own writes past the replica lag
+CHORE_TRACKER_REPLICA_PIN_SECONDS = 10
+
+# Applied to every new SQLite connection by chore_tracker.db; a value of None skips a pragma
+CHORE_TRACKER_SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -16000,
+    'busy_timeout': 5000,
 }
 
+# Times a write that found the database locked is retried
+CHORE_TRACKER_LOCKED_RETRIES = 3
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+#
+# Graph and calendar data are cached in the 'chore_tracker' cache. Swap its backend for
+# django.core.cache.backends.filebased.FileBasedCache (LOCATION is a directory) or
+# django.core.cache.backends.redis.RedisCache (LOCATION is a redis:// URL, bound the
+# size with maxmemory and maxmemory-policy allkeys-lru on the server).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'chore_tracker': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'chore-tracker',
+        'TIMEOUT': 60 * 60 * 24,
+        # Least recently used entries are evicted beyond this many
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+CHORE_TRACKER_CACHE = 'chore_tracker'
+
+# Assignment forms list children and chores from the cache, which child and chore
+# saves refresh; entries expire after this many seconds as a backstop for
+# changes made by other processes
+CHORE_TRACKER_CHOICES_TIMEOUT = 300
+# Longer child and chore lists are picked with an autocomplete input instead of a <select>
+CHORE_TRACKER_CHOICES_SELECT_LIMIT = 200
+
+# Seconds each process keeps a computed leaderboard; changes made in the same
+# process drop it immediately, 0 disables the cache
+CHORE_TRACKER_LEADERBOARD_TTL = 60
+
+# Seconds a completion API response is replayed for retries of its Idempotency-Key
+CHORE_TRACKER_IDEMPOTENCY_TTL = 24 * 60 * 60
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -113,9 +188,14 @@ USE_TZ = True
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'filters': {
+        'trace_context': {
+            '()': 'chore_tracker.tracing.TraceContextFilter',
+        },
+    },
     'formatters': {
         'verbose': {
-            'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
+            'format': '{levelname} {asctime} {module} {process:d} {thread:d} [{trace_id}] {message}',
             'style': '{',
         },
         'simple': {
@@ -125,21 +205,23 @@ LOGGING = {
     },
     'handlers': {
         'console': {
-            'level': 'DEBUG',
+            'level': 'INFO',
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
         'file': {
+            # Writes from a background thread so requests never wait on the disk
             'level': 'DEBUG',
-            'class': 'logging.FileHandler',
+            'class': 'chore_tracker.tracing.QueueFileHandler',
             'filename': os.path.join(BASE_DIR, 'debug.log'),
+            'filters': ['trace_context'],
             'formatter': 'verbose',
         },
     },
     'loggers': {
         '': {  # root logger
             'handlers': ['console', 'file'],
-            'level': 'DEBUG',
+            'level': 'WARNING',
         },
         'django': {
             'handlers': ['console', 'file'],
@@ -147,13 +229,30 @@ LOGGING = {
             'propagate': False,
         },
         'chore_tracker': {
+            'handlers': ['console', 'file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'chore_tracker.middleware': {
+            # One DEBUG line per request goes to the file only; budget overruns are warnings and reach the console
             'handlers': ['console', 'file'],
             'level': 'DEBUG',
             'propagate': False,
         },
+        'chore_tracker.tracing': {
+            # Gated per request by TracingMiddleware, so DEBUG costs nothing on untraced requests
+            'handlers': ['file'],
+            'level': 'DEBUG',
+            'propagate': False,
+        },
     },
 }
 
+# Requests sent with an "X-Chore-Trace: <token>" header are traced, as is a random
+# sample of all requests. Tracing is off when the token is unset and the rate is 0.
+CHORE_TRACKER_TRACE_TOKEN = os.environ.get('CHORE_TRACKER_TRACE_TOKEN')
+CHORE_TRACKER_TRACE_SAMPLE_RATE = 0.0
+
 MESSAGE_TAGS = {
     messages.DEBUG: 'alert-info',
     messages.INFO: 'alert-info',
@@ -1,7 +1,99 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.template.response import TemplateResponse
 
-from .models import Child, Chore, ChoreAssignment
+from .models import Child, Chore, ChoreAssignment, ChoreSchedule
+from .pagination import CappedCountPaginator
 
-admin.site.register(Child)
-admin.site.register(Chore)
-admin.site.register(ChoreAssignment)
+
+@admin.register(Child)
+class ChildAdmin(admin.ModelAdmin):
+    list_display = ['name', 'age', 'total_points', 'completed_count']
+    readonly_fields = ['total_points', 'completed_count']
+    search_fields = ['name']
+    ordering = ['name']
+
+
+@admin.register(Chore)
+class ChoreAdmin(admin.ModelAdmin):
+    list_display = ['name', 'points']
+    search_fields = ['name']
+    ordering = ['name']
+
+
+class ReassignForm(forms.Form):
+    child = forms.ModelChoiceField(queryset=Child.objects.order_by('name'), widget=forms.NumberInput,
+                                   help_text="Id of the child to give the assignments to")
+
+
+@admin.register(ChoreAssignment)
+class ChoreAssignmentAdmin(admin.ModelAdmin):
+    """Changelist that stays a handful of queries however many assignments there are.
+
+    Rows fetch their child and chore in the same query, the child and chore
+    widgets look names up on demand instead of listing every row, the row
+    count stops at CappedCountPaginator.max_count, and the date hierarchy,
+    filter and ordering are all served by the assignment indexes. The
+    actions each change every selected row with one statement, keeping the
+    points ledger in step.
+    """
+    list_display = ['id', 'child', 'chore', 'date_assigned', 'completed', 'date_completed']
+    list_select_related = ['child', 'chore']
+    list_filter = ['completed']
+    date_hierarchy = 'date_assigned'
+    ordering = ['-date_assigned', '-id']
+    autocomplete_fields = ['child', 'chore']
+    raw_id_fields = ['schedule']
+    paginator = CappedCountPaginator
+    show_full_result_count = False
+    list_per_page = 100
+    actions = ['mark_completed', 'reassign', 'delete_assignments']
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # Replaced by delete_assignments, which doesn't load and delete rows one by one
+        actions.pop('delete_selected', None)
+        return actions
+
+    @admin.action(description="Mark selected assignments completed today", permissions=['change'])
+    def mark_completed(self, request, queryset):
+        completed = queryset.complete()
+        self.message_user(request, f"Marked {len(completed)} chore assignments completed.", messages.SUCCESS)
+
+    @admin.action(description="Reassign selected assignments to another child", permissions=['change'])
+    def reassign(self, request, queryset):
+        form = ReassignForm(request.POST if 'apply' in request.POST else None)
+        if form.is_valid():
+            moved = queryset.reassign(form.cleaned_data['child'])
+            self.message_user(request, f"Reassigned {moved} chore assignments.", messages.SUCCESS)
+            return None
+        return self.confirm_action(request, queryset, 'reassign', "Reassign chore assignments", form)
+
+    @admin.action(description="Delete selected assignments", permissions=['delete'])
+    def delete_assignments(self, request, queryset):
+        if 'apply' in request.POST:
+            deleted = queryset.bulk_delete()
+            self.message_user(request, f"Deleted {deleted} chore assignments.", messages.SUCCESS)
+            return None
+        return self.confirm_action(request, queryset, 'delete_assignments', "Delete chore assignments")
+
+    def confirm_action(self, request, queryset, action, title, form=None):
+        return TemplateResponse(request, 'admin/chore_tracker/choreassignment/confirm_action.html', {
+            **self.admin_site.each_context(request),
+            'title': title,
+            'opts': self.model._meta,
+            'action': action,
+            'form': form,
+            'count': queryset.count(),
+            'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            'select_across': request.POST.get('select_across', '0'),
+        })
+
+
+@admin.register(ChoreSchedule)
+class ChoreScheduleAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'start_date', 'end_date', 'active', 'materialized_through']
+    list_select_related = ['child', 'chore']
+    list_filter = ['active', 'frequency']
+    autocomplete_fields = ['child', 'chore']
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ChoreTrackerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'chore_tracker'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,95 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+_MISSING = object()
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def get_cache():
+    """The cache backing chore_tracker responses, chosen by the CHORE_TRACKER_CACHE alias."""
+    return caches[getattr(settings, 'CHORE_TRACKER_CACHE', 'default')]
+
+
+def child_version(child):
+    """Identify the current state of a child's data.
+
+    The modification time is included alongside the counter so that a row
+    reusing the id of a deleted child (or one from before a flush) can never
+    match entries cached for its predecessor.
+    """
+    modified = child.data_modified.timestamp() if child.data_modified else 0
+    return f'{child.data_version}.{modified:.6f}'
+
+
+def child_key(prefix, child, *parts):
+    """Build a cache key that changes whenever the child's data version does.
+
+    Nothing is ever deleted on invalidation: bumping the version makes old
+    entries unreachable and the backend's size bound evicts them.
+    """
+    return ':'.join(str(part) for part in (prefix, child.pk, child_version(child), *parts))
+
+
+def get_or_set(key, compute, timeout=None):
+    cache = get_cache()
+    value = cache.get(key, _MISSING)
+    with _stats_lock:
+        _stats['hits' if value is not _MISSING else 'misses'] += 1
+    if value is _MISSING:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
+
+
+async def aget_or_set(key, compute, timeout=None):
+    """Async get_or_set; ``compute`` returns an awaitable producing the value."""
+    cache = get_cache()
+    value = await cache.aget(key, _MISSING)
+    with _stats_lock:
+        _stats['hits' if value is not _MISSING else 'misses'] += 1
+    if value is _MISSING:
+        value = await compute()
+        await cache.aset(key, value, timeout)
+    return value
+
+
+def cache_stats():
+    """Return the hit and miss counts of this process along with the hit rate."""
+    with _stats_lock:
+        hits, misses = _stats['hits'], _stats['misses']
+    lookups = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': hits / lookups if lookups else 0.0}
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.update(hits=0, misses=0)
+
+
+def child_validators(child, *parts):
+    """Return the (ETag, Last-Modified timestamp) of a response derived from a child's data."""
+    digest = hashlib.md5(repr((child_version(child), child.name, *parts)).encode(), usedforsecurity=False)
+    etag = f'"{child.pk}-{child.data_version}-{digest.hexdigest()[:12]}"'
+    last_modified = int(child.data_modified.timestamp()) if child.data_modified else None
+    return etag, last_modified
+
+
+def not_modified(request, etag, last_modified):
+    """Return a 304 (or 412) response if the client's copy is current, otherwise None."""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    return set_validators(response, etag, last_modified) if response is not None else None
+
+
+def set_validators(response, etag, last_modified):
+    """Mark a response as revalidatable so browsers ask before reusing it."""
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,64 @@
+import uuid
+
+from django.conf import settings
+
+from .cache import get_cache, get_or_set
+from .models import Child, Chore
+
+# Models offered by the assignment form and the autocomplete endpoint, by URL name
+CHOICE_MODELS = {
+    'child': Child,
+    'chore': Chore,
+}
+
+
+def _version_key(model):
+    return f'choices-version:{model._meta.label_lower}'
+
+
+def choices_version(model):
+    """The token naming the current cached choice list of a model.
+
+    Tokens are random rather than counters so that a version entry evicted
+    from the cache comes back as a new token, never as one used before.
+    """
+    cache = get_cache()
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_choices(model):
+    get_cache().set(_version_key(model), uuid.uuid4().hex, None)
+
+
+def cached_choices(model):
+    """Return ``{pk: name}`` for every row of a model, in name order, from the cache when current."""
+    return get_or_set(
+        f'choices:{model._meta.label_lower}:{choices_version(model)}',
+        lambda: dict(model.objects.order_by('name', 'pk').values_list('pk', 'name')),
+        getattr(settings, 'CHORE_TRACKER_CHOICES_TIMEOUT', 300),
+    )
+
+
+def select_limit():
+    """Most choices rendered as a ``<select>``; longer lists switch to autocomplete."""
+    return getattr(settings, 'CHORE_TRACKER_CHOICES_SELECT_LIMIT', 200)
+
+
+def search_choices(model, term, limit):
+    """Up to ``limit`` (pk, name) pairs whose name contains ``term``, names starting with it first."""
+    term = term.strip().lower()
+    prefixed, containing = [], []
+    for pk, name in cached_choices(model).items():
+        position = name.lower().find(term)
+        if position == 0:
+            prefixed.append((pk, name))
+            if len(prefixed) > limit:
+                break
+        elif position > 0 and len(containing) <= limit:
+            containing.append((pk, name))
+    return (prefixed + containing)[:limit + 1]
@@ -0,0 +1,108 @@
+import functools
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError, transaction
+
+# Applied to every new SQLite connection unless CHORE_TRACKER_SQLITE_PRAGMAS says otherwise
+DEFAULT_SQLITE_PRAGMAS = {
+    # Readers no longer wait for writers, and writers only for each other
+    'journal_mode': 'wal',
+    # Safe with WAL: a power cut can lose the last commits but never corrupt the file
+    'synchronous': 'normal',
+    'mmap_size': 128 * 1024 * 1024,
+    # Negative sizes are in KiB
+    'cache_size': -16000,
+    'busy_timeout': 5000,
+}
+
+# Base delay, in seconds, before retrying a write that found the database locked
+RETRY_BACKOFF = 0.05
+
+
+def sqlite_pragmas():
+    pragmas = getattr(settings, 'CHORE_TRACKER_SQLITE_PRAGMAS', DEFAULT_SQLITE_PRAGMAS)
+    for name in pragmas:
+        if not name.isidentifier():
+            raise ImproperlyConfigured(f'Invalid SQLite pragma name {name!r}')
+    return pragmas
+
+
+def configure_connection(connection):
+    """Apply the configured pragmas to a new SQLite connection; other databases are left alone.
+
+    The pragmas go straight to the driver connection so that they don't
+    count against the query budget of the request that opened it.
+    """
+    if connection.vendor != 'sqlite' or connection.is_in_memory_db():
+        return
+    for name, value in sqlite_pragmas().items():
+        if value is not None:
+            connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+def is_locked_error(error):
+    return 'database is locked' in str(error) or 'database table is locked' in str(error)
+
+
+def retry_on_locked(func):
+    """Retry a write that failed because another connection held the SQLite write lock.
+
+    ``busy_timeout`` makes SQLite wait for the lock in most cases, but a
+    transaction that read before writing is refused at once if another
+    writer got in first. The call is retried up to
+    ``CHORE_TRACKER_LOCKED_RETRIES`` times with jittered exponential backoff.
+    Inside an enclosing transaction the error is raised straight away, as only
+    the caller can safely start that transaction over.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        retries = getattr(settings, 'CHORE_TRACKER_LOCKED_RETRIES', 3)
+        for attempt in range(retries + 1):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as e:
+                if attempt == retries or not is_locked_error(e) or transaction.get_connection().in_atomic_block:
+                    raise
+                time.sleep(RETRY_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    return wrapper
+
+
+def insert_sql(connection, model, field_names):
+    """An INSERT of one row into a model's table, for executemany() with plain tuples of ``field_names`` values.
+
+    Skips the per-field preparation bulk_create does for every value, which
+    dominates bulk loads; values must already be adapted for the database.
+    """
+    ops = connection.ops
+    columns = [model._meta.get_field(name).column for name in field_names]
+    return 'INSERT INTO {} ({}) VALUES ({})'.format(
+        ops.quote_name(model._meta.db_table),
+        ', '.join(ops.quote_name(column) for column in columns),
+        ', '.join(['%s'] * len(columns)),
+    )
+
+
+def reserve_ids(connection, model, count):
+    """Reserve ``count`` consecutive primary keys of a model's SQLite table and return them as a range.
+
+    Django creates SQLite primary keys with AUTOINCREMENT, so the table's
+    sqlite_sequence row holds the largest id ever used. Bumping it is a
+    write, which takes the write lock before anything is read: concurrent
+    writers can't be handed the same ids, and the id of a deleted row is
+    never handed out again. Call it inside the transaction that inserts the
+    rows.
+    """
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO sqlite_sequence (name, seq) SELECT %s, 0 '
+            'WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = %s)',
+            [table, table],
+        )
+        cursor.execute('UPDATE sqlite_sequence SET seq = seq + %s WHERE name = %s RETURNING seq', [count, table])
+        last = cursor.fetchone()[0]
+    return range(last - count + 1, last + 1)
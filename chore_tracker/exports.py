@@ -0,0 +1,66 @@
+import csv
+import json
+
+from .models import ChoreAssignment
+
+EXPORT_FIELDS = (
+    'id', 'child_id', 'child__name', 'chore_id', 'chore__name', 'chore__points',
+    'date_assigned', 'completed', 'date_completed',
+)
+# Column names as written to the export
+EXPORT_COLUMNS = (
+    'id', 'child_id', 'child_name', 'chore_id', 'chore_name', 'chore_points',
+    'date_assigned', 'completed', 'date_completed',
+)
+
+
+def export_queryset(child_id=None, start_date=None, end_date=None, completed=None):
+    """Assignment rows joined with their child and chore, filtered by child, assigned date and status."""
+    queryset = ChoreAssignment.objects.all()
+    if child_id is not None:
+        queryset = queryset.filter(child_id=child_id)
+    if start_date is not None:
+        queryset = queryset.filter(date_assigned__gte=start_date)
+    if end_date is not None:
+        queryset = queryset.filter(date_assigned__lte=end_date)
+    if completed is not None:
+        queryset = queryset.filter(completed=completed)
+    return queryset.values_list(*EXPORT_FIELDS).order_by('id')
+
+
+class _Line:
+    """File-like object whose write() returns what was written, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(queryset, chunk_size=2000):
+    writer = csv.writer(_Line())
+    yield writer.writerow(EXPORT_COLUMNS)
+    yield from _chunks(queryset, chunk_size, writer.writerow)
+
+
+def ndjson_chunks(queryset, chunk_size=2000):
+    def encode(row):
+        return json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str) + '\n'
+
+    yield from _chunks(queryset, chunk_size, encode)
+
+
+def _chunks(queryset, chunk_size, encode):
+    """Encode rows from a chunked cursor, yielding one string per chunk so memory stays flat."""
+    lines = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        lines.append(encode(row))
+        if len(lines) >= chunk_size:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+EXPORT_FORMATS = {
+    'csv': (csv_chunks, 'text/csv'),
+    'ndjson': (ndjson_chunks, 'application/x-ndjson'),
+}
@@ -0,0 +1,42 @@
+import factory
+from django.contrib.auth.models import User
+from django.utils import timezone
+from factory.django import DjangoModelFactory
+
+from .models import Child, Chore, ChoreAssignment
+
+
+class UserFactory(DjangoModelFactory):
+    class Meta:
+        model = User
+
+    username = factory.Sequence(lambda n: f'user{n}')
+    email = factory.LazyAttribute(lambda o: f'{o.username}@example.com')
+    password = factory.PostGenerationMethodCall('set_password', 'testpass123')
+
+
+class ChildFactory(DjangoModelFactory):
+    class Meta:
+        model = Child
+
+    name = factory.Sequence(lambda n: f'Child {n}')
+    age = factory.Faker('random_int', min=5, max=15)
+
+
+class ChoreFactory(DjangoModelFactory):
+    class Meta:
+        model = Chore
+
+    name = factory.Sequence(lambda n: f'Chore {n}')
+    description = factory.Faker('sentence')
+    points = factory.Faker('random_int', min=1, max=10)
+
+
+class ChoreAssignmentFactory(DjangoModelFactory):
+    class Meta:
+        model = ChoreAssignment
+
+    child = factory.SubFactory(ChildFactory)
+    chore = factory.SubFactory(ChoreFactory)
+    date_assigned = factory.LazyFunction(timezone.now)
+    completed = False
@@ -1,6 +1,10 @@
+from datetime import timedelta
+
 from django import forms
+from django.urls import reverse
 
-from .models import Child, Chore, ChoreAssignment
+from .choices import cached_choices, invalidate_choices, select_limit
+from .models import Child, Chore, ChoreAssignment, completion_errors
 
 
 class ChildForm(forms.ModelForm):
@@ -14,6 +18,12 @@ class ChildForm(forms.ModelForm):
 
 
 class ChoreForm(forms.ModelForm):
+    apply_retroactively = forms.BooleanField(
+        required=False,
+        label="Apply the new points to chores already completed",
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+    )
+
     class Meta:
         model = Chore
         fields = ['name', 'description', 'points']
@@ -24,25 +34,163 @@ class ChoreForm(forms.ModelForm):
         }
 
 
+class CachedChoiceWidget(forms.Select):
+    """A select over a model's cached choices that turns into an autocomplete input for long lists.
+
+    Either way the page no longer grows with the table beyond the select
+    limit, and rendering reads the cache rather than the database.
+    """
+    autocomplete_template_name = 'chore_tracker/widgets/autocomplete.html'
+
+    def __init__(self, model, kind, attrs=None):
+        super().__init__(attrs)
+        self.model = model
+        self.kind = kind
+
+    def get_context(self, name, value, attrs):
+        choices = cached_choices(self.model)
+        autocomplete = len(choices) > select_limit()
+        self.template_name = self.autocomplete_template_name if autocomplete else forms.Select.template_name
+        self.choices = [] if autocomplete else [('', '---------'), *choices.items()]
+        context = super().get_context(name, value, attrs)
+        if autocomplete:
+            try:
+                pk = int(value)
+            except (TypeError, ValueError):
+                pk = None
+            label = f'{choices[pk]} (#{pk})' if pk in choices else ''
+            context['widget'].update(label=label, url=reverse('choice_autocomplete', args=[self.kind]))
+        return context
+
+
+class CachedChoiceField(forms.Field):
+    """Pick a row of ``model`` by primary key, validated against its cached choices instead of the database.
+
+    The cache may be per process, so a row added by another process can be
+    missing from it; a primary key not in the cached choices is looked up
+    once, and if the row exists the stale choices are dropped. Cleans to the
+    primary key; the form assigns it to the ``<name>_id`` attribute of its
+    instance.
+    """
+    default_error_messages = {
+        'invalid_choice': 'Select a valid choice. That choice is not one of the available choices.',
+    }
+
+    def __init__(self, model, kind, **kwargs):
+        self.model = model
+        kwargs.setdefault('label', model._meta.verbose_name.capitalize())
+        super().__init__(widget=CachedChoiceWidget(model, kind), **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            pk = int(value.pk if isinstance(value, self.model) else value)
+        except (TypeError, ValueError):
+            raise forms.ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+        if pk not in cached_choices(self.model):
+            if not self.model.objects.filter(pk=pk).exists():
+                raise forms.ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+            invalidate_choices(self.model)
+        return pk
+
+
 class ChoreAssignmentForm(forms.ModelForm):
+    child = CachedChoiceField(Child, 'child')
+    chore = CachedChoiceField(Chore, 'chore')
+
     class Meta:
         model = ChoreAssignment
-        fields = ['child', 'chore', 'date_assigned', 'completed', 'date_completed']
+        fields = ['date_assigned', 'completed', 'date_completed']
         widgets = {
             'date_assigned': forms.DateInput(attrs={'type': 'date'}),
             'date_completed': forms.DateInput(attrs={'type': 'date'}),
         }
 
+    field_order = ['child', 'chore', 'date_assigned', 'completed', 'date_completed']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.initial.setdefault('child', self.instance.child_id)
+        self.initial.setdefault('chore', self.instance.chore_id)
+
     def clean(self):
         cleaned_data = super().clean()
         completed = cleaned_data.get('completed')
         date_completed = cleaned_data.get('date_completed')
         date_assigned = cleaned_data.get('date_assigned')
 
-        if completed and not date_completed:
-            self.add_error('date_completed', "Date completed is required when the chore is marked as completed.")
+        for message in completion_errors(completed, date_assigned, date_completed):
+            self.add_error('date_completed', message)
+
+        for name in ('child', 'chore'):
+            if cleaned_data.get(name) is not None:
+                setattr(self.instance, f'{name}_id', cleaned_data[name])
+
+        return cleaned_data
+
+
+class BulkChoreAssignmentForm(forms.Form):
+    MAX_DAYS = 366
+
+    children = forms.ModelMultipleChoiceField(queryset=Child.objects.all(), widget=forms.CheckboxSelectMultiple)
+    chores = forms.ModelMultipleChoiceField(queryset=Chore.objects.all(), widget=forms.CheckboxSelectMultiple)
+    start_date = forms.DateField(widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}))
+    end_date = forms.DateField(widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}))
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start_date = cleaned_data.get('start_date')
+        end_date = cleaned_data.get('end_date')
+
+        if start_date and end_date:
+            if end_date < start_date:
+                self.add_error('end_date', "End date cannot be earlier than the start date.")
+            elif (end_date - start_date).days >= self.MAX_DAYS:
+                self.add_error('end_date', f"Assign at most {self.MAX_DAYS} days at a time.")
+
+        return cleaned_data
+
+    def get_rows(self):
+        """Yield one assignment row per child, chore and day in the selected range."""
+        start_date = self.cleaned_data['start_date']
+        days = (self.cleaned_data['end_date'] - start_date).days + 1
+        for offset in range(days):
+            for child in self.cleaned_data['children']:
+                for chore in self.cleaned_data['chores']:
+                    yield {'child': child.pk, 'chore': chore.pk, 'date_assigned': start_date + timedelta(days=offset)}
+
+
+class AssignmentExportForm(forms.Form):
+    STATUS_CHOICES = [('', 'All'), ('completed', 'Completed'), ('pending', 'Pending')]
 
-        if date_completed and date_assigned and date_completed < date_assigned:
-            self.add_error('date_completed', "Date completed cannot be earlier than the date assigned.")
+    format = forms.ChoiceField(choices=[('csv', 'CSV'), ('ndjson', 'NDJSON')], required=False)
+    child = forms.IntegerField(min_value=1, required=False)
+    start_date = forms.DateField(required=False)
+    end_date = forms.DateField(required=False)
+    status = forms.ChoiceField(choices=STATUS_CHOICES, required=False)
 
+    def clean(self):
+        cleaned_data = super().clean()
+        start_date = cleaned_data.get('start_date')
+        end_date = cleaned_data.get('end_date')
+        if start_date and end_date and end_date < start_date:
+            self.add_error('end_date', "End date cannot be earlier than the start date.")
         return cleaned_data
+
+    def get_filters(self):
+        """Keyword arguments for exports.export_queryset."""
+        status = self.cleaned_data['status']
+        return {
+            'child_id': self.cleaned_data['child'],
+            'start_date': self.cleaned_data['start_date'],
+            'end_date': self.cleaned_data['end_date'],
+            'completed': {'completed': True, 'pending': False}.get(status),
+        }
+
+
+class AssignmentImportForm(forms.Form):
+    file = forms.FileField(help_text="CSV with a header row, or NDJSON with one object per line.")
+    format = forms.ChoiceField(choices=[('csv', 'CSV'), ('ndjson', 'NDJSON')], initial='csv',
+                               widget=forms.Select(attrs={'class': 'form-select'}))
+    dry_run = forms.BooleanField(required=False, help_text="Validate the file without importing anything.")
@@ -0,0 +1,228 @@
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .db import insert_sql, reserve_ids, retry_on_locked
+from .models import Child, Chore, ChoreAssignment, PointsLedger, completion_errors
+
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y'}
+FALSE_VALUES = {'', '0', 'false', 'f', 'no', 'n'}
+BOOLEAN_VALUES = TRUE_VALUES | FALSE_VALUES
+
+ASSIGNMENT_FIELDS = ['id', 'child', 'chore', 'date_assigned', 'completed', 'date_completed']
+CREDIT_FIELDS = ['child', 'assignment', 'date', 'points', 'completions', 'created_at']
+
+
+def read_csv(file):
+    """Yield (line number, row) from a CSV file with a header row."""
+    reader = csv.DictReader(file)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_ndjson(file):
+    """Yield (line number, row) from a file of JSON objects, one per line; bad lines yield their error."""
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            row = e
+        if not isinstance(row, (dict, ValueError)):
+            row = ValueError('Line is not a JSON object')
+        yield line_number, row
+
+
+IMPORT_FORMATS = {
+    'csv': read_csv,
+    'ndjson': read_ndjson,
+}
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    rejected: int = 0
+    credited: int = 0
+    # The first max_rejects rejections as {'line': n, 'errors': [...], 'row': {...}}
+    rejects: list = field(default_factory=list)
+
+
+class AssignmentImporter:
+    """Validate and insert assignment rows in batches.
+
+    Rows name their child and chore with ``child_name``/``chore_name`` (or
+    ``child_id``/``chore_id``, as written by the export) and give
+    ``date_assigned`` and optionally ``completed`` and ``date_completed``.
+    Names are resolved against maps loaded once up front, every row is
+    checked with the same completion rules as ``ChoreAssignment.clean``, and
+    each batch of valid rows is inserted and credited in its own transaction.
+    Invalid rows are skipped and reported rather than aborting the import.
+    """
+
+    def __init__(self, batch_size=20000, dry_run=False, max_rejects=100, on_reject=None):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.max_rejects = max_rejects
+        self.on_reject = on_reject
+        self.children = self._load(Child)
+        self.chores = self._load(Chore)
+
+    @staticmethod
+    def _load(model):
+        """Return ({name: id}, {id}) for a model, mapping ambiguous names to None."""
+        by_name, ids = {}, set()
+        for pk, name in model.objects.values_list('pk', 'name').iterator():
+            ids.add(pk)
+            by_name[name] = None if name in by_name else pk
+        return by_name, ids
+
+    def run(self, rows):
+        """Import ``(line number, row)`` pairs, as produced by the readers in IMPORT_FORMATS."""
+        result = ImportResult()
+        batch = []
+        for line_number, row in rows:
+            assignment, errors = self.clean_row(row)
+            if errors:
+                self.reject(result, line_number, row, errors)
+                continue
+            batch.append(assignment)
+            if len(batch) >= self.batch_size:
+                self.write(batch, result)
+                batch = []
+        if batch:
+            self.write(batch, result)
+        return result
+
+    def clean_row(self, row):
+        """Return ``(child_id, chore_id, date_assigned, completed, date_completed)`` and any errors."""
+        if isinstance(row, ValueError):
+            return None, [f"Invalid JSON: {row}"]
+
+        errors = []
+        child_id = self._resolve(row, 'child', self.children, errors)
+        chore_id = self._resolve(row, 'chore', self.chores, errors)
+        date_assigned = self._date(row, 'date_assigned', errors, required=True)
+        date_completed = self._date(row, 'date_completed', errors)
+
+        completed = row.get('completed')
+        if not isinstance(completed, bool):
+            text = str(completed if completed is not None else '').strip().lower()
+            if text not in BOOLEAN_VALUES:
+                errors.append(f"Invalid value for completed: {completed!r}")
+            completed = text in TRUE_VALUES
+
+        if errors:
+            return None, errors
+        errors = completion_errors(completed, date_assigned, date_completed)
+        if errors:
+            return None, errors
+        return (child_id, chore_id, date_assigned, completed, date_completed), []
+
+    @staticmethod
+    def _resolve(row, name, lookup, errors):
+        by_name, ids = lookup
+        value = row.get(f'{name}_id')
+        if value not in (None, ''):
+            # JSON gives ints, CSV strings; int() would truncate 1.5 and turn true into 1
+            try:
+                pk = int(value) if isinstance(value, str) or type(value) is int else None
+            except ValueError:
+                pk = None
+            if pk is None:
+                errors.append(f"Invalid value for {name}_id: {value!r}")
+            elif pk not in ids:
+                errors.append(f"{name.capitalize()} {pk} does not exist.")
+            return pk
+
+        value = row.get(f'{name}_name')
+        if value in (None, ''):
+            errors.append(f"{name}_name or {name}_id is required.")
+        elif not isinstance(value, str):
+            errors.append(f"Invalid value for {name}_name: {value!r}")
+        elif value not in by_name:
+            errors.append(f"{name.capitalize()} '{value}' does not exist.")
+        elif by_name[value] is None:
+            errors.append(f"{name.capitalize()} name '{value}' is ambiguous, give {name}_id instead.")
+        else:
+            return by_name[value]
+
+    @staticmethod
+    def _date(row, name, errors, required=False):
+        value = row.get(name)
+        if value in (None, ''):
+            if required:
+                errors.append(f"{name} is required.")
+            return None
+        try:
+            return date.fromisoformat(value)
+        except (TypeError, ValueError):
+            errors.append(f"Invalid value for {name}: {value!r}")
+
+    def write(self, batch, result):
+        if not self.dry_run:
+            self.insert(batch)
+        result.imported += len(batch)
+        result.credited += sum(1 for row in batch if row[3])
+
+    @staticmethod
+    @retry_on_locked
+    def insert(batch):
+        """Insert cleaned rows and credit the completed ones in one transaction.
+
+        As in populate_test_data, rows stay tuples written with executemany
+        and credits are summed into the daily statistics and child counters
+        with one statement each; model instances and bulk_create cost many
+        times the inserts themselves. On SQLite ids are reserved up front from
+        the table's sequence so credits can reference their assignments.
+        Backends with sequences let bulk_create return the ids instead.
+        """
+        using = router.db_for_write(ChoreAssignment)
+        connection = connections[using]
+        ops = connection.ops
+        with transaction.atomic(using=using):
+            if connection.vendor == 'sqlite':
+                ids = reserve_ids(connection, ChoreAssignment, len(batch))
+                rows = [
+                    (pk, child_id, chore_id, ops.adapt_datefield_value(date_assigned), completed,
+                     ops.adapt_datefield_value(date_completed))
+                    for pk, (child_id, chore_id, date_assigned, completed, date_completed) in zip(ids, batch)
+                ]
+                with connection.cursor() as cursor:
+                    cursor.executemany(insert_sql(connection, ChoreAssignment, ASSIGNMENT_FIELDS), rows)
+            else:
+                ids = [assignment.pk for assignment in ChoreAssignment.objects.using(using).bulk_create([
+                    ChoreAssignment(child_id=child_id, chore_id=chore_id, date_assigned=date_assigned,
+                                    completed=completed, date_completed=date_completed)
+                    for child_id, chore_id, date_assigned, completed, date_completed in batch
+                ])]
+
+            completed = [(pk, row) for pk, row in zip(ids, batch) if row[3]]
+            if not completed:
+                return
+            points = dict(Chore.objects.using(using).filter(
+                pk__in={row[1] for _, row in completed}
+            ).values_list('pk', 'points'))
+            created_at = ops.adapt_datetimefield_value(timezone.now())
+            credits = [(row[0], pk, row[4], points[row[1]]) for pk, row in completed]
+            with connection.cursor() as cursor:
+                cursor.executemany(insert_sql(connection, PointsLedger, CREDIT_FIELDS), [
+                    (child_id, pk, ops.adapt_datefield_value(day), credit, 1, created_at)
+                    for child_id, pk, day, credit in credits
+                ])
+            PointsLedger.objects.db_manager(using).apply_totals(
+                (child_id, day, 1, credit) for child_id, _, day, credit in credits
+            )
+
+    def reject(self, result, line_number, row, errors):
+        result.rejected += 1
+        reject = {'line': line_number, 'errors': errors, 'row': row if isinstance(row, dict) else None}
+        if len(result.rejects) < self.max_rejects:
+            result.rejects.append(reject)
+        if self.on_reject:
+            self.on_reject(reject)
@@ -1,11 +1,12 @@
-from django.test import TestCase, Client
+from django.test import Client
 from django.urls import reverse
 from django.utils import timezone
 
 from .models import Child, Chore, ChoreAssignment
+from .tests import QueryBudgetTestCase
 
 
-class ChoreTrackerIntegrationTests(TestCase):
+class ChoreTrackerIntegrationTests(QueryBudgetTestCase):
     def setUp(self):
         self.client = Client()
         self.child = Child.objects.create(name="Test Child", age=10)
@@ -0,0 +1,104 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import F, Q, Sum, Window
+from django.db.models.functions import Coalesce, Rank
+
+from .models import POINT_PERIODS, Child, period_range
+
+_lock = threading.Lock()
+_leaderboards = {}
+_generation = 0
+
+
+@dataclass(frozen=True)
+class LeaderboardEntry:
+    rank: int
+    child_id: int
+    name: str
+    points: int
+    completed: int
+
+
+class Leaderboard:
+    """Every child ranked by points over one reporting period.
+
+    Children on equal points share a rank (1, 1, 3). Entries are held in rank
+    order with an index by child, so top-K is a slice and the rank of any
+    child a dictionary lookup.
+    """
+
+    def __init__(self, period, start_date, end_date, entries):
+        self.period = period
+        self.start_date = start_date
+        self.end_date = end_date
+        self.entries = entries
+        self._positions = {entry.child_id: position for position, entry in enumerate(entries)}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def top(self, k):
+        return self.entries[:k]
+
+    def rank_of(self, child_id):
+        """Return the child's entry, or None for an unknown child."""
+        position = self._positions.get(child_id)
+        return self.entries[position] if position is not None else None
+
+
+def ranking_queryset(period='all', today=None):
+    """Rank every child by points over a period in one windowed aggregate over the daily rollup."""
+    start_date, end_date = period_range(period, today)
+    condition = Q(daily_stats__date__range=[start_date, end_date]) if start_date else None
+    return Child.objects.annotate(
+        points=Coalesce(Sum('daily_stats__points', filter=condition), 0),
+        completed=Coalesce(Sum('daily_stats__completed_count', filter=condition), 0),
+        rank=Window(Rank(), order_by=F('points').desc()),
+    ).order_by('rank', 'name', 'pk').values_list('rank', 'pk', 'name', 'points', 'completed')
+
+
+def build_leaderboard(period='all', today=None):
+    if period not in POINT_PERIODS:
+        raise ValueError(f"Unknown period {period!r}")
+    start_date, end_date = period_range(period, today)
+    entries = [LeaderboardEntry(*row) for row in ranking_queryset(period, today)]
+    return Leaderboard(period, start_date, end_date, entries)
+
+
+def get_leaderboard(period='all', today=None):
+    """Return the leaderboard for a period, from this process's cache when it is fresh.
+
+    Entries are dropped whenever any child's completions change (see
+    ``invalidate``) and otherwise live for ``CHORE_TRACKER_LEADERBOARD_TTL``
+    seconds, which bounds how long other processes' changes take to show;
+    a TTL of 0 turns the cache off.
+    """
+    ttl = getattr(settings, 'CHORE_TRACKER_LEADERBOARD_TTL', 60)
+    if not ttl:
+        return build_leaderboard(period, today)
+
+    _, end_date = period_range(period, today)
+    key = (period, end_date)
+    now = time.monotonic()
+    with _lock:
+        cached = _leaderboards.get(key)
+        generation = _generation
+    if cached and cached[0] > now:
+        return cached[1]
+
+    leaderboard = build_leaderboard(period, today)
+    with _lock:
+        # Don't keep a ranking that was being computed while the data changed
+        if generation == _generation:
+            _leaderboards[key] = (now + ttl, leaderboard)
+    return leaderboard
+
+
+def invalidate():
+    global _generation
+    with _lock:
+        _generation += 1
+        _leaderboards.clear()
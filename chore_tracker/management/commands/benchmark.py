@@ -0,0 +1,185 @@
+import json
+import platform
+import statistics
+import time
+from contextlib import ExitStack
+from io import StringIO
+
+import django
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from chore_tracker.cache import get_cache
+from chore_tracker.models import Child
+from chore_tracker.replicas import replica_alias
+
+
+def benchmark_targets(child):
+    """The endpoints and model calls measured at every scale, keyed by a stable name."""
+    today = timezone.now().date()
+    client = Client()
+    targets = {
+        'child_points': reverse('child_points', args=[child.pk]),
+        'child_calendar': reverse('child_calendar', args=[child.pk]),
+        'chore_graph_data': reverse('chore_graph_data', args=[child.pk]),
+        'chore_assignment_list': reverse('chore_assignment_list'),
+        'chore_assignment_list_by_child': reverse('chore_assignment_list') + '?order_by=child_name',
+    }
+    calls = {name: (lambda url=url: client.get(url)) for name, url in targets.items()}
+    calls['child_get_points_month'] = lambda: child.get_points(period='month')
+    calls['child_get_points_all'] = lambda: child.get_points(period='all')
+    calls['child_point_summary'] = lambda: child.get_point_summary(today=today)
+    return calls
+
+
+def measure(call, repeat):
+    """Time ``repeat`` runs of ``call``, each with the chore_tracker cache cleared so the views do their full work.
+
+    An untimed first run opens connections and warms the database's page
+    cache. Every run must make the same number of queries, counted on the
+    default database and the read replica alike.
+    """
+    call()
+    aliases = {DEFAULT_DB_ALIAS, replica_alias() or DEFAULT_DB_ALIAS}
+    samples, query_counts = [], []
+    for _ in range(repeat):
+        get_cache().clear()
+        with ExitStack() as stack:
+            captured = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in aliases]
+            started = time.perf_counter()
+            result = call()
+            samples.append((time.perf_counter() - started) * 1000)
+        query_counts.append(sum(len(queries) for queries in captured))
+        status = getattr(result, 'status_code', 200)
+        if status >= 400:
+            raise CommandError(f'Benchmark request failed with status {status}')
+    if len(set(query_counts)) > 1:
+        raise CommandError(f'Query counts changed between runs: {query_counts}')
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {
+        'p50_ms': round(cuts[49], 3),
+        'p95_ms': round(cuts[94], 3),
+        'p99_ms': round(cuts[98], 3),
+        'mean_ms': round(statistics.fmean(samples), 3),
+        'queries': query_counts[0],
+    }
+
+
+def seed(scale, seed_value):
+    """Replace the current data with a fixed-size dataset of ``scale`` assignments."""
+    call_command('flush', interactive=False, verbosity=0)
+    households = max(1, scale // 10000)
+    call_command(
+        'populate_test_data', households=households, children=3, chores=8, assignments=scale,
+        days=365, seed=seed_value, stdout=StringIO(),
+    )
+    # Benchmark the busiest child so per-child endpoints see the most history
+    return Child.objects.annotate(assignments=Count('choreassignment')).order_by('-assignments', 'pk').first()
+
+
+def run_benchmarks(scales, repeat=20, seed_value=1, log=None):
+    results = {}
+    for scale in scales:
+        child = seed(scale, seed_value)
+        results[str(scale)] = {}
+        for name, call in benchmark_targets(child).items():
+            results[str(scale)][name] = measure(call, repeat)
+            if log:
+                log(f'{scale:>10} {name:<32} {results[str(scale)][name]}')
+    return results
+
+
+def compare(results, baseline, max_slowdown):
+    """Return a message for every benchmark whose p50 grew by more than ``max_slowdown`` over the baseline."""
+    regressions = []
+    for scale, benchmarks in results.items():
+        for name, current in benchmarks.items():
+            previous = baseline.get(scale, {}).get(name)
+            if not previous:
+                continue
+            if current['p50_ms'] > previous['p50_ms'] * max_slowdown:
+                regressions.append(
+                    f"{name} at {scale}: p50 {current['p50_ms']}ms vs {previous['p50_ms']}ms baseline"
+                )
+            if current['queries'] > previous['queries']:
+                regressions.append(
+                    f"{name} at {scale}: {current['queries']} queries vs {previous['queries']} baseline"
+                )
+    return regressions
+
+
+class Command(BaseCommand):
+    help = ('Seeds throwaway databases at several scales, measures latency percentiles and query counts '
+            'of the chore_tracker views and writes them as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='1000,10000,100000',
+                            help='Comma separated numbers of assignments to seed')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per benchmark')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--baseline', help='Compare with the results in this JSON file')
+        parser.add_argument('--max-slowdown', type=float, default=1.25,
+                            help='Fail when a p50 exceeds the baseline by this factor')
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(scale) for scale in options['scales'].split(',')]
+        except ValueError:
+            raise CommandError('--scales must be a comma separated list of integers')
+        if options['repeat'] < 2:
+            raise CommandError('--repeat must be at least 2')
+
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)['results']
+
+        # Never touch the real databases: benchmark against a throwaway test database, which the
+        # read replica mirrors, as a TEST MIRROR setting would, so replica reads see the seeded data
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        alias = replica_alias()
+        replica = connections[alias] if alias and alias != DEFAULT_DB_ALIAS else None
+        if replica:
+            replica_name = replica.settings_dict['NAME']
+            replica.close()
+            replica.creation.set_as_test_mirror(connection.settings_dict)
+        try:
+            results = run_benchmarks(scales, options['repeat'], options['seed'], log=self.stdout.write)
+        finally:
+            if replica:
+                replica.close()
+                replica.settings_dict['NAME'] = replica_name
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'meta': {
+                'created': timezone.now().isoformat(),
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'database': connection.vendor,
+                'repeat': options['repeat'],
+                'seed': options['seed'],
+            },
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Wrote results to {options['output']}")
+
+        if baseline is not None:
+            regressions = compare(results, baseline, options['max_slowdown'])
+            if regressions:
+                for message in regressions:
+                    self.stderr.write(message)
+                raise CommandError(f'{len(regressions)} benchmark regression(s)')
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from chore_tracker.exports import EXPORT_FORMATS, export_queryset
+from chore_tracker.management.commands.rebuild_daily_stats import parse_date
+
+
+class Command(BaseCommand):
+    help = 'Streams chore assignments, with their child and chore, as CSV or NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--child', type=int, help='Only export this child id')
+        parser.add_argument('--start-date', type=parse_date, help='Earliest assigned date to export')
+        parser.add_argument('--end-date', type=parse_date, help='Latest assigned date to export')
+        parser.add_argument('--status', choices=['completed', 'pending'],
+                            help='Only export completed or pending assignments')
+        parser.add_argument('--output', help='Write to this file instead of standard output')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched from the database at a time')
+
+    def handle(self, *args, **options):
+        if options['start_date'] and options['end_date'] and options['start_date'] > options['end_date']:
+            raise CommandError('--start-date must not be after --end-date')
+
+        queryset = export_queryset(
+            child_id=options['child'],
+            start_date=options['start_date'],
+            end_date=options['end_date'],
+            completed={'completed': True, 'pending': False}.get(options['status']),
+        )
+        encode, _ = EXPORT_FORMATS[options['format']]
+
+        if options['output']:
+            with open(options['output'], 'w', newline='') as f:
+                for chunk in encode(queryset, options['chunk_size']):
+                    f.write(chunk)
+            self.stderr.write(f"Exported assignments to {options['output']}")
+        else:
+            for chunk in encode(queryset, options['chunk_size']):
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,54 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from chore_tracker.imports import IMPORT_FORMATS, AssignmentImporter
+
+
+class Command(BaseCommand):
+    help = 'Imports chore assignments from a CSV or NDJSON file, reporting the rows it rejects'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for standard input")
+        parser.add_argument('--format', choices=sorted(IMPORT_FORMATS),
+                            help='File format (defaults to the file extension, then csv)')
+        parser.add_argument('--batch-size', type=int, default=20000, help='Rows inserted per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Validate every row without writing anything')
+        parser.add_argument('--rejects', help='Write rejected rows, with their errors, to this NDJSON file')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        import_format = options['format'] or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        rejects = open(options['rejects'], 'w') if options['rejects'] else None
+        try:
+            importer = AssignmentImporter(
+                batch_size=options['batch_size'],
+                dry_run=options['dry_run'],
+                on_reject=(lambda reject: rejects.write(json.dumps(reject) + '\n')) if rejects else None,
+            )
+            started = time.perf_counter()
+            if path == '-':
+                result = importer.run(IMPORT_FORMATS[import_format](sys.stdin))
+            else:
+                try:
+                    with open(path, newline='', encoding='utf-8') as f:
+                        result = importer.run(IMPORT_FORMATS[import_format](f))
+                except OSError as e:
+                    raise CommandError(f"Cannot read {path}: {e.strerror}")
+            elapsed = time.perf_counter() - started
+        finally:
+            if rejects:
+                rejects.close()
+
+        for reject in result.rejects[:20]:
+            self.stderr.write(f"Line {reject['line']}: {' '.join(reject['errors'])}")
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {result.imported} assignments ({result.credited} completed) and rejected {result.rejected} '
+            f'in {elapsed:.1f}s, {(result.imported + result.rejected) / max(elapsed, 1e-9):,.0f} rows/s'
+        ))
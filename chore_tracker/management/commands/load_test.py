@@ -0,0 +1,131 @@
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from chore_tracker.db import DEFAULT_SQLITE_PRAGMAS, is_locked_error
+from chore_tracker.models import Child, ChoreAssignment, DailyChildStats
+
+# SQLite's own defaults, restored explicitly because WAL mode persists in the file
+UNTUNED_PRAGMAS = {'journal_mode': 'delete', 'synchronous': 'full'}
+
+
+def read(rng, child_ids):
+    """What the list, points and graph pages ask of the database."""
+    list(Child.objects.all())
+    Child.objects.with_point_totals().get(pk=rng.choice(child_ids))
+    list(DailyChildStats.objects.filter(child_id=rng.choice(child_ids)).order_by('-date')[:30])
+
+
+def write(rng, assignment_ids):
+    """Mark an assignment complete or not, as the Mark Complete button does."""
+    assignment = ChoreAssignment.objects.get(pk=rng.choice(assignment_ids))
+    assignment.completed = not assignment.completed
+    assignment.date_completed = assignment.date_assigned if assignment.completed else None
+    assignment.save()
+
+
+def worker(operation, ids, seed, start, stop, samples, errors):
+    rng = random.Random(seed)
+    start.wait()
+    try:
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                operation(rng, ids)
+            except OperationalError as e:
+                if not is_locked_error(e):
+                    raise
+                errors.append(e)
+                continue
+            samples.append((time.perf_counter() - started) * 1000)
+    finally:
+        connection.close()
+
+
+def run_load(readers, writers, duration):
+    """Run reader and writer threads side by side for ``duration`` seconds and summarise each kind."""
+    child_ids = list(Child.objects.values_list('pk', flat=True))
+    assignment_ids = list(ChoreAssignment.objects.values_list('pk', flat=True))
+    connections.close_all()
+
+    start = threading.Barrier(readers + writers + 1)
+    stop = threading.Event()
+    results = {'read': ([], []), 'write': ([], [])}
+    threads = [
+        threading.Thread(target=worker, args=(read, child_ids, n, start, stop, *results['read']))
+        for n in range(readers)
+    ] + [
+        threading.Thread(target=worker, args=(write, assignment_ids, readers + n, start, stop, *results['write']))
+        for n in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    summary = {}
+    for kind, (samples, errors) in results.items():
+        summary[kind] = {
+            'ops_per_second': round(len(samples) / duration, 1),
+            'p95_ms': round(statistics.quantiles(samples, n=20)[18], 2) if len(samples) > 1 else None,
+            'locked_errors': len(errors),
+        }
+    return summary
+
+
+class Command(BaseCommand):
+    help = ('Measures concurrent read and write throughput on a throwaway SQLite file database, '
+            'with and without the connection tuning in CHORE_TRACKER_SQLITE_PRAGMAS')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4, help='Threads running read queries')
+        parser.add_argument('--writers', type=int, default=2, help='Threads completing assignments')
+        parser.add_argument('--duration', type=float, default=5, help='Seconds to run each configuration')
+        parser.add_argument('--assignments', type=int, default=5000, help='Assignments to seed')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The load test compares SQLite configurations; the default database is not SQLite')
+        if options['readers'] < 0 or options['writers'] < 0 or options['readers'] + options['writers'] == 0:
+            raise CommandError('--readers and --writers must not be negative, and not both 0')
+
+        # A file database, unlike the usual in-memory test database, has the locking being measured
+        directory = tempfile.mkdtemp(prefix='chore-tracker-load-')
+        test_settings = connection.settings_dict.setdefault('TEST', {})
+        old_test_name = test_settings.get('NAME')
+        test_settings['NAME'] = os.path.join(directory, 'load_test.sqlite3')
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            call_command('populate_test_data', children=6, chores=8, assignments=options['assignments'],
+                         days=90, seed=1, stdout=StringIO())
+            results = {}
+            for label, pragmas in (('untuned', UNTUNED_PRAGMAS), ('tuned', DEFAULT_SQLITE_PRAGMAS)):
+                with override_settings(CHORE_TRACKER_SQLITE_PRAGMAS=pragmas):
+                    results[label] = run_load(options['readers'], options['writers'], options['duration'])
+                for kind, summary in results[label].items():
+                    self.stdout.write(f'{label:<8} {kind:<6} {summary}')
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            test_settings['NAME'] = old_test_name
+            shutil.rmtree(directory, ignore_errors=True)
+
+        for kind in ('read', 'write'):
+            before, after = results['untuned'][kind]['ops_per_second'], results['tuned'][kind]['ops_per_second']
+            if before:
+                self.stdout.write(self.style.SUCCESS(f'{kind} throughput: {after / before:.2f}x'))
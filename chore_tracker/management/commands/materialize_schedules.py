@@ -0,0 +1,33 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from chore_tracker.models import ChoreSchedule
+
+
+class Command(BaseCommand):
+    help = 'Expands recurring chore schedules into chore assignments up to a horizon; safe to run repeatedly'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=14,
+                            help='How many days ahead of today to materialize')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError('--days must not be negative')
+
+        today = timezone.now().date()
+        horizon = today + timedelta(days=options['days'])
+        started = time.perf_counter()
+        expanded, occurrences = ChoreSchedule.objects.materialize(
+            horizon, today=today, batch_size=options['batch_size']
+        )
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Materialized {expanded} schedule(s) through {horizon}: '
+            f'{occurrences} occurrence(s) submitted in {elapsed:.2f}s'
+        ))
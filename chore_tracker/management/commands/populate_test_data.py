@@ -1,51 +1,181 @@
 import random
+import time
 from datetime import timedelta
 
-from django.core.management.base import BaseCommand
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
 from django.utils import timezone
 
-from chore_tracker.models import Child, Chore, ChoreAssignment
+from chore_tracker.choices import invalidate_choices
+from chore_tracker.db import insert_sql
+from chore_tracker.models import Child, Chore, ChoreAssignment, PointsLedger
+
+CHILD_NAMES = ["Alice", "Bob", "Charlie", "Dana", "Eli", "Frankie", "Gus", "Hana"]
+
+CHORES = [
+    ("Make bed", "Straighten sheets and comforter", 1),
+    ("Do dishes", "Load and run dishwasher", 2),
+    ("Take out trash", "Empty all trash bins and take to curb", 2),
+    ("Vacuum living room", "Vacuum carpets and rugs", 3),
+    ("Mow lawn", "Mow front and back yard", 5),
+]
+
+
+def numbered(names, index):
+    """Cycle through a pool of names, numbering them once the pool runs out."""
+    name = names[index % len(names)]
+    return name if index < len(names) else f"{name} {index // len(names) + 1}"
 
 
 class Command(BaseCommand):
-    help = 'Populates the database with test data'
+    help = 'Populates the database with synthetic children, chores and chore assignments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--households', type=int, default=1,
+                            help='Number of households; each gets its own children and chores')
+        parser.add_argument('--children', type=int, default=3, help='Children per household')
+        parser.add_argument('--chores', type=int, default=5, help='Chores per household')
+        parser.add_argument('--assignments', type=int, default=100, help='Total chore assignments to create')
+        parser.add_argument('--days', type=int, default=30, help='Days of history to spread assignments over')
+        parser.add_argument('--completion-rate', type=float, default=0.5,
+                            help='Fraction of assignments that are completed')
+        parser.add_argument('--seed', type=int, help='Random seed for reproducible data')
+        parser.add_argument('--batch-size', type=int, default=20000, help='Rows inserted per transaction')
+        parser.add_argument('--use-factories', action='store_true',
+                            help='Build children and chores with the factory-boy factories in chore_tracker.factories')
+
+    def handle(self, *args, **options):
+        for name in ('households', 'children', 'chores'):
+            if options[name] < 1:
+                raise CommandError(f'--{name} must be at least 1')
+        if options['assignments'] < 0 or options['days'] < 0:
+            raise CommandError('--assignments and --days must not be negative')
+        if not 0 <= options['completion_rate'] <= 1:
+            raise CommandError('--completion-rate must be between 0 and 1')
 
-    def handle(self, *args, **kwargs):
         self.stdout.write('Populating database...')
+        rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+
+        households = self.create_households(rng, options)
+        created, completed = self.create_assignments(rng, households, options)
+
+        if completed:
+            # Credits were inserted directly; derive the rollup and counters in set-based passes.
+            end_date = timezone.now().date()
+            call_command('rebuild_daily_stats', start_date=end_date - timedelta(days=options['days']),
+                         end_date=end_date, batch_size=self.batch_size, stdout=self.stdout)
+            Child.objects.recount()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully populated database with test data: {created} assignments ({completed} completed)'
+        ))
+
+    def create_households(self, rng, options):
+        """Create every household's children and chores; returns (child ids, [(chore id, points)]) per household."""
+        if options['use_factories']:
+            import factory.random
+
+            from chore_tracker.factories import ChildFactory, ChoreFactory
 
-        # Create children
-        children = [
-            Child.objects.create(name="Alice", age=8),
-            Child.objects.create(name="Bob", age=10),
-            Child.objects.create(name="Charlie", age=12)
-        ]
-
-        # Create chores
-        chores = [
-            Chore.objects.create(name="Make bed", description="Straighten sheets and comforter", points=1),
-            Chore.objects.create(name="Do dishes", description="Load and run dishwasher", points=2),
-            Chore.objects.create(name="Take out trash", description="Empty all trash bins and take to curb", points=2),
-            Chore.objects.create(name="Vacuum living room", description="Vacuum carpets and rugs", points=3),
-            Chore.objects.create(name="Mow lawn", description="Mow front and back yard", points=5)
-        ]
-
-        # Create chore assignments
+            if options['seed'] is not None:
+                # Seeds Faker as well as factory_boy's own fuzzy attributes
+                factory.random.reseed_random(options['seed'])
+
+        children, chores = [], []
+        for household in range(options['households']):
+            suffix = f" ({household + 1})" if options['households'] > 1 else ""
+            for i in range(options['children']):
+                if options['use_factories']:
+                    child = ChildFactory.build()
+                else:
+                    child = Child(name=numbered(CHILD_NAMES, i) + suffix, age=rng.randint(5, 15))
+                children.append(child)
+            for i in range(options['chores']):
+                if options['use_factories']:
+                    chore = ChoreFactory.build()
+                else:
+                    name, description, points = CHORES[i % len(CHORES)]
+                    if i >= len(CHORES):
+                        name = f"{name} {i // len(CHORES) + 1}"
+                    chore = Chore(name=name + suffix, description=description, points=points)
+                chores.append(chore)
+
+        with transaction.atomic():
+            children = Child.objects.bulk_create(children, batch_size=self.batch_size)
+            chores = Chore.objects.bulk_create(chores, batch_size=self.batch_size)
+        # bulk_create sends no post_save, so refresh the cached form choices here
+        invalidate_choices(Child)
+        invalidate_choices(Chore)
+
+        per_household = []
+        for household in range(options['households']):
+            household_children = children[household * options['children']:(household + 1) * options['children']]
+            household_chores = chores[household * options['chores']:(household + 1) * options['chores']]
+            per_household.append((
+                [child.pk for child in household_children],
+                [(chore.pk, chore.points) for chore in household_chores],
+            ))
+        return per_household
+
+    def create_assignments(self, rng, households, options):
+        """Stream assignments and their ledger credits into the database in fixed-size chunks.
+
+        Building model instances costs more than the inserts themselves at
+        this scale, so rows are generated as tuples and written with
+        executemany. Primary keys are allocated up front so credits can
+        reference their assignments without a round trip.
+        """
+        ops = connection.ops
         end_date = timezone.now().date()
-        start_date = end_date - timedelta(days=30)
-
-        for _ in range(100):  # Create 100 random assignments
-            child = random.choice(children)
-            chore = random.choice(chores)
-            date_assigned = start_date + timedelta(days=random.randint(0, 30))
-            completed = random.choice([True, False])
-            date_completed = date_assigned + timedelta(days=random.randint(0, 3)) if completed else None
-
-            ChoreAssignment.objects.create(
-                child=child,
-                chore=chore,
-                date_assigned=date_assigned,
-                completed=completed,
-                date_completed=date_completed
-            )
-
-        self.stdout.write(self.style.SUCCESS('Successfully populated database with test data'))
+        start_date = end_date - timedelta(days=options['days'])
+        dates = [ops.adapt_datefield_value(start_date + timedelta(days=day)) for day in range(options['days'] + 4)]
+        created_at = ops.adapt_datetimefield_value(timezone.now())
+        insert_assignment = insert_sql(connection, ChoreAssignment, ['id', 'child', 'chore', 'date_assigned',
+                                                                     'completed', 'date_completed'])
+        insert_credit = insert_sql(connection, PointsLedger, ['child', 'assignment', 'date', 'points',
+                                                              'completions', 'created_at'])
+
+        total = options['assignments']
+        last_day = options['days']
+        created = completed = 0
+        started = last_report = time.perf_counter()
+
+        while created < total:
+            size = min(self.batch_size, total - created)
+            assignments, credits = [], []
+            with transaction.atomic():
+                next_id = (ChoreAssignment.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+                for pk in range(next_id, next_id + size):
+                    child_ids, chores = rng.choice(households)
+                    chore_id, chore_points = rng.choice(chores)
+                    child_id = rng.choice(child_ids)
+                    assigned = rng.randint(0, last_day)
+                    if rng.random() < options['completion_rate']:
+                        done = dates[min(assigned + rng.randint(0, 3), last_day)]
+                        assignments.append((pk, child_id, chore_id, dates[assigned], True, done))
+                        credits.append((child_id, pk, done, chore_points, 1, created_at))
+                    else:
+                        assignments.append((pk, child_id, chore_id, dates[assigned], False, None))
+
+                with connection.cursor() as cursor:
+                    cursor.executemany(insert_assignment, assignments)
+                    cursor.executemany(insert_credit, credits)
+            created += size
+            completed += len(credits)
+
+            now = time.perf_counter()
+            if now - last_report >= 5 or created == total:
+                last_report = now
+                self.stdout.write(
+                    f'  {created}/{total} assignments, {created / max(now - started, 1e-9):,.0f} rows/s'
+                )
+
+        # Explicit ids bypass sequences on backends that have them, as with loaddata.
+        with connection.cursor() as cursor:
+            for sql in ops.sequence_reset_sql(no_style(), [ChoreAssignment, PointsLedger]):
+                cursor.execute(sql)
+        return created, completed
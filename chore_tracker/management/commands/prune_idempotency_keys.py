@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from chore_tracker.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = 'Deletes stored idempotency keys older than CHORE_TRACKER_IDEMPOTENCY_TTL'
+
+    def handle(self, *args, **options):
+        deleted, _ = IdempotencyKey.objects.expired().delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired idempotency key(s)'))
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max, Min, Sum
+
+from chore_tracker.models import Child, DailyChildStats, PointsLedger
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f"Invalid date '{value}', expected YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the daily child stats rollup from the points ledger over a date range'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-date', type=parse_date,
+                            help='First day to rebuild (defaults to the earliest ledger entry)')
+        parser.add_argument('--end-date', type=parse_date,
+                            help='Last day to rebuild (defaults to the latest ledger entry)')
+        parser.add_argument('--chunk-days', type=int, default=31,
+                            help='Number of days rebuilt per transaction')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        bounds = PointsLedger.objects.aggregate(first=Min('date'), last=Max('date'))
+        start_date = options['start_date'] or bounds['first']
+        end_date = options['end_date'] or bounds['last']
+        if start_date is None or end_date is None:
+            self.stdout.write('The points ledger is empty, nothing to rebuild')
+            return
+        if start_date > end_date:
+            raise CommandError('--start-date must not be after --end-date')
+
+        rows = 0
+        chunk_start = start_date
+        while chunk_start <= end_date:
+            chunk_end = min(chunk_start + timedelta(days=options['chunk_days'] - 1), end_date)
+            rows += self.rebuild_chunk(chunk_start, chunk_end, options['batch_size'])
+            chunk_start = chunk_end + timedelta(days=1)
+        # Stats were replaced wholesale, so drop everything cached from them
+        Child.objects.touch()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {rows} daily stats rows from {start_date} to {end_date}'
+        ))
+
+    def rebuild_chunk(self, start_date, end_date, batch_size):
+        totals = PointsLedger.objects.filter(date__range=[start_date, end_date]).values(
+            'child_id', 'date'
+        ).annotate(completed_count=Sum('completions'), points=Sum('points')).order_by()
+
+        with transaction.atomic():
+            DailyChildStats.objects.filter(date__range=[start_date, end_date]).delete()
+            created = DailyChildStats.objects.bulk_create(
+                [DailyChildStats(**row) for row in totals],
+                batch_size=batch_size,
+            )
+        return len(created)
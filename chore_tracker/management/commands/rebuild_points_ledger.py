@@ -0,0 +1,93 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Sum
+
+from chore_tracker.models import Child, ChoreAssignment, DailyChildStats, PointsLedger
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the points ledger from completed chore assignments and checks that the two agree'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Only compare the ledger with the assignments, do not rebuild it')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        if not options['check']:
+            with transaction.atomic():
+                deleted, _ = PointsLedger.objects.all().delete()
+                DailyChildStats.objects.all().delete()
+                created = self.rebuild(batch_size)
+                Child.objects.recount()
+            self.stdout.write(f'Replaced {deleted} ledger entries with {created} credits')
+            call_command('rebuild_daily_stats', batch_size=batch_size, stdout=self.stdout)
+
+        mismatches = self.compare(batch_size)
+        if mismatches:
+            for message in mismatches[:20]:
+                self.stderr.write(message)
+            raise CommandError(f'Ledger disagrees with chore assignments on {len(mismatches)} assignment(s)')
+
+        self.stdout.write(self.style.SUCCESS('Points ledger agrees with chore assignments'))
+
+    def rebuild(self, batch_size):
+        completed = ChoreAssignment.objects.filter(
+            completed=True, date_completed__isnull=False
+        ).values_list('id', 'child_id', 'date_completed', 'chore__points').order_by('id')
+
+        created = 0
+        batch = []
+        for pk, child_id, date, points in completed.iterator(chunk_size=batch_size):
+            batch.append(PointsLedger(assignment_id=pk, child_id=child_id, date=date, points=points))
+            if len(batch) >= batch_size:
+                created += len(PointsLedger.objects.bulk_create(batch))
+                batch = []
+        if batch:
+            created += len(PointsLedger.objects.bulk_create(batch))
+        return created
+
+    def compare(self, batch_size):
+        """Merge-join the completed assignments with the ledger's net credits, both ordered by assignment id."""
+        expected = ChoreAssignment.objects.filter(
+            completed=True, date_completed__isnull=False
+        ).values_list('id', 'child_id', 'date_completed').order_by('id').iterator(chunk_size=batch_size)
+
+        credited = PointsLedger.objects.filter(assignment__isnull=False).values(
+            'assignment_id', 'child_id', 'date'
+        ).annotate(completions=Sum('completions')).exclude(completions=0).order_by('assignment_id')
+        credited = (
+            (row['assignment_id'], row['child_id'], row['date'], row['completions'])
+            for row in credited.iterator(chunk_size=batch_size)
+        )
+
+        mismatches = []
+        detached = PointsLedger.objects.filter(assignment__isnull=True).values(
+            'child_id', 'date'
+        ).annotate(completions=Sum('completions')).exclude(completions=0).order_by()
+        for row in detached:
+            mismatches.append(
+                f"Child {row['child_id']} has {row['completions']} unmatched completion(s) on {row['date']}"
+            )
+
+        assignment = next(expected, None)
+        credit = next(credited, None)
+        while assignment is not None or credit is not None:
+            if credit is None or (assignment is not None and assignment[0] < credit[0]):
+                mismatches.append(f'Assignment {assignment[0]} is completed but has no ledger credit')
+                assignment = next(expected, None)
+            elif assignment is None or credit[0] < assignment[0]:
+                mismatches.append(f'Assignment {credit[0]} is credited but not completed')
+                credit = next(credited, None)
+            else:
+                if credit[1:] != (*assignment[1:], 1):
+                    mismatches.append(
+                        f'Assignment {assignment[0]} is credited to child {credit[1]} on {credit[2]} '
+                        f'({credit[3]} completion(s)) instead of child {assignment[1]} on {assignment[2]}'
+                    )
+                assignment = next(expected, None)
+                credit = next(credited, None)
+        return mismatches
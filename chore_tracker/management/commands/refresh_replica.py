@@ -0,0 +1,50 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+def backup_sqlite(source, target_name, pages=-1):
+    """Copy a SQLite database, through Django connection ``source``, over the file ``target_name``.
+
+    SQLite's online backup copies ``pages`` pages per step (all of them when
+    negative) and only locks the source for a step at a time, so the primary
+    keeps serving writes; readers of the target see the old copy until the
+    copy completes.
+    """
+    source.ensure_connection()
+    target = sqlite3.connect(target_name)
+    try:
+        source.connection.backup(target, pages=pages)
+    finally:
+        target.close()
+
+
+class Command(BaseCommand):
+    help = 'Refreshes a SQLite read replica with a consistent copy of the primary database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--replica', help='Replica database alias (defaults to CHORE_TRACKER_READ_REPLICA)')
+        parser.add_argument('--source', default='default', help='Database alias to copy from')
+        parser.add_argument('--pages', type=int, default=1024,
+                            help='Pages copied per step; -1 copies everything in one step')
+
+    def handle(self, *args, **options):
+        alias = options['replica'] or getattr(settings, 'CHORE_TRACKER_READ_REPLICA', None)
+        if not alias:
+            raise CommandError('No replica configured: pass --replica or set CHORE_TRACKER_READ_REPLICA')
+        if alias not in connections or options['source'] not in connections:
+            raise CommandError(f"Unknown database alias {alias if alias not in connections else options['source']}")
+        if alias == options['source']:
+            raise CommandError('The replica and the source must be different databases')
+
+        source, replica = connections[options['source']], connections[alias]
+        if source.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('Only SQLite replicas can be refreshed here; use the database\'s own replication')
+        if replica.is_in_memory_db():
+            raise CommandError(f'Replica {alias} is an in-memory database')
+
+        replica.close()
+        backup_sqlite(source, replica.settings_dict['NAME'], options['pages'])
+        self.stdout.write(self.style.SUCCESS(f"Copied {options['source']} to {alias}"))
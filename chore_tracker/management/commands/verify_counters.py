@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from chore_tracker.models import Child
+
+
+class Command(BaseCommand):
+    help = "Checks every child's total_points and completed_count against the points ledger"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repair', action='store_true',
+                            help='Recompute the counters of children that have drifted')
+
+    def handle(self, *args, **options):
+        drifted = list(Child.objects.with_counter_drift().values_list(
+            'pk', 'name', 'total_points', 'ledger_total_points', 'completed_count', 'ledger_completed_count',
+        ))
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('Child counters agree with the points ledger'))
+            return
+
+        for pk, name, points, ledger_points, completed, ledger_completed in drifted[:20]:
+            self.stderr.write(
+                f'Child {pk} ({name}) has {points} points and {completed} completions, '
+                f'the ledger {ledger_points} points and {ledger_completed} completions'
+            )
+        if not options['repair']:
+            raise CommandError(f'Counters disagree with the points ledger for {len(drifted)} child(ren)')
+
+        Child.objects.filter(pk__in=[row[0] for row in drifted]).recount()
+        self.stdout.write(self.style.SUCCESS(f'Repaired the counters of {len(drifted)} child(ren)'))
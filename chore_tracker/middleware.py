@@ -0,0 +1,147 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_request_stats = ContextVar('chore_tracker_request_stats', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryStats:
+    """Execute wrapper that counts and times every query run while it is installed."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            # Keyed on the SQL alone: formatting the parameters of every query, bulk ones
+            # included, would cost more than the statistics are worth
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        """Queries that repeated the SQL of an earlier one, whatever the parameters: the mark of an N+1 loop."""
+        return sum(count - 1 for count in self.statements.values())
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every connection; feeds the current request's QueryStats, if any.
+
+    The stats travel in a context variable rather than being attached to
+    connections per request because async views run their queries on a
+    worker thread with its own connections, which still sees the context.
+    """
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+class QueryInstrumentationMiddleware:
+    """Measure the queries, database time and render time of every request.
+
+    The numbers are added to the response as a ``Server-Timing`` header and
+    logged at DEBUG to ``chore_tracker.middleware`` with the values attached
+    to the record. Views may declare a ``query_budget``; going over it is logged as a
+    warning, or raises ``QueryBudgetExceeded`` when
+    ``CHORE_TRACKER_ENFORCE_QUERY_BUDGETS`` is set, as the test suite's
+    ``QueryBudgetTestCase`` does to catch N+1 regressions.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, started, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        return self.finish(request, response, stats, started)
+
+    async def __acall__(self, request):
+        stats, started, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        return self.finish(request, response, stats, started)
+
+    def start(self, request):
+        request._query_budget = None
+        request._view_name = None
+        request._render_time = 0.0
+        stats = QueryStats()
+        return stats, time.perf_counter(), _request_stats.set(stats)
+
+    def finish(self, request, response, stats, started):
+        total = time.perf_counter() - started
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"',
+            f'render;dur={request._render_time * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}',
+        ])
+
+        values = {
+            'method': request.method,
+            'path': request.path,
+            'view': request._view_name,
+            'status': response.status_code,
+            'queries': stats.count,
+            'duplicate_queries': stats.duplicates,
+            'db_ms': round(stats.duration * 1000, 2),
+            'render_ms': round(request._render_time * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+            'query_budget': request._query_budget,
+        }
+        logger.debug(
+            '%(method)s %(path)s %(status)s: %(queries)s queries (%(duplicate_queries)s duplicate), '
+            '%(db_ms)sms db, %(render_ms)sms render, %(total_ms)sms total', values, extra={'request_stats': values},
+        )
+
+        budget = request._query_budget
+        if budget is not None and stats.count > budget:
+            message = f'{request._view_name} ran {stats.count} queries, over its budget of {budget}'
+            if getattr(settings, 'CHORE_TRACKER_ENFORCE_QUERY_BUDGETS', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message, extra={'request_stats': values})
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        request._view_name = getattr(view_class or view_func, '__qualname__', None)
+        request._query_budget = getattr(view_class, 'query_budget', None)
+
+    def process_template_response(self, request, response):
+        # Template responses render after the view returns; time the render itself
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._render_time += time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
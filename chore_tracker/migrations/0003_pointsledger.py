@@ -0,0 +1,45 @@
+# Generated by Django 5.0.7 on 2026-10-17 03:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_ledger(apps, schema_editor):
+    ChoreAssignment = apps.get_model('chore_tracker', 'ChoreAssignment')
+    PointsLedger = apps.get_model('chore_tracker', 'PointsLedger')
+    completed = ChoreAssignment.objects.filter(completed=True, date_completed__isnull=False).values_list(
+        'id', 'child_id', 'date_completed', 'chore__points'
+    )
+    PointsLedger.objects.bulk_create(
+        (
+            PointsLedger(assignment_id=pk, child_id=child_id, date=date, points=points)
+            for pk, child_id, date, points in completed.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chore_tracker', '0002_alter_choreassignment_date_assigned'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PointsLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('points', models.IntegerField()),
+                ('completions', models.SmallIntegerField(default=1)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('assignment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entries', to='chore_tracker.choreassignment')),
+                ('child', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='chore_tracker.child')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['child', 'date'], name='chore_track_child_i_b64a68_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_ledger, migrations.RunPython.noop),
+    ]
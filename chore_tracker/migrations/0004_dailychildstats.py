@@ -0,0 +1,45 @@
+# Generated by Django 5.0.7 on 2026-10-17 03:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_daily_stats(apps, schema_editor):
+    PointsLedger = apps.get_model('chore_tracker', 'PointsLedger')
+    DailyChildStats = apps.get_model('chore_tracker', 'DailyChildStats')
+    totals = PointsLedger.objects.values('child_id', 'date').annotate(
+        completed_count=Sum('completions'), points=Sum('points')
+    ).order_by()
+    DailyChildStats.objects.bulk_create(
+        (DailyChildStats(**row) for row in totals.iterator(chunk_size=2000)),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chore_tracker', '0003_pointsledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyChildStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('completed_count', models.IntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('child', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='chore_tracker.child')),
+            ],
+            options={
+                'verbose_name_plural': 'daily child stats',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailychildstats',
+            constraint=models.UniqueConstraint(fields=('child', 'date'), name='unique_daily_child_stats'),
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.7 on 2026-10-17 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chore_tracker', '0004_dailychildstats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='child',
+            index=models.Index(fields=['name'], name='child_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chore',
+            index=models.Index(fields=['name'], name='chore_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='choreassignment',
+            index=models.Index(condition=models.Q(('completed', True)), fields=['child', 'date_completed'], name='assignment_child_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='choreassignment',
+            index=models.Index(condition=models.Q(('completed', True)), fields=['date_completed'], name='assignment_done_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='choreassignment',
+            index=models.Index(fields=['date_assigned', 'id'], name='assignment_assigned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='choreassignment',
+            index=models.Index(fields=['completed', '-date_assigned', '-id'], name='assignment_status_idx'),
+        ),
+    ]
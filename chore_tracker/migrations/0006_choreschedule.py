@@ -0,0 +1,40 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chore_tracker', '0005_assignment_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChoreSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('frequency', models.CharField(choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('custom', 'Custom (RRULE)')], default='daily', max_length=10)),
+                ('interval', models.PositiveSmallIntegerField(default=1)),
+                ('weekdays', models.CharField(blank=True, help_text='Comma separated days for weekly schedules, e.g. MO,WE,FR', max_length=20)),
+                ('rule', models.CharField(blank=True, help_text='RRULE for custom schedules, e.g. FREQ=MONTHLY;BYMONTHDAY=1', max_length=255)),
+                ('start_date', models.DateField(default=django.utils.timezone.now)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('active', models.BooleanField(default=True)),
+                ('materialized_through', models.DateField(blank=True, editable=False, null=True)),
+                ('child', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedules', to='chore_tracker.child')),
+                ('chore', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedules', to='chore_tracker.chore')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='choreassignment',
+            name='schedule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assignments', to='chore_tracker.choreschedule'),
+        ),
+        migrations.AddConstraint(
+            model_name='choreassignment',
+            constraint=models.UniqueConstraint(condition=models.Q(('schedule__isnull', False)), fields=('schedule', 'date_assigned'), name='unique_schedule_occurrence'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chore_tracker', '0006_choreschedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='child',
+            name='data_modified',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='child',
+            name='data_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
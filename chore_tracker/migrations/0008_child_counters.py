@@ -0,0 +1,36 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:30
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Child = apps.get_model('chore_tracker', 'Child')
+    PointsLedger = apps.get_model('chore_tracker', 'PointsLedger')
+    entries = PointsLedger.objects.filter(child=OuterRef('pk')).order_by().values('child')
+    Child.objects.update(
+        total_points=Coalesce(Subquery(entries.annotate(total=Sum('points')).values('total')), 0),
+        completed_count=Coalesce(Subquery(entries.annotate(total=Sum('completions')).values('total')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chore_tracker', '0007_child_data_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='child',
+            name='completed_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='child',
+            name='total_points',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
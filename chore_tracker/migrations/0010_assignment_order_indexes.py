@@ -0,0 +1,21 @@
+# Generated by Django 5.0.7 on 2026-10-17 05:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chore_tracker', '0009_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='choreassignment',
+            index=models.Index(fields=['child', '-date_assigned', '-id'], name='assignment_child_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='choreassignment',
+            index=models.Index(fields=['chore', '-date_assigned', '-id'], name='assignment_chore_order_idx'),
+        ),
+    ]
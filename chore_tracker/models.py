@@ -1,13 +1,122 @@
-from datetime import timedelta
+import hashlib
+from datetime import datetime, timedelta
 
-from django.db import models
+from dateutil import rrule
+from django.conf import settings
+from django.db import connections, models, router, transaction
 from django.core.exceptions import ValidationError
+from django.db.models import Case, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.dispatch import Signal
 from django.utils import timezone
 
+from .db import retry_on_locked
+
+# Look-back window, in days, of each reporting period; 'all' has no window.
+POINT_PERIODS = {
+    'day': 0,
+    'week': 7,
+    'month': 30,
+    'all': None,
+}
+
+# Sent by ChildQuerySet.touch() whenever the completions or points of some children change
+child_data_changed = Signal()
+
+
+def period_range(period, today=None):
+    """Return the (start_date, end_date) bounds of a reporting period, start_date being None for 'all'."""
+    end_date = today or timezone.now().date()
+    days = POINT_PERIODS.get(period)
+    if days is None:
+        return None, end_date
+    return end_date - timedelta(days=days), end_date
+
+
+def period_point_sums(prefix='', today=None):
+    """Conditional SUMs of ledger points, one per reporting period, for a single aggregate query."""
+    sums = {}
+    for period in POINT_PERIODS:
+        start_date, end_date = period_range(period, today)
+        condition = Q(**{f'{prefix}date__range': [start_date, end_date]}) if start_date else None
+        sums[f'points_{period}'] = Coalesce(Sum(f'{prefix}points', filter=condition), 0)
+    return sums
+
+
+def ledger_counters():
+    """Expressions recomputing each child's total_points and completed_count from the points ledger."""
+    entries = PointsLedger.objects.filter(child=OuterRef('pk')).order_by().values('child')
+    return {
+        'total_points': Coalesce(Subquery(entries.annotate(total=Sum('points')).values('total')), 0),
+        'completed_count': Coalesce(Subquery(entries.annotate(total=Sum('completions')).values('total')), 0),
+    }
+
+
+class ChildQuerySet(models.QuerySet):
+    # Rows updated per statement by add_totals, keeping the CASE and its parameters small
+    add_totals_batch_size = 500
+
+    def with_point_totals(self, today=None):
+        """Annotate each child with points_day, points_week, points_month and points_all."""
+        return self.annotate(**period_point_sums('ledger_entries__', today))
+
+    def touch(self, **changes):
+        """Advance the data version of these children, invalidating anything cached against the old one.
+
+        Further field updates may be passed to apply them in the same statement.
+        """
+        updated = self.update(data_version=F('data_version') + 1, data_modified=timezone.now(), **changes)
+        child_data_changed.send(sender=self.model)
+        return updated
+
+    def add_totals(self, totals):
+        """Add ``{child_id: (completions, points)}`` to the children's counters and touch them.
+
+        The additions are made with F() expressions, so concurrent writers
+        never overwrite each other's counts.
+        """
+        child_ids = list(totals)
+        for start in range(0, len(child_ids), self.add_totals_batch_size):
+            batch = child_ids[start:start + self.add_totals_batch_size]
+
+            def delta(index):
+                return Case(*[When(pk=pk, then=Value(totals[pk][index])) for pk in batch],
+                            default=Value(0), output_field=IntegerField())
+
+            self.filter(pk__in=batch).touch(
+                completed_count=F('completed_count') + delta(0),
+                total_points=F('total_points') + delta(1),
+            )
+
+    def recount(self):
+        """Recompute the counters of these children from the points ledger, in one UPDATE."""
+        return self.touch(**ledger_counters())
+
+    def with_counter_drift(self):
+        """Children whose counters disagree with the ledger, annotated with ledger_total_points and ledger_completed_count."""
+        return self.annotate(**{f'ledger_{name}': expression for name, expression in ledger_counters().items()}).exclude(
+            total_points=F('ledger_total_points'), completed_count=F('ledger_completed_count'),
+        )
+
 
 class Child(models.Model):
     name = models.CharField(max_length=100)
     age = models.IntegerField()
+    # Advanced whenever the child's completions change; keys cached responses
+    data_version = models.PositiveIntegerField(default=0, editable=False)
+    data_modified = models.DateTimeField(null=True, blank=True, editable=False)
+    # Running totals of the points ledger, maintained by PointsLedger.objects.record()
+    total_points = models.IntegerField(default=0, editable=False)
+    completed_count = models.IntegerField(default=0, editable=False)
+
+    objects = ChildQuerySet.as_manager()
+
+    derived_fields = ('data_version', 'data_modified', 'total_points', 'completed_count')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='child_name_idx'),
+        ]
 
     def clean(self):
         if self.age < 0 or self.age > 100:
@@ -15,24 +124,27 @@ class Child(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # The version and counters only move through touch(); never write back stale copies
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.derived_fields
+            ]
         return super().save(*args, **kwargs)
 
     def get_points(self, period='all'):
-        end_date = timezone.now().date()
-        if period == 'day':
-            start_date = end_date
-        elif period == 'week':
-            start_date = end_date - timedelta(days=7)
-        elif period == 'month':
-            start_date = end_date - timedelta(days=30)
-        else:  # 'all'
-            start_date = None
-
-        assignments = self.choreassignment_set.filter(completed=True)
+        start_date, end_date = period_range(period)
+
+        entries = self.ledger_entries.all()
         if start_date:
-            assignments = assignments.filter(date_completed__range=[start_date, end_date])
+            entries = entries.filter(date__range=[start_date, end_date])
 
-        return sum(assignment.chore.points for assignment in assignments)
+        return entries.aggregate(total=Sum('points'))['total'] or 0
+
+    def get_point_summary(self, today=None):
+        """Return the points for every reporting period, keyed by period name, from one query."""
+        totals = self.ledger_entries.aggregate(**period_point_sums(today=today))
+        return {period: totals[f'points_{period}'] for period in POINT_PERIODS}
 
     def __str__(self):
         return self.name
@@ -43,26 +155,636 @@ class Chore(models.Model):
     description = models.TextField(blank=True)
     points = models.IntegerField(default=1)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='chore_name_idx'),
+        ]
+
+    def apply_points_retroactively(self):
+        """Re-award every current completion of this chore at its present points value.
+
+        The difference is appended to the ledger as an adjustment for each
+        completion awarded a different value; returns how many were adjusted.
+        """
+        return len(PointsLedger.objects.reprice_chore(self))
+
     def __str__(self):
         return self.name
 
 
+def completion_errors(completed, date_assigned, date_completed):
+    """Return the messages for an assignment's completion fields; shared by model, form and bulk validation."""
+    errors = []
+    if completed and not date_completed:
+        errors.append("Date completed is required when the chore is marked as completed.")
+    if date_completed and date_assigned and date_completed < date_assigned:
+        errors.append("Date completed cannot be earlier than the date assigned.")
+    return errors
+
+
+class ChoreAssignmentQuerySet(models.QuerySet):
+    def _write_db(self):
+        return self._db or router.db_for_write(self.model)
+
+    def complete(self, day=None):
+        """Mark the pending assignments among these completed on ``day`` (today by default) and credit them.
+
+        Assignments not yet due on that day are left alone. The rows are
+        changed by one UPDATE ... RETURNING where the database supports it, so
+        an assignment completed concurrently is never credited twice. Returns
+        the ids of the assignments completed by this call, in ascending order.
+        """
+        day = day or timezone.now().date()
+        using = self._write_db()
+        connection = connections[using]
+        pending = self.using(using).filter(completed=False, date_assigned__lte=day)
+
+        with transaction.atomic(using=using):
+            # can_return_columns_from_insert is about INSERT: MariaDB has no UPDATE ... RETURNING
+            # and Oracle spells it RETURNING ... INTO, so only these two take the one-statement path
+            if connection.vendor in ('sqlite', 'postgresql'):
+                ops = connection.ops
+                opts = self.model._meta
+                table = ops.quote_name(opts.db_table)
+                pk = ops.quote_name(opts.pk.column)
+                completed, date_completed, child_id, chore_id = (
+                    ops.quote_name(opts.get_field(name).column)
+                    for name in ('completed', 'date_completed', 'child', 'chore')
+                )
+                subquery, params = pending.values('pk').query.get_compiler(using).as_sql()
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'UPDATE {table} SET {completed} = %s, {date_completed} = %s '
+                        f'WHERE {pk} IN ({subquery}) AND {completed} = %s RETURNING {pk}, {child_id}, {chore_id}',
+                        [True, ops.adapt_datefield_value(day), *params, False],
+                    )
+                    rows = cursor.fetchall()
+            else:
+                rows = list(pending.select_for_update().values_list('pk', 'child_id', 'chore_id'))
+                self.model.objects.using(using).filter(pk__in=[pk for pk, _, _ in rows]).update(
+                    completed=True, date_completed=day,
+                )
+            PointsLedger.objects.credit_assignments([
+                self.model(pk=pk, child_id=child_id, chore_id=chore_id, completed=True, date_completed=day)
+                for pk, child_id, chore_id in rows
+            ])
+        return sorted(pk for pk, _, _ in rows)
+
+    def reassign(self, child):
+        """Move these assignments to ``child`` with one UPDATE, moving the points already credited for them."""
+        using = self._write_db()
+        moving = self.using(using).exclude(child=child)
+        with transaction.atomic(using=using):
+            credits = list(PointsLedger.objects.current_credits(moving))
+            moved = moving.update(child=child)
+            PointsLedger.objects.record([
+                entry
+                for credit in credits
+                for entry in (
+                    PointsLedger(child_id=credit['child_id'], assignment_id=credit['assignment_id'],
+                                 date=credit['date'], points=-credit['points'], completions=-credit['completions']),
+                    PointsLedger(child_id=child.pk, assignment_id=credit['assignment_id'],
+                                 date=credit['date'], points=credit['points'], completions=credit['completions']),
+                )
+            ])
+        return moved
+
+    def bulk_delete(self):
+        """Delete these assignments with one DELETE, reversing what they were credited first.
+
+        ``delete()`` loads every row to send ``pre_delete``, which reverses
+        each credit with queries of its own; this does the same work in a
+        fixed number of statements. Returns the number of assignments deleted.
+        """
+        using = self._write_db()
+        doomed = self.using(using)
+        with transaction.atomic(using=using):
+            credits = list(PointsLedger.objects.current_credits(doomed))
+            # Detach the ledger as on_delete=SET_NULL would, the reversals along with it
+            PointsLedger.objects.filter(assignment__in=doomed.values('pk')).update(assignment=None)
+            PointsLedger.objects.record([
+                PointsLedger(child_id=credit['child_id'], date=credit['date'],
+                             points=-credit['points'], completions=-credit['completions'])
+                for credit in credits
+            ])
+            # _raw_delete() is private API: a bare DELETE, no signals, no cascades. delete() would load
+            # every row to send pre_delete, whose work, reversing the credits, is done above, and the
+            # ledger's SET_NULL is the only relation, detached above too. It has kept this signature
+            # for many releases, but recheck it, and that no other model references assignments,
+            # when upgrading Django; the bulk_delete tests fail if it goes.
+            return doomed._raw_delete(using)
+
+
+class ChoreAssignmentManager(models.Manager.from_queryset(ChoreAssignmentQuerySet)):
+    @retry_on_locked
+    def bulk_assign(self, rows, batch_size=1000):
+        """Validate and insert many assignments in one transaction.
+
+        ``rows`` are mappings with ``child``, ``chore`` and ``date_assigned``
+        and optionally ``completed`` and ``date_completed``; ids and ISO dates
+        are accepted. Returns ``(created, errors)`` where ``errors`` lists
+        ``{'row': index, 'errors': [...]}`` for every invalid row. Nothing is
+        inserted unless every row is valid.
+        """
+        assignments, errors = self.validate_rows(rows)
+        if errors:
+            return [], errors
+
+        with transaction.atomic():
+            created = self.bulk_create(assignments, batch_size=batch_size)
+            PointsLedger.objects.credit_assignments(created)
+        return created, []
+
+    def validate_rows(self, rows):
+        """Build unsaved assignments from rows, checking every row with two queries in total."""
+        fields = {name: self.model._meta.get_field(name)
+                  for name in ('child', 'chore', 'date_assigned', 'completed', 'date_completed')}
+        assignments, errors, parsed = [], [], []
+
+        for index, row in enumerate(rows):
+            values, row_errors = {}, []
+            for name, field in fields.items():
+                value = row.get(name)
+                if isinstance(value, models.Model):
+                    value = value.pk
+                try:
+                    if name in ('child', 'chore'):
+                        values[name] = int(value)
+                    elif name == 'completed':
+                        values[name] = field.to_python(value or False)
+                    elif value in (None, ''):
+                        values[name] = timezone.now().date() if name == 'date_assigned' else None
+                    else:
+                        values[name] = field.to_python(value)
+                except (TypeError, ValueError, ValidationError):
+                    row_errors.append(f"Invalid value for {name}: {value!r}")
+            if not row_errors:
+                row_errors.extend(completion_errors(
+                    values['completed'], values['date_assigned'], values['date_completed']
+                ))
+            parsed.append((index, values, row_errors))
+
+        child_ids = set(Child.objects.filter(
+            pk__in={values['child'] for _, values, row_errors in parsed if not row_errors}
+        ).values_list('pk', flat=True))
+        chore_ids = set(Chore.objects.filter(
+            pk__in={values['chore'] for _, values, row_errors in parsed if not row_errors}
+        ).values_list('pk', flat=True))
+
+        for index, values, row_errors in parsed:
+            if not row_errors:
+                if values['child'] not in child_ids:
+                    row_errors.append(f"Child {values['child']} does not exist.")
+                if values['chore'] not in chore_ids:
+                    row_errors.append(f"Chore {values['chore']} does not exist.")
+            if row_errors:
+                errors.append({'row': index, 'errors': row_errors})
+                continue
+            assignments.append(self.model(
+                child_id=values['child'],
+                chore_id=values['chore'],
+                date_assigned=values['date_assigned'],
+                completed=values['completed'],
+                date_completed=values['date_completed'],
+            ))
+        return assignments, errors
+
+
 class ChoreAssignment(models.Model):
     child = models.ForeignKey(Child, on_delete=models.CASCADE)
     chore = models.ForeignKey(Chore, on_delete=models.CASCADE)
     date_assigned = models.DateField(default=timezone.now)
     completed = models.BooleanField(default=False)
     date_completed = models.DateField(null=True, blank=True)
+    schedule = models.ForeignKey(
+        'ChoreSchedule', on_delete=models.SET_NULL, null=True, blank=True, related_name='assignments'
+    )
+
+    objects = ChoreAssignmentManager()
+
+    class Meta:
+        constraints = [
+            # Lets the scheduler insert with ignore_conflicts instead of looking rows up
+            models.UniqueConstraint(fields=['schedule', 'date_assigned'], condition=Q(schedule__isnull=False),
+                                    name='unique_schedule_occurrence'),
+        ]
+        indexes = [
+            # Per-child completion history: get_points, graph and calendar style filters
+            models.Index(fields=['child', 'date_completed'], condition=Q(completed=True),
+                         name='assignment_child_done_idx'),
+            # Completions across all children by date (rollup rebuilds, exports)
+            models.Index(fields=['date_completed'], condition=Q(completed=True), name='assignment_done_date_idx'),
+            # List view orderings, with id as a tiebreaker
+            models.Index(fields=['date_assigned', 'id'], name='assignment_assigned_idx'),
+            models.Index(fields=['completed', '-date_assigned', '-id'], name='assignment_status_idx'),
+            # Child and chore name orderings: each child's (chore's) assignments, newest first
+            models.Index(fields=['child', '-date_assigned', '-id'], name='assignment_child_order_idx'),
+            models.Index(fields=['chore', '-date_assigned', '-id'], name='assignment_chore_order_idx'),
+        ]
 
     def clean(self):
-        if self.completed and not self.date_completed:
-            raise ValidationError("Date completed is required when the chore is marked as completed.")
-        if self.date_completed and self.date_completed < self.date_assigned:
-            raise ValidationError("Date completed cannot be earlier than the date assigned.")
+        errors = completion_errors(self.completed, self.date_assigned, self.date_completed)
+        if errors:
+            raise ValidationError(errors)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember which chore the row was loaded with so the ledger can tell
+        # a re-save apart from a change of chore.
+        instance._original_chore_id = instance.__dict__.get('chore_id')
+        return instance
 
+    @retry_on_locked
     def save(self, *args, **kwargs):
         self.full_clean()
-        return super().save(*args, **kwargs)
+        with transaction.atomic():
+            return super().save(*args, **kwargs)
+
+    @retry_on_locked
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
 
     def __str__(self):
         return f"{self.child.name} - {self.chore.name}"
+
+
+class ChoreScheduleManager(models.Manager):
+    def materialize(self, horizon, today=None, batch_size=1000):
+        """Insert the assignments of every active schedule up to ``horizon``.
+
+        Each schedule remembers how far it has been materialized, so repeated
+        runs only expand new days; rows that already exist are skipped by the
+        unique (schedule, date_assigned) constraint. Returns the number of
+        schedules expanded and of occurrences submitted.
+        """
+        today = today or timezone.now().date()
+        schedules = self.filter(active=True, start_date__lte=horizon).filter(
+            Q(materialized_through__isnull=True) | Q(materialized_through__lt=horizon),
+            Q(end_date__isnull=True) | Q(end_date__gte=today),
+        )
+
+        expanded = occurrences = 0
+        last_pk = 0
+        while True:
+            chunk = list(schedules.filter(pk__gt=last_pk).order_by('pk')[:batch_size])
+            if not chunk:
+                return expanded, occurrences
+            occurrences += self._materialize_chunk(chunk, horizon, today, batch_size)
+            expanded += len(chunk)
+            last_pk = chunk[-1].pk
+
+    def _materialize_chunk(self, schedules, horizon, today, batch_size):
+        assignments = []
+        for schedule in schedules:
+            start = max(schedule.start_date, today)
+            if schedule.materialized_through:
+                start = max(start, schedule.materialized_through + timedelta(days=1))
+            assignments.extend(
+                ChoreAssignment(
+                    child_id=schedule.child_id,
+                    chore_id=schedule.chore_id,
+                    schedule_id=schedule.pk,
+                    date_assigned=day,
+                )
+                for day in schedule.occurrences(start, horizon)
+            )
+        with transaction.atomic():
+            ChoreAssignment.objects.bulk_create(assignments, batch_size=batch_size, ignore_conflicts=True)
+            self.filter(pk__in=[schedule.pk for schedule in schedules]).update(materialized_through=horizon)
+        return len(assignments)
+
+
+class ChoreSchedule(models.Model):
+    """A recurring assignment of a chore to a child, expanded ahead of time by materialize_schedules."""
+    DAILY = 'daily'
+    WEEKLY = 'weekly'
+    CUSTOM = 'custom'
+    FREQUENCY_CHOICES = [
+        (DAILY, 'Daily'),
+        (WEEKLY, 'Weekly'),
+        (CUSTOM, 'Custom (RRULE)'),
+    ]
+    WEEKDAYS = {'MO': rrule.MO, 'TU': rrule.TU, 'WE': rrule.WE, 'TH': rrule.TH,
+                'FR': rrule.FR, 'SA': rrule.SA, 'SU': rrule.SU}
+
+    child = models.ForeignKey(Child, on_delete=models.CASCADE, related_name='schedules')
+    chore = models.ForeignKey(Chore, on_delete=models.CASCADE, related_name='schedules')
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default=DAILY)
+    interval = models.PositiveSmallIntegerField(default=1)
+    weekdays = models.CharField(max_length=20, blank=True,
+                                help_text="Comma separated days for weekly schedules, e.g. MO,WE,FR")
+    rule = models.CharField(max_length=255, blank=True,
+                            help_text="RRULE for custom schedules, e.g. FREQ=MONTHLY;BYMONTHDAY=1")
+    start_date = models.DateField(default=timezone.now)
+    end_date = models.DateField(null=True, blank=True)
+    active = models.BooleanField(default=True)
+    materialized_through = models.DateField(null=True, blank=True, editable=False)
+
+    objects = ChoreScheduleManager()
+
+    # Fields deciding which assignments a schedule expands to
+    EXPANSION_FIELDS = ('child_id', 'chore_id', 'frequency', 'interval', 'weekdays', 'rule',
+                        'start_date', 'end_date', 'active')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the row expanded to when loaded so save() can tell
+        # whether its materialized assignments still hold.
+        instance._original_expansion = instance.expansion()
+        return instance
+
+    def clean(self):
+        if self.end_date and self.end_date < self.start_date:
+            raise ValidationError("End date cannot be earlier than the start date.")
+        if self.frequency == self.WEEKLY:
+            unknown = [day for day in self.weekday_codes() if day not in self.WEEKDAYS]
+            if unknown:
+                raise ValidationError(f"Unknown weekdays: {', '.join(unknown)}.")
+        if self.frequency == self.CUSTOM:
+            if not self.rule:
+                raise ValidationError("A rule is required for custom schedules.")
+            try:
+                self.get_rrule()
+            except (ValueError, TypeError) as e:
+                raise ValidationError(f"Invalid rule: {e}")
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        with transaction.atomic():
+            if not self._state.adding and self.expansion() != getattr(self, '_original_expansion', None):
+                # Drop the pending days the old rule expanded ahead; the next run re-expands from today.
+                ChoreAssignment.objects.filter(
+                    schedule=self, completed=False, date_assigned__gt=timezone.now().date(),
+                ).bulk_delete()
+                self.materialized_through = None
+            result = super().save(*args, **kwargs)
+        self._original_expansion = self.expansion()
+        return result
+
+    def expansion(self):
+        return tuple(self.__dict__.get(name) for name in self.EXPANSION_FIELDS)
+
+    def weekday_codes(self):
+        return [day.strip().upper() for day in self.weekdays.split(',') if day.strip()]
+
+    def get_rrule(self):
+        dtstart = datetime.combine(self.start_date, datetime.min.time())
+        until = datetime.combine(self.end_date, datetime.min.time()) if self.end_date else None
+        if self.frequency == self.CUSTOM:
+            # Always a set, which RDATE, EXDATE and EXRULE lines need; occurrences() applies end_date
+            return rrule.rrulestr(self.rule, dtstart=dtstart, forceset=True)
+        if self.frequency == self.WEEKLY:
+            byweekday = [self.WEEKDAYS[day] for day in self.weekday_codes()] or None
+            return rrule.rrule(rrule.WEEKLY, dtstart=dtstart, interval=self.interval, byweekday=byweekday, until=until)
+        return rrule.rrule(rrule.DAILY, dtstart=dtstart, interval=self.interval, until=until)
+
+    def occurrences(self, start, end):
+        """Dates on which the chore is due between start and end, inclusive."""
+        if self.end_date:
+            end = min(end, self.end_date)
+        if end < start:
+            return []
+        rule = self.get_rrule()
+        return [
+            moment.date() for moment in rule.between(
+                datetime.combine(start, datetime.min.time()),
+                datetime.combine(end, datetime.min.time()),
+                inc=True,
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.chore} for {self.child} ({self.get_frequency_display()})"
+
+
+class PointsLedgerManager(models.Manager):
+    def current_credits(self, assignments):
+        """Net credits held by a queryset of assignments, as dicts with the assignment_id added."""
+        return (
+            self.filter(assignment__in=assignments.values('pk'))
+            .values('assignment_id', 'child_id', 'date')
+            .annotate(points=Sum('points'), completions=Sum('completions'))
+            .filter(completions__gt=0)
+            .order_by()
+        )
+
+    def current_credit(self, assignment_id):
+        """Return the net credit (child_id, date, points, completions) held by an assignment, if any."""
+        credits = list(
+            self.filter(assignment_id=assignment_id)
+            .values('child_id', 'date')
+            .annotate(points=Sum('points'), completions=Sum('completions'))
+            .filter(completions__gt=0)
+            .order_by()
+        )
+        return credits[0] if credits else None
+
+    def sync_assignment(self, assignment):
+        """Append the entries needed to bring the ledger in line with an assignment's saved state."""
+        credit = self.current_credit(assignment.pk)
+        wants_credit = assignment.completed and assignment.date_completed is not None
+        original_chore_id = getattr(assignment, '_original_chore_id', None)
+
+        if (credit and wants_credit
+                and credit['child_id'] == assignment.child_id
+                and credit['date'] == assignment.date_completed
+                and original_chore_id in (None, assignment.chore_id)):
+            # Still the same completion: keep the points it was awarded.
+            return []
+
+        entries = []
+        if credit:
+            entries.append(self._reversal(credit, assignment))
+        if wants_credit:
+            entries.append(self.model(
+                child_id=assignment.child_id,
+                assignment=assignment,
+                date=assignment.date_completed,
+                points=assignment.chore.points,
+            ))
+        return self.record(entries)
+
+    def credit_assignments(self, assignments):
+        """Credit newly inserted assignments that are already completed, looking chore points up in one query."""
+        completed = [a for a in assignments if a.completed and a.date_completed is not None]
+        if not completed:
+            return []
+        points = dict(Chore.objects.filter(pk__in={a.chore_id for a in completed}).values_list('pk', 'points'))
+        return self.record([
+            self.model(child_id=a.child_id, assignment_id=a.pk, date=a.date_completed, points=points[a.chore_id])
+            for a in completed
+        ])
+
+    def reprice_chore(self, chore):
+        """Append adjustments bringing every completion of a chore to its current points."""
+        credits = (
+            self.filter(assignment__chore=chore)
+            .values('assignment_id', 'child_id', 'date')
+            .annotate(points=Sum('points'), completions=Sum('completions'))
+            .filter(completions__gt=0)
+            .exclude(points=chore.points)
+            .order_by()
+        )
+        return self.record([
+            self.model(child_id=credit['child_id'], assignment_id=credit['assignment_id'], date=credit['date'],
+                       points=chore.points - credit['points'], completions=0)
+            for credit in credits
+        ])
+
+    def reverse_assignment(self, assignment):
+        """Append a reversal for whatever an assignment that is being deleted was credited."""
+        credit = self.current_credit(assignment.pk)
+        if not credit:
+            return []
+        # The deleted row's entries are detached by SET_NULL, so the reversal
+        # is written detached as well.
+        return self.record([self._reversal(credit, None)])
+
+    def record(self, entries):
+        """Persist new entries, fold them into the per-day statistics and child counters and invalidate cached data."""
+        if not entries:
+            return []
+        entries = self.bulk_create(entries)
+        self.apply_totals([(entry.child_id, entry.date, entry.completions, entry.points) for entry in entries])
+        return entries
+
+    def apply_totals(self, rows):
+        """Fold the ``(child_id, date, completions, points)`` of new entries into the daily statistics and counters.
+
+        For entries inserted without going through record().
+        """
+        deltas, totals = {}, {}
+        for child_id, day, completions, points in rows:
+            day_completions, day_points = deltas.get((child_id, day), (0, 0))
+            deltas[child_id, day] = (day_completions + completions, day_points + points)
+            child_completions, child_points = totals.get(child_id, (0, 0))
+            totals[child_id] = (child_completions + completions, child_points + points)
+        DailyChildStats.objects.apply_deltas(deltas)
+        Child.objects.add_totals(totals)
+
+    def _reversal(self, credit, assignment):
+        return self.model(
+            child_id=credit['child_id'],
+            assignment=assignment,
+            date=credit['date'],
+            points=-credit['points'],
+            completions=-credit['completions'],
+        )
+
+
+class PointsLedger(models.Model):
+    """Append-only record of points credited to and reversed from a child.
+
+    Each completed assignment contributes one credit holding the chore's
+    points at the moment of completion; un-completing, editing or deleting it
+    appends a matching reversal instead of rewriting the original row.
+    """
+    child = models.ForeignKey(Child, on_delete=models.CASCADE, related_name='ledger_entries')
+    assignment = models.ForeignKey(
+        ChoreAssignment, on_delete=models.SET_NULL, null=True, blank=True, related_name='ledger_entries'
+    )
+    date = models.DateField()
+    points = models.IntegerField()
+    completions = models.SmallIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = PointsLedgerManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['child', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.child_id} {self.date}: {self.points:+d}"
+
+
+class DailyChildStatsManager(models.Manager):
+    def apply_deltas(self, deltas):
+        """Add ``{(child_id, date): (completions, points)}`` deltas to their rows, creating missing ones."""
+        if not deltas:
+            return
+        connection = connections[self._db or router.db_for_write(self.model)]
+        if connection.vendor in ('sqlite', 'postgresql'):
+            # Both support adding to the existing row in a single upsert statement
+            ops = connection.ops
+            table = ops.quote_name(self.model._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f'INSERT INTO {table} (child_id, date, completed_count, points) VALUES (%s, %s, %s, %s) '
+                    f'ON CONFLICT (child_id, date) DO UPDATE SET '
+                    f'completed_count = {table}.completed_count + excluded.completed_count, '
+                    f'points = {table}.points + excluded.points',
+                    [(child_id, ops.adapt_datefield_value(date), completions, points)
+                     for (child_id, date), (completions, points) in deltas.items()],
+                )
+            return
+
+        self.bulk_create(
+            [self.model(child_id=child_id, date=date) for child_id, date in deltas],
+            ignore_conflicts=True,
+        )
+        for (child_id, date), (completions, points) in deltas.items():
+            self.filter(child_id=child_id, date=date).update(
+                completed_count=F('completed_count') + completions,
+                points=F('points') + points,
+            )
+
+
+class DailyChildStats(models.Model):
+    """Per child, per day rollup of completed chores, maintained from the points ledger."""
+    child = models.ForeignKey(Child, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    completed_count = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+
+    objects = DailyChildStatsManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['child', 'date'], name='unique_daily_child_stats'),
+        ]
+        verbose_name_plural = 'daily child stats'
+
+    def __str__(self):
+        return f"{self.child_id} {self.date}: {self.completed_count} chores, {self.points} points"
+
+
+class IdempotencyKeyManager(models.Manager):
+    def expired(self, now=None):
+        cutoff = (now or timezone.now()) - timedelta(seconds=IdempotencyKey.ttl())
+        return self.filter(created_at__lt=cutoff)
+
+
+class IdempotencyKey(models.Model):
+    """The response to a request sent with an ``Idempotency-Key`` header, replayed when it is retried.
+
+    Saved in the same transaction as the change the request made, so a key
+    exists exactly when its change was committed. ``fingerprint`` is a hash
+    of the request, catching a key reused for a different request.
+    """
+    key = models.CharField(max_length=255, unique=True)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    response = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    objects = IdempotencyKeyManager()
+
+    @staticmethod
+    def ttl():
+        """Seconds a key is honoured for, ``CHORE_TRACKER_IDEMPOTENCY_TTL``; older keys may be used afresh."""
+        return getattr(settings, 'CHORE_TRACKER_IDEMPOTENCY_TTL', 24 * 60 * 60)
+
+    @staticmethod
+    def fingerprint_of(request):
+        return hashlib.sha256(f'{request.method} {request.path}\n'.encode() + request.body).hexdigest()
+
+    def is_expired(self, now=None):
+        return self.created_at < (now or timezone.now()) - timedelta(seconds=self.ttl())
+
+    def __str__(self):
+        return self.key
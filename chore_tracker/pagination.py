@@ -0,0 +1,154 @@
+import base64
+import binascii
+import json
+from datetime import date
+
+from django.core.paginator import Paginator
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Paginate a queryset by seeking past the last row seen instead of using OFFSET.
+
+    ``ordering`` must end in a unique field (normally ``id``) so that every row
+    has a distinct position, and needs an index whose columns and directions
+    match it for pages to be index range scans rather than sorts. Pages then
+    start with a seek on the leading column instead of reading and skipping
+    the rows before them.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+
+    def page(self, cursor=None):
+        queryset = self.queryset.annotate(**{
+            f'keyset_{i}': F(field.lstrip('-')) for i, field in enumerate(self.ordering)
+        })
+        if not cursor:
+            rows = list(queryset.order_by(*self.ordering)[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            return KeysetPage(rows, next_cursor=self._cursor(rows[-1], 'next') if has_more else None)
+
+        direction, values = self.decode(cursor)
+        if direction == 'next':
+            rows = self._rows_after(queryset, self.ordering, values)
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            return KeysetPage(
+                rows,
+                next_cursor=self._cursor(rows[-1], 'next') if has_more else None,
+                previous_cursor=self._cursor(rows[0], 'previous') if rows else None,
+            )
+
+        reverse = tuple(self._reverse(field) for field in self.ordering)
+        rows = self._rows_after(queryset, reverse, values)
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page][::-1]
+        return KeysetPage(
+            rows,
+            next_cursor=self._cursor(rows[-1], 'next') if rows else None,
+            previous_cursor=self._cursor(rows[0], 'previous') if has_more else None,
+        )
+
+    def _rows_after(self, queryset, ordering, values):
+        """Up to per_page + 1 rows following ``values``, reading the seek ranges in order until there are enough."""
+        rows = []
+        for condition in self._seek(ordering, values):
+            rows += queryset.filter(condition).order_by(*ordering)[:self.per_page + 1 - len(rows)]
+            if len(rows) > self.per_page:
+                break
+        return rows
+
+    def encode(self, direction, values):
+        payload = json.dumps([direction, self.ordering, values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode(self, cursor):
+        try:
+            payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            direction, ordering, values = json.loads(payload)
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise InvalidCursor(cursor)
+        if direction not in ('next', 'previous') or tuple(ordering) != self.ordering \
+                or not isinstance(values, list) or len(values) != len(self.ordering):
+            raise InvalidCursor(cursor)
+        return direction, values
+
+    def _cursor(self, obj, direction):
+        values = [getattr(obj, f'keyset_{i}') for i in range(len(self.ordering))]
+        return self.encode(direction, [value.isoformat() if isinstance(value, date) else value for value in values])
+
+    @staticmethod
+    def _reverse(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _seek(ordering, values):
+        """The ranges of rows that follow ``values`` in ``ordering``, in order, each one index range scan.
+
+        For ``(a, b, c)`` these are ``a = x AND b <= y AND (b < y OR c > z)``,
+        then ``a > x``. A single ``(a > x) OR (a = x AND ...)`` condition is
+        exact too, but no index can seek on it, so its pages would start by
+        reading every row before the cursor.
+        """
+        def strict(i):
+            field = ordering[i]
+            return Q(**{f"{field.lstrip('-')}__{'lt' if field.startswith('-') else 'gt'}": values[i]})
+
+        def equal(depth):
+            # IN rather than exact, which compiles a boolean to the bare column, and SQLite can't seek on that
+            return Q(**{f"{field.lstrip('-')}__in": [value] for field, value in zip(ordering[:depth], values[:depth])})
+
+        if len(ordering) == 1:
+            return [strict(0)]
+        # The last two fields share one query: a bound on the first that the
+        # index seeks on, and the tiebreak to skip the rows already shown
+        field = ordering[-2]
+        bound = Q(**{f"{field.lstrip('-')}__{'lte' if field.startswith('-') else 'gte'}": values[-2]})
+        ranges = [equal(len(ordering) - 2) & bound & (strict(len(ordering) - 2) | strict(len(ordering) - 1))]
+        ranges += [equal(depth) & strict(depth) for depth in range(len(ordering) - 3, -1, -1)]
+        return ranges
+
+
+class CappedCountPaginator(Paginator):
+    """Paginator that stops counting rows at ``max_count``.
+
+    ``COUNT(*)`` over a large filtered table reads every matching row;
+    counting a LIMITed subquery reads at most ``max_count`` of them. Pages
+    past the cap are not offered: narrow the filters to reach them.
+    """
+    max_count = 10000
+
+    @cached_property
+    def count(self):
+        return self.object_list.order_by()[:self.max_count].count()
@@ -0,0 +1,98 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+_read_alias = ContextVar('chore_tracker_read_alias', default=None)
+
+PIN_COOKIE = 'chore_tracker_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def replica_alias():
+    """The database alias analytic reads go to, or None when no replica is configured."""
+    return getattr(settings, 'CHORE_TRACKER_READ_REPLICA', None)
+
+
+@contextmanager
+def read_from_replica():
+    """Send the reads made in this context to the replica; writes still go to the primary."""
+    token = _read_alias.set(replica_alias())
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def pinned_to_primary(request):
+    """Whether the client wrote recently enough that the replica may not have caught up yet."""
+    return PIN_COOKIE in request.COOKIES
+
+
+class ReplicaRouter:
+    """Route reads to the replica inside ``read_from_replica``, everything else to the default database."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data, so relations across them are fine
+        return True
+
+
+class ReplicaReadMixin:
+    """Serve a view's safe requests from the read replica.
+
+    Only for read-only views: they see the replica's possibly slightly stale
+    copy of the data. Clients pinned to the primary by
+    ``ReplicaPinMiddleware`` are served from the primary instead.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if not replica_alias() or request.method not in SAFE_METHODS or pinned_to_primary(request):
+            return super().dispatch(request, *args, **kwargs)
+        if self.view_is_async:
+            return self._adispatch_from_replica(request, *args, **kwargs)
+        with read_from_replica():
+            return super().dispatch(request, *args, **kwargs)
+
+    async def _adispatch_from_replica(self, request, *args, **kwargs):
+        with read_from_replica():
+            return await super().dispatch(request, *args, **kwargs)
+
+
+class ReplicaPinMiddleware:
+    """Keep a client on the primary database for a while after it writes, so it reads its own writes.
+
+    Any successful unsafe request sets a short-lived cookie; ReplicaReadMixin
+    views read from the primary while it is present. Its lifetime,
+    ``CHORE_TRACKER_REPLICA_PIN_SECONDS``, should exceed the replica's lag.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.pin(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.pin(request, await self.get_response(request))
+
+    def pin(self, request, response):
+        if replica_alias() and request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=getattr(settings, 'CHORE_TRACKER_REPLICA_PIN_SECONDS', 10),
+                httponly=True, samesite='Lax',
+            )
+        return response
@@ -0,0 +1,51 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import leaderboard
+from .choices import invalidate_choices
+from .db import configure_connection
+from .middleware import record_query
+from .models import Child, Chore, ChoreAssignment, PointsLedger, child_data_changed
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def tune_connection(sender, connection, **kwargs):
+    configure_connection(connection)
+
+
+@receiver(post_save, sender=ChoreAssignment)
+def sync_points_ledger(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    PointsLedger.objects.sync_assignment(instance)
+    instance._original_chore_id = instance.chore_id
+
+
+@receiver(pre_delete, sender=ChoreAssignment)
+def reverse_points_ledger(sender, instance, **kwargs):
+    PointsLedger.objects.reverse_assignment(instance)
+
+
+@receiver(child_data_changed)
+@receiver(post_save, sender=Child)
+@receiver(post_delete, sender=Child)
+def invalidate_leaderboards(sender, **kwargs):
+    leaderboard.invalidate()
+    # Again once committed, in case a ranking was rebuilt from the old data in between
+    transaction.on_commit(leaderboard.invalidate)
+
+
+@receiver(post_save, sender=Child)
+@receiver(post_delete, sender=Child)
+@receiver(post_save, sender=Chore)
+@receiver(post_delete, sender=Chore)
+def invalidate_choice_lists(sender, **kwargs):
+    invalidate_choices(sender)
@@ -1,55 +1,46 @@
+import asyncio
 import json
-from datetime import timedelta
+import logging
+import os
+import sqlite3
+import tempfile
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-import factory
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import OperationalError, connection, connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
-from factory.django import DjangoModelFactory
 
-from .forms import ChoreAssignmentForm
-from .models import Child, Chore, ChoreAssignment
+from . import leaderboard, timeseries, views
+from .cache import cache_stats, get_cache, reset_cache_stats
+from .choices import cached_choices
+from .db import retry_on_locked
+from .factories import ChildFactory, ChoreAssignmentFactory, ChoreFactory, UserFactory
+from .forms import BulkChoreAssignmentForm, CachedChoiceField, ChoreAssignmentForm
+from .management.commands.benchmark import compare, measure, run_benchmarks
+from .management.commands.refresh_replica import backup_sqlite
+from .middleware import QueryBudgetExceeded
+from .pagination import CappedCountPaginator
+from .replicas import PIN_COOKIE
+from .tracing import QueueFileHandler, start_trace, stop_trace, trace, tracing_enabled
+from .models import Child, Chore, ChoreAssignment, ChoreSchedule, DailyChildStats, IdempotencyKey, PointsLedger
 
 
-class UserFactory(DjangoModelFactory):
-    class Meta:
-        model = User
+@override_settings(CHORE_TRACKER_ENFORCE_QUERY_BUDGETS=True)
+class QueryBudgetTestCase(TestCase):
+    """Fails a test whose requests run more queries than their view's query_budget, catching N+1 regressions."""
 
-    username = factory.Sequence(lambda n: f'user{n}')
-    email = factory.LazyAttribute(lambda o: f'{o.username}@example.com')
-    password = factory.PostGenerationMethodCall('set_password', 'testpass123')
 
-
-class ChildFactory(DjangoModelFactory):
-    class Meta:
-        model = Child
-
-    name = factory.Sequence(lambda n: f'Child {n}')
-    age = factory.Faker('random_int', min=5, max=15)
-
-
-class ChoreFactory(DjangoModelFactory):
-    class Meta:
-        model = Chore
-
-    name = factory.Sequence(lambda n: f'Chore {n}')
-    description = factory.Faker('sentence')
-    points = factory.Faker('random_int', min=1, max=10)
-
-
-class ChoreAssignmentFactory(DjangoModelFactory):
-    class Meta:
-        model = ChoreAssignment
-
-    child = factory.SubFactory(ChildFactory)
-    chore = factory.SubFactory(ChoreFactory)
-    date_assigned = factory.LazyFunction(timezone.now)
-    completed = False
-
-
-class ChildModelTests(TestCase):
+class ChildModelTests(QueryBudgetTestCase):
     def setUp(self):
         self.child = Child.objects.create(name="Test Child", age=10)
         self.chore1 = Chore.objects.create(name="Chore 1", points=5)
@@ -95,7 +86,118 @@ class ChildModelTests(TestCase):
         self.assertEqual(self.child.get_points(period='all'), 0)
 
 
-class ChoreAssignmentTests(TestCase):
+class ChildPointSummaryTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.child = Child.objects.create(name="Test Child", age=10)
+        self.chore = Chore.objects.create(name="Chore", points=5)
+        self.today = timezone.now().date()
+
+    def complete(self, days_ago):
+        ChoreAssignment.objects.create(
+            child=self.child,
+            chore=self.chore,
+            date_assigned=self.today - timedelta(days=days_ago),
+            completed=True,
+            date_completed=self.today - timedelta(days=days_ago)
+        )
+
+    def test_summary_matches_get_points(self):
+        for days_ago in (0, 3, 12, 45):
+            self.complete(days_ago)
+        with self.assertNumQueries(1):
+            summary = self.child.get_point_summary()
+        self.assertEqual(summary, {'day': 5, 'week': 10, 'month': 15, 'all': 20})
+        for period, points in summary.items():
+            self.assertEqual(self.child.get_points(period=period), points)
+
+    def test_with_point_totals_annotates_every_child(self):
+        self.complete(0)
+        idle = Child.objects.create(name="Idle Child", age=7)
+        children = {child.pk: child for child in Child.objects.with_point_totals()}
+        self.assertEqual(children[self.child.pk].points_all, 5)
+        self.assertEqual(children[idle.pk].points_day, 0)
+
+    def test_points_view_query_count_is_constant(self):
+        url = reverse('child_points', args=[self.child.id])
+        self.complete(0)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        for days_ago in range(1, 40):
+            self.complete(days_ago)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url)
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(response.context['daily_points'], 5)
+        self.assertEqual(response.context['weekly_points'], 40)
+        self.assertEqual(response.context['monthly_points'], 155)
+        self.assertEqual(response.context['total_points'], 200)
+
+
+class PointsLedgerTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.child = Child.objects.create(name="Test Child", age=10)
+        self.chore = Chore.objects.create(name="Chore", points=5)
+        self.today = timezone.now().date()
+        self.assignment = ChoreAssignment.objects.create(
+            child=self.child,
+            chore=self.chore,
+            completed=True,
+            date_completed=self.today
+        )
+
+    def test_completion_writes_credit(self):
+        entry = PointsLedger.objects.get(assignment=self.assignment)
+        self.assertEqual(entry.points, 5)
+        self.assertEqual(entry.date, self.today)
+
+    def test_chore_points_change_does_not_rewrite_history(self):
+        self.chore.points = 50
+        self.chore.save()
+        assignment = ChoreAssignment.objects.get(pk=self.assignment.pk)
+        assignment.date_assigned = self.today
+        assignment.save()
+        self.assertEqual(self.child.get_points(), 5)
+        self.assertEqual(PointsLedger.objects.count(), 1)
+
+    def test_uncomplete_and_delete_append_reversals(self):
+        self.assignment.completed = False
+        self.assignment.date_completed = None
+        self.assignment.save()
+        self.assertEqual(self.child.get_points(), 0)
+
+        self.assignment.completed = True
+        self.assignment.date_completed = self.today
+        self.assignment.save()
+        self.assertEqual(self.child.get_points(), 5)
+
+        self.assignment.delete()
+        self.assertEqual(self.child.get_points(), 0)
+        self.assertEqual(PointsLedger.objects.count(), 4)
+
+    def test_chore_change_recredits_with_new_points(self):
+        other = Chore.objects.create(name="Other", points=8)
+        self.assignment.chore = other
+        self.assignment.save()
+        self.assertEqual(self.child.get_points(), 8)
+
+    def test_chore_delete_cascade_reverses_points(self):
+        self.chore.delete()
+        self.assertEqual(self.child.get_points(), 0)
+
+    def test_rebuild_command_agrees_with_assignments(self):
+        PointsLedger.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_points_ledger', stdout=out)
+        self.assertIn('agrees', out.getvalue())
+        self.assertEqual(self.child.get_points(), 5)
+
+    def test_check_command_reports_drift(self):
+        PointsLedger.objects.all().delete()
+        with self.assertRaises(CommandError):
+            call_command('rebuild_points_ledger', '--check', stdout=StringIO(), stderr=StringIO())
+
+
+class ChoreAssignmentTests(QueryBudgetTestCase):
     def setUp(self):
         self.user = UserFactory()
         self.client.login(username=self.user.username, password='testpass123')
@@ -221,7 +323,278 @@ class ChoreAssignmentTests(TestCase):
         )
 
 
-class ChoreTests(TestCase):
+class BulkChoreAssignmentTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.children = ChildFactory.create_batch(3)
+        self.chores = ChoreFactory.create_batch(2)
+        self.today = timezone.now().date()
+
+    def test_bulk_form_assigns_every_combination(self):
+        response = self.client.post(reverse('chore_assignment_bulk_create'), {
+            'children': [child.pk for child in self.children],
+            'chores': [chore.pk for chore in self.chores],
+            'start_date': self.today,
+            'end_date': self.today + timedelta(days=6),
+        })
+        self.assertRedirects(response, reverse('chore_assignment_list'))
+        self.assertEqual(ChoreAssignment.objects.count(), 3 * 2 * 7)
+
+    def test_bulk_form_rejects_reversed_range(self):
+        response = self.client.post(reverse('chore_assignment_bulk_create'), {
+            'children': [self.children[0].pk],
+            'chores': [self.chores[0].pk],
+            'start_date': self.today,
+            'end_date': self.today - timedelta(days=1),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('end_date', response.context['form'].errors)
+
+    def test_api_reports_per_row_errors_and_creates_nothing(self):
+        rows = [
+            {'child': self.children[0].pk, 'chore': self.chores[0].pk, 'date_assigned': str(self.today)},
+            {'child': self.children[0].pk, 'chore': self.chores[0].pk, 'date_assigned': str(self.today),
+             'completed': True},
+            {'child': 0, 'chore': self.chores[0].pk, 'date_assigned': str(self.today)},
+            {'child': self.children[0].pk, 'chore': self.chores[0].pk, 'date_assigned': 'yesterday'},
+        ]
+        response = self.client.post(reverse('chore_assignment_bulk_api'), {'assignments': rows},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        errors = {error['row']: error['errors'] for error in json.loads(response.content)['errors']}
+        self.assertEqual(sorted(errors), [1, 2, 3])
+        self.assertEqual(errors[1], ["Date completed is required when the chore is marked as completed."])
+        self.assertEqual(errors[2], ["Child 0 does not exist."])
+        self.assertEqual(ChoreAssignment.objects.count(), 0)
+
+    def test_api_credits_completed_rows(self):
+        chore = self.chores[0]
+        rows = [{'child': self.children[0].pk, 'chore': chore.pk, 'date_assigned': str(self.today),
+                 'completed': True, 'date_completed': str(self.today)}] * 3
+        response = self.client.post(reverse('chore_assignment_bulk_api'), {'assignments': rows},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(json.loads(response.content)['created'], 3)
+        self.assertEqual(self.children[0].get_points(), 3 * chore.points)
+
+    def test_api_stops_generating_rows_past_the_limit(self):
+        payload = {
+            'children': [child.pk for child in self.children],
+            'chores': [chore.pk for chore in self.chores],
+            'start_date': str(self.today),
+            'end_date': str(self.today + timedelta(days=300)),
+        }
+        generated = []
+        get_rows = BulkChoreAssignmentForm.get_rows
+
+        def counting_get_rows(form):
+            for row in get_rows(form):
+                generated.append(row)
+                yield row
+
+        with mock.patch.object(views.ChoreAssignmentBulkAPIView, 'max_rows', 10), \
+                mock.patch.object(BulkChoreAssignmentForm, 'get_rows', counting_get_rows):
+            response = self.client.post(reverse('chore_assignment_bulk_api'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content), {'error': 'At most 10 assignments per request.'})
+        self.assertEqual(len(generated), 11)
+        self.assertEqual(ChoreAssignment.objects.count(), 0)
+
+    def test_bulk_assign_does_not_query_per_row(self):
+        rows = [
+            {'child': child.pk, 'chore': chore.pk, 'date_assigned': self.today + timedelta(days=day)}
+            for day in range(400) for child in self.children for chore in self.chores
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            created, errors = ChoreAssignment.objects.bulk_assign(rows)
+        self.assertEqual((len(created), errors), (2400, []))
+        self.assertLess(len(queries), 30)
+
+
+class ChoreScheduleTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.child = ChildFactory()
+        self.chore = ChoreFactory()
+        self.start = date(2024, 1, 1)  # a Monday
+
+    def schedule(self, **kwargs):
+        return ChoreSchedule.objects.create(child=self.child, chore=self.chore, start_date=self.start, **kwargs)
+
+    def test_occurrences_follow_rule(self):
+        end = self.start + timedelta(days=13)
+        daily = self.schedule(frequency=ChoreSchedule.DAILY, interval=2)
+        weekly = self.schedule(frequency=ChoreSchedule.WEEKLY, weekdays='MO,FR')
+        custom = self.schedule(frequency=ChoreSchedule.CUSTOM, rule='FREQ=MONTHLY;BYMONTHDAY=1')
+        self.assertEqual(len(daily.occurrences(self.start, end)), 7)
+        self.assertEqual(weekly.occurrences(self.start, end), [
+            date(2024, 1, 1), date(2024, 1, 5), date(2024, 1, 8), date(2024, 1, 12)
+        ])
+        self.assertEqual(custom.occurrences(self.start, date(2024, 3, 31)), [
+            date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)
+        ])
+
+    def test_custom_rule_sets(self):
+        custom = self.schedule(frequency=ChoreSchedule.CUSTOM, end_date=date(2024, 1, 10),
+                               rule='RRULE:FREQ=WEEKLY;BYDAY=MO\nEXDATE:20240108T000000\nRDATE:20240103T000000')
+        self.assertEqual(custom.occurrences(self.start, date(2024, 1, 31)), [date(2024, 1, 1), date(2024, 1, 3)])
+
+    def test_invalid_rules_are_rejected(self):
+        with self.assertRaises(ValidationError):
+            self.schedule(frequency=ChoreSchedule.WEEKLY, weekdays='MO,XX')
+        with self.assertRaises(ValidationError):
+            self.schedule(frequency=ChoreSchedule.CUSTOM, rule='FREQ=SOMETIMES')
+        with self.assertRaises(ValidationError):
+            self.schedule(frequency=ChoreSchedule.CUSTOM, rule='RRULE:FREQ=DAILY\nEXRULE:FREQ=SOMETIMES')
+
+    def test_materialize_is_idempotent(self):
+        self.schedule(frequency=ChoreSchedule.DAILY)
+        self.schedule(frequency=ChoreSchedule.WEEKLY, weekdays='SA')
+        horizon = self.start + timedelta(days=13)
+        ChoreSchedule.objects.materialize(horizon, today=self.start)
+        self.assertEqual(ChoreAssignment.objects.count(), 14 + 2)
+
+        # Nothing is due again until the horizon moves
+        with self.assertNumQueries(1):
+            self.assertEqual(ChoreSchedule.objects.materialize(horizon, today=self.start), (0, 0))
+
+        ChoreSchedule.objects.update(materialized_through=None)
+        ChoreSchedule.objects.materialize(horizon + timedelta(days=7), today=self.start)
+        self.assertEqual(ChoreAssignment.objects.count(), 21 + 3)
+
+    def test_saving_an_unchanged_schedule_keeps_its_assignments(self):
+        schedule = ChoreSchedule.objects.create(child=self.child, chore=self.chore)
+        ChoreSchedule.objects.materialize(timezone.now().date() + timedelta(days=6))
+        schedule = ChoreSchedule.objects.get()
+        horizon = schedule.materialized_through
+        schedule.save()
+        schedule.refresh_from_db()
+        self.assertEqual(schedule.materialized_through, horizon)
+        self.assertEqual(schedule.assignments.count(), 7)
+
+    def test_changing_a_schedule_drops_its_pending_days(self):
+        today = timezone.now().date()
+        schedule = ChoreSchedule.objects.create(child=self.child, chore=self.chore)
+        ChoreSchedule.objects.materialize(today + timedelta(days=6))
+        done = schedule.assignments.get(date_assigned=today + timedelta(days=1))
+        done.completed, done.date_completed = True, today + timedelta(days=1)
+        done.save()
+
+        schedule = ChoreSchedule.objects.get()
+        schedule.interval = 2
+        schedule.save()
+        self.assertIsNone(schedule.materialized_through)
+        # Today's assignment and completed ones stay; the rest follow the new rule
+        self.assertEqual(sorted(schedule.assignments.values_list('date_assigned', flat=True)),
+                         [today, today + timedelta(days=1)])
+        ChoreSchedule.objects.materialize(today + timedelta(days=6))
+        self.assertEqual(schedule.assignments.count(), 5)
+
+        schedule.end_date = today
+        schedule.save()
+        self.assertEqual(schedule.assignments.count(), 2)
+        schedule.active = False
+        schedule.save()
+        ChoreSchedule.objects.materialize(today + timedelta(days=6))
+        self.assertEqual(schedule.assignments.count(), 2)
+        call_command('rebuild_points_ledger', '--check', stdout=StringIO())
+
+    def test_command_expands_from_today(self):
+        schedule = ChoreSchedule.objects.create(child=self.child, chore=self.chore)
+        out = StringIO()
+        call_command('materialize_schedules', '--days', '6', stdout=out)
+        self.assertIn('Materialized 1 schedule(s)', out.getvalue())
+        self.assertEqual(schedule.assignments.count(), 7)
+        call_command('materialize_schedules', '--days', '6', stdout=StringIO())
+        self.assertEqual(schedule.assignments.count(), 7)
+
+
+def list_queryset(order_by):
+    """The assignment list's queryset for an ``order_by`` choice."""
+    view = views.ChoreAssignmentListView()
+    view.setup(RequestFactory().get(reverse('chore_assignment_list'), {'order_by': order_by}))
+    return view.get_queryset()
+
+
+class ChoreAssignmentPaginationTests(QueryBudgetTestCase):
+    def setUp(self):
+        children = [ChildFactory(name=name) for name in ('Alice', 'Bob', 'Alice')]
+        chores = ChoreFactory.create_batch(3)
+        today = timezone.now().date()
+        for i in range(60):
+            ChoreAssignmentFactory(
+                child=children[i % 3],
+                chore=chores[i % 2],
+                date_assigned=today - timedelta(days=i % 7),
+                completed=bool(i % 4 == 0),
+                date_completed=today if i % 4 == 0 else None
+            )
+
+    def walk(self, order_by):
+        url = reverse('chore_assignment_list')
+        response = self.client.get(url, {'order_by': order_by})
+        pages = [list(response.context['chore_assignments'])]
+        while response.context['page_obj'].has_next():
+            response = self.client.get(url, {'order_by': order_by, 'cursor': response.context['page_obj'].next_cursor})
+            pages.append(list(response.context['chore_assignments']))
+        return pages, response
+
+    def test_every_ordering_visits_each_row_once_in_order(self):
+        for order_by in views.ChoreAssignmentListView.orderings:
+            with self.subTest(order_by=order_by):
+                pages, _ = self.walk(order_by)
+                self.assertEqual([len(page) for page in pages], [25, 25, 10])
+                self.assertEqual([a for page in pages for a in page], list(list_queryset(order_by)))
+
+    def test_name_orderings_page_without_the_sqlite_form(self):
+        for order_by in views.ChoreAssignmentListView.name_orderings:
+            with self.subTest(order_by=order_by), mock.patch.object(connection, 'vendor', 'postgresql'):
+                pages, _ = self.walk(order_by)
+                self.assertEqual([len(page) for page in pages], [25, 25, 10])
+                self.assertEqual([a for page in pages for a in page], list(list_queryset(order_by)))
+
+    def test_previous_cursor_returns_preceding_page(self):
+        pages, response = self.walk('child_name')
+        url = reverse('chore_assignment_list')
+        response = self.client.get(url, {'order_by': 'child_name', 'cursor': response.context['page_obj'].previous_cursor})
+        self.assertEqual(list(response.context['chore_assignments']), pages[1])
+        response = self.client.get(url, {'order_by': 'child_name', 'cursor': response.context['page_obj'].previous_cursor})
+        self.assertEqual(list(response.context['chore_assignments']), pages[0])
+        self.assertFalse(response.context['page_obj'].has_previous())
+
+    def test_deep_pages_cost_the_same_queries(self):
+        url = reverse('chore_assignment_list')
+        with CaptureQueriesContext(connection) as first:
+            response = self.client.get(url)
+        cursor = response.context['page_obj'].next_cursor
+        with CaptureQueriesContext(connection) as second:
+            self.client.get(url, {'cursor': cursor})
+        self.assertEqual(len(first), len(second))
+        self.assertFalse([q for q in second.captured_queries if 'COUNT' in q['sql'] or 'OFFSET' in q['sql']])
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite specific')
+    def test_cursor_pages_seek_an_index(self):
+        url = reverse('chore_assignment_list')
+        table = ChoreAssignment._meta.db_table
+        for order_by in views.ChoreAssignmentListView.orderings:
+            with self.subTest(order_by=order_by):
+                response = self.client.get(url, {'order_by': order_by})
+                with CaptureQueriesContext(connection) as queries:
+                    self.client.get(url, {'order_by': order_by, 'cursor': response.context['page_obj'].next_cursor})
+                for query in queries.captured_queries:
+                    with connection.cursor() as cursor:
+                        cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                        plan = [row[-1] for row in cursor.fetchall()]
+                    self.assertTrue([step for step in plan if step.startswith(f'SEARCH {table} USING INDEX')], plan)
+                    self.assertFalse([step for step in plan if 'TEMP B-TREE' in step], plan)
+
+    def test_invalid_cursor_is_not_found(self):
+        url = reverse('chore_assignment_list')
+        self.assertEqual(self.client.get(url, {'cursor': 'not-a-cursor'}).status_code, 404)
+        _, response = self.walk('child_name')
+        cursor = response.context['page_obj'].previous_cursor
+        self.assertEqual(self.client.get(url, {'order_by': 'chore_name', 'cursor': cursor}).status_code, 404)
+
+
+class ChoreTests(QueryBudgetTestCase):
     def setUp(self):
         self.user = UserFactory()
         self.client.login(username=self.user.username, password='testpass123')
@@ -265,7 +638,7 @@ class ChoreTests(TestCase):
         self.assertEqual(Chore.objects.count(), chore_count - 1, "Should delete the chore")
 
 
-class ChildTests(TestCase):
+class ChildTests(QueryBudgetTestCase):
     def setUp(self):
         self.user = UserFactory()
         self.client.login(username=self.user.username, password='testpass123')
@@ -315,8 +688,715 @@ class ChildTests(TestCase):
             Child.objects.create(name="Invalid Child", age=101)
 
 
-class CalendarViewTests(TestCase):
+class DailyChildStatsTests(QueryBudgetTestCase):
     def setUp(self):
+        self.child = Child.objects.create(name="Test Child", age=10)
+        self.chore = Chore.objects.create(name="Chore", points=5)
+        self.today = timezone.now().date()
+
+    def stats(self):
+        return list(DailyChildStats.objects.filter(child=self.child).values_list('date', 'completed_count', 'points'))
+
+    def test_rollup_follows_assignment_changes(self):
+        first = ChoreAssignment.objects.create(
+            child=self.child, chore=self.chore, completed=True, date_completed=self.today
+        )
+        ChoreAssignment.objects.create(
+            child=self.child, chore=self.chore, completed=True, date_completed=self.today
+        )
+        self.assertEqual(self.stats(), [(self.today, 2, 10)])
+
+        first.completed = False
+        first.date_completed = None
+        first.save()
+        self.assertEqual(self.stats(), [(self.today, 1, 5)])
+
+        ChoreAssignment.objects.filter(child=self.child).delete()
+        self.assertEqual(self.stats(), [(self.today, 0, 0)])
+
+    def test_rebuild_command_backfills_range(self):
+        for days_ago in range(10):
+            ChoreAssignment.objects.create(
+                child=self.child,
+                chore=self.chore,
+                date_assigned=self.today - timedelta(days=days_ago),
+                completed=True,
+                date_completed=self.today - timedelta(days=days_ago)
+            )
+        expected = sorted(self.stats())
+        DailyChildStats.objects.all().delete()
+        start_date = (self.today - timedelta(days=6)).strftime('%Y-%m-%d')
+        call_command('rebuild_daily_stats', '--start-date', start_date, '--chunk-days', '3', stdout=StringIO())
+        self.assertEqual(len(self.stats()), 7)
+        call_command('rebuild_daily_stats', stdout=StringIO())
+        self.assertEqual(sorted(self.stats()), expected)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite specific')
+class QueryPlanTests(QueryBudgetTestCase):
+    def setUp(self):
+        # Enough rows for the plans to be the ones real data gets; like most databases, no ANALYZE statistics
+        call_command('populate_test_data', households=3, assignments=2000, days=60, seed=1, stdout=StringIO())
+        self.child = ChildFactory()
+        self.today = timezone.now().date()
+        self.month_ago = self.today - timedelta(days=30)
+
+    def query_plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertUsesIndex(self, queryset, table):
+        plan = self.query_plan(queryset)
+        steps = [step for step in plan if table in step]
+        self.assertTrue(steps, f'{table} does not appear in {plan}')
+        for step in steps:
+            self.assertIn('INDEX', step, f'Full table scan in {plan}')
+        self.assertFalse([step for step in plan if 'TEMP B-TREE' in step], f'Sort not served by an index in {plan}')
+
+    def test_hot_queries_use_indexes(self):
+        assignments = ChoreAssignment._meta.db_table
+        hot_queries = [
+            (ChoreAssignment.objects.filter(
+                child=self.child, completed=True, date_completed__range=[self.month_ago, self.today]
+            ), assignments),
+            (ChoreAssignment.objects.filter(
+                completed=True, date_completed__range=[self.month_ago, self.today]
+            ), assignments),
+            *[(list_queryset(order_by)[:26], assignments) for order_by in views.ChoreAssignmentListView.orderings],
+            (self.child.ledger_entries.filter(date__range=[self.month_ago, self.today]),
+             PointsLedger._meta.db_table),
+            (self.child.daily_stats.filter(date__range=[self.month_ago, self.today]),
+             DailyChildStats._meta.db_table),
+        ]
+        for queryset, table in hot_queries:
+            with self.subTest(sql=str(queryset.query)):
+                self.assertUsesIndex(queryset, table)
+
+
+    def test_name_orderings_need_the_sqlite_form(self):
+        # Names are not unique, so by name alone SQLite sorts every assignment
+        for order_by in views.ChoreAssignmentListView.name_orderings:
+            with self.subTest(order_by=order_by):
+                with mock.patch.object(connection, 'vendor', 'postgresql'):
+                    plain = list_queryset(order_by)[:26]
+                self.assertIn('USE TEMP B-TREE FOR ORDER BY', self.query_plan(plain))
+                self.assertUsesIndex(list_queryset(order_by)[:26], ChoreAssignment._meta.db_table)
+
+
+class PopulateTestDataTests(QueryBudgetTestCase):
+    def populate(self, *args):
+        call_command('populate_test_data', *args, stdout=StringIO())
+
+    def test_defaults_match_original_dataset(self):
+        self.populate()
+        self.assertEqual(Child.objects.count(), 3)
+        self.assertEqual(Chore.objects.count(), 5)
+        self.assertEqual(ChoreAssignment.objects.count(), 100)
+        self.assertEqual(set(Child.objects.values_list('name', flat=True)), {'Alice', 'Bob', 'Charlie'})
+
+    def test_scaled_run_is_reproducible_and_consistent(self):
+        args = ['--households', '4', '--children', '2', '--chores', '3', '--assignments', '2500',
+                '--days', '60', '--seed', '7', '--batch-size', '1000']
+        self.populate(*args)
+        self.assertEqual(Child.objects.count(), 8)
+        self.assertEqual(Chore.objects.count(), 12)
+        first_run = list(ChoreAssignment.objects.order_by('id').values_list(
+            'child__name', 'chore__name', 'date_assigned', 'completed', 'date_completed'
+        ))
+        self.assertEqual(len(first_run), 2500)
+        call_command('rebuild_points_ledger', '--check', stdout=StringIO())
+        call_command('verify_counters', stdout=StringIO())
+        for child in Child.objects.with_point_totals():
+            self.assertEqual(child.points_all, sum(
+                DailyChildStats.objects.filter(child=child).values_list('points', flat=True)
+            ))
+
+        ChoreAssignment.objects.all().delete()
+        Child.objects.all().delete()
+        Chore.objects.all().delete()
+        self.populate(*args)
+        second_run = list(ChoreAssignment.objects.order_by('id').values_list(
+            'child__name', 'chore__name', 'date_assigned', 'completed', 'date_completed'
+        ))
+        self.assertEqual(first_run, second_run)
+
+    def test_factories_can_supply_children_and_chores(self):
+        self.populate('--use-factories', '--assignments', '10')
+        self.assertTrue(Child.objects.filter(name__startswith='Child ').exists())
+        self.assertEqual(ChoreAssignment.objects.count(), 10)
+
+    def test_factory_runs_are_reproducible_with_seed(self):
+        runs = []
+        for _ in range(2):
+            Child.objects.all().delete()
+            Chore.objects.all().delete()
+            self.populate('--use-factories', '--seed', '3', '--assignments', '0')
+            runs.append((
+                list(Child.objects.order_by('id').values_list('age', flat=True)),
+                list(Chore.objects.order_by('id').values_list('description', 'points')),
+            ))
+        self.assertEqual(runs[0], runs[1])
+
+
+class BenchmarkTests(QueryBudgetTestCase):
+    def test_run_benchmarks_records_percentiles_and_queries(self):
+        results = run_benchmarks([300], repeat=3)
+        self.assertIn('300', results)
+        for name in ('child_points', 'child_calendar', 'chore_graph_data', 'chore_assignment_list',
+                     'child_get_points_all'):
+            with self.subTest(name=name):
+                stats = results['300'][name]
+                self.assertLessEqual(stats['p50_ms'], stats['p99_ms'])
+                self.assertGreaterEqual(stats['queries'], 1)
+
+    def test_every_timed_run_starts_with_an_empty_cache(self):
+        computed = []
+
+        def call():
+            get_cache().get_or_set('benchmark-test', lambda: computed.append(1) or Child.objects.count())
+
+        stats = measure(call, repeat=3)
+        self.assertEqual(len(computed), 4)
+        self.assertEqual(stats['queries'], 1)
+
+    def test_query_counts_must_not_change_between_runs(self):
+        counts = iter([1, 1, 2, 1])
+        with self.assertRaisesMessage(CommandError, 'Query counts changed between runs: [1, 2, 1]'):
+            measure(lambda: [Child.objects.count() for _ in range(next(counts))], repeat=3)
+
+    def test_compare_flags_slowdowns_and_extra_queries(self):
+        baseline = {'1000': {'child_points': {'p50_ms': 10.0, 'queries': 1}}}
+        self.assertEqual(compare({'1000': {'child_points': {'p50_ms': 12.0, 'queries': 1}}}, baseline, 1.25), [])
+        self.assertEqual(len(compare({'1000': {'child_points': {'p50_ms': 13.0, 'queries': 2}}}, baseline, 1.25)), 2)
+        self.assertEqual(compare({'5000': {'child_points': {'p50_ms': 99.0, 'queries': 9}}}, baseline, 1.25), [])
+
+
+class QueryInstrumentationTests(QueryBudgetTestCase):
+    def setUp(self):
+        today = timezone.now().date()
+        chores = [Chore.objects.create(name=f'Chore {i}', points=i + 1) for i in range(3)]
+        self.children = [Child.objects.create(name=f'Child {i}', age=8 + i) for i in range(3)]
+        for child in self.children:
+            for day in range(10):
+                ChoreAssignment.objects.create(
+                    child=child, chore=chores[day % 3], date_assigned=today - timedelta(days=day),
+                    completed=day % 2 == 0, date_completed=today - timedelta(days=day) if day % 2 == 0 else None,
+                )
+
+    def budgeted_urls(self):
+        child = self.children[0]
+        return [
+            reverse('child_list'),
+            reverse('chore_list'),
+            reverse('child_points', args=[child.pk]),
+            reverse('child_calendar', args=[child.pk]),
+            reverse('child_calendar_data', args=[child.pk]),
+            reverse('chore_graph', args=[child.pk]),
+            reverse('chore_graph_data', args=[child.pk]),
+            reverse('chore_assignment_list'),
+            reverse('chore_assignment_list') + '?order_by=child_name',
+        ]
+
+    @override_settings(CHORE_TRACKER_ENFORCE_QUERY_BUDGETS=True)
+    def test_views_stay_within_their_query_budgets(self):
+        for url in self.budgeted_urls():
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('child_points', args=[self.children[0].pk]))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="1 queries", render;dur=[\d.]+, total;dur=[\d.]+$')
+
+    def test_request_stats_are_logged(self):
+        with self.assertLogs('chore_tracker.middleware', 'DEBUG') as logs:
+            self.client.get(reverse('chore_assignment_list'))
+        stats = logs.records[0].request_stats
+        self.assertEqual(stats['view'], 'ChoreAssignmentListView')
+        self.assertEqual(stats['queries'], 1)
+        self.assertEqual(stats['duplicate_queries'], 0)
+        self.assertEqual(stats['query_budget'], views.ChoreAssignmentListView.query_budget)
+        self.assertGreater(stats['render_ms'], 0)
+
+    @override_settings(CHORE_TRACKER_ENFORCE_QUERY_BUDGETS=True)
+    def test_exceeding_a_budget_raises_when_enforced(self):
+        with mock.patch.object(views.CalendarView, 'query_budget', 1):
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'CalendarView ran 2 queries, over its budget of 1'):
+                self.client.get(reverse('child_calendar', args=[self.children[0].pk]))
+
+    @override_settings(CHORE_TRACKER_ENFORCE_QUERY_BUDGETS=False)
+    def test_exceeding_a_budget_warns_when_not_enforced(self):
+        with mock.patch.object(views.CalendarView, 'query_budget', 1):
+            with self.assertLogs('chore_tracker.middleware', 'WARNING') as logs:
+                response = self.client.get(reverse('child_calendar', args=[self.children[0].pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('over its budget of 1', logs.output[-1])
+
+
+class TracingTests(QueryBudgetTestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.child = Child.objects.create(name="Test Child", age=10)
+        self.url = reverse('chore_graph_data', args=[self.child.pk])
+
+    def test_trace_does_nothing_when_tracing_is_off(self):
+        class Expensive:
+            def __str__(self):
+                raise AssertionError('formatted an untraced message')
+
+        self.assertFalse(tracing_enabled())
+        with self.assertNoLogs('chore_tracker.tracing', 'DEBUG'):
+            trace('value %s', Expensive())
+
+    def test_trace_logs_inside_a_trace(self):
+        token = start_trace('abc123')
+        try:
+            with self.assertLogs('chore_tracker.tracing', 'DEBUG') as logs:
+                trace('value %s', 42)
+        finally:
+            stop_trace(token)
+        self.assertEqual(logs.output, ['DEBUG:chore_tracker.tracing:value 42'])
+        self.assertFalse(tracing_enabled())
+
+    def test_graph_data_view_does_not_print(self):
+        output = StringIO()
+        with redirect_stdout(output):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(output.getvalue(), '')
+
+    @override_settings(CHORE_TRACKER_TRACE_TOKEN='secret', CHORE_TRACKER_TRACE_SAMPLE_RATE=0)
+    def test_trace_header_turns_tracing_on_for_one_request(self):
+        with self.assertLogs('chore_tracker.tracing', 'DEBUG') as logs:
+            response = self.client.get(self.url, HTTP_X_CHORE_TRACE='secret')
+        self.assertIn('X-Trace-Id', response)
+        self.assertTrue(any('Graph data query SELECT' in line for line in logs.output))
+
+        with self.assertNoLogs('chore_tracker.tracing', 'DEBUG'):
+            response = self.client.get(self.url, HTTP_X_CHORE_TRACE='wrong')
+        self.assertNotIn('X-Trace-Id', response)
+
+    @override_settings(CHORE_TRACKER_TRACE_TOKEN=None, CHORE_TRACKER_TRACE_SAMPLE_RATE=1.0)
+    def test_sampled_requests_are_traced(self):
+        with self.assertLogs('chore_tracker.tracing', 'DEBUG'):
+            response = self.client.get(self.url)
+        self.assertIn('X-Trace-Id', response)
+
+    def test_queue_file_handler_writes_in_the_background(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'trace.log')
+            handler = QueueFileHandler(filename)
+            handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+            handler.handle(logging.makeLogRecord({'levelname': 'INFO', 'msg': 'hello %s', 'args': ('world',)}))
+            handler.close()
+            with open(filename) as f:
+                self.assertEqual(f.read(), 'INFO hello world\n')
+
+
+class AssignmentExportTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.alice = Child.objects.create(name="Alice", age=10)
+        self.bob = Child.objects.create(name="Bob, Jr.", age=8)
+        self.chore = Chore.objects.create(name="Dishes", points=2)
+        self.today = timezone.now().date()
+        for day in range(5):
+            for child in (self.alice, self.bob):
+                ChoreAssignment.objects.create(
+                    child=child, chore=self.chore, date_assigned=self.today - timedelta(days=day),
+                    completed=day % 2 == 0, date_completed=self.today if day % 2 == 0 else None,
+                )
+        self.url = reverse('chore_assignment_export')
+
+    def export(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('chore-assignments.csv', response['Content-Disposition'])
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,child_id,child_name,chore_id,chore_name,chore_points,'
+                                   'date_assigned,completed,date_completed')
+        self.assertEqual(len(lines), 11)
+        self.assertIn('"Bob, Jr."', lines[2])
+
+    def test_ndjson_export_with_filters(self):
+        content = self.export(format='ndjson', child=self.alice.pk, status='completed',
+                              start_date=(self.today - timedelta(days=2)).isoformat())
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row['date_assigned'] for row in rows],
+                         [self.today.isoformat(), (self.today - timedelta(days=2)).isoformat()])
+        self.assertEqual(rows[0]['child_name'], 'Alice')
+        self.assertIs(rows[0]['completed'], True)
+
+    def test_export_reads_all_rows_with_one_query(self):
+        response = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            b''.join(response.streaming_content)
+
+    def test_export_rejects_invalid_filters(self):
+        response = self.client.get(self.url, {'start_date': 'yesterday', 'format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(json.loads(response.content)['errors']), {'start_date', 'format'})
+
+    def test_export_command_matches_the_view(self):
+        out = StringIO()
+        call_command('export_assignments', format='ndjson', status='pending', chunk_size=3, stdout=out)
+        self.assertEqual(out.getvalue(), self.export(format='ndjson', status='pending'))
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'export.csv')
+            call_command('export_assignments', child=self.bob.pk, output=filename, stderr=StringIO())
+            with open(filename, newline='') as f:
+                self.assertEqual(f.read(), self.export(child=self.bob.pk))
+
+
+class AssignmentImportTests(QueryBudgetTestCase):
+    HEADER = 'child_name,chore_name,date_assigned,completed,date_completed\n'
+
+    def setUp(self):
+        self.alice = Child.objects.create(name="Alice", age=10)
+        self.bob = Child.objects.create(name="Bob", age=8)
+        self.dishes = Chore.objects.create(name="Dishes", points=2)
+        self.trash = Chore.objects.create(name="Trash", points=3)
+
+    def write(self, content, suffix='.csv'):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, f'import{suffix}')
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_import_csv_credits_completed_rows(self):
+        path = self.write(self.HEADER + 'Alice,Dishes,2024-03-01,true,2024-03-02\n'
+                                        'Bob,Trash,2024-03-01,false,\n'
+                                        'Alice,Trash,2024-03-02,yes,2024-03-02\n')
+        out = StringIO()
+        call_command('import_assignments', path, stdout=out, stderr=StringIO())
+        self.assertIn('Imported 3 assignments (2 completed) and rejected 0', out.getvalue())
+        self.assertEqual(ChoreAssignment.objects.count(), 3)
+        self.assertEqual(self.alice.get_points(), 5)
+        self.assertEqual(DailyChildStats.objects.get(child=self.alice, date=date(2024, 3, 2)).completed_count, 2)
+        self.alice.refresh_from_db()
+        self.assertEqual((self.alice.total_points, self.alice.completed_count), (5, 2))
+        call_command('rebuild_points_ledger', '--check', stdout=StringIO())
+
+    def test_import_inserts_with_a_fixed_number_of_queries(self):
+        rows = ''.join(f'Alice,Dishes,2024-03-01,{i % 2 == 0},2024-03-02\n' for i in range(500))
+        path = self.write(self.HEADER + rows)
+        with CaptureQueriesContext(connection) as queries:
+            call_command('import_assignments', path, stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(ChoreAssignment.objects.count(), 500)
+        self.assertEqual(PointsLedger.objects.count(), 250)
+        self.assertLess(len(queries), 15)
+
+    def test_import_never_reuses_deleted_ids(self):
+        path = self.write(self.HEADER + 'Alice,Dishes,2024-03-01,true,2024-03-02\n' * 2)
+        call_command('import_assignments', path, stdout=StringIO())
+        deleted = ChoreAssignment.objects.latest('pk').pk
+        ChoreAssignment.objects.filter(pk=deleted).bulk_delete()
+        call_command('import_assignments', path, stdout=StringIO())
+        self.assertFalse(ChoreAssignment.objects.filter(pk=deleted).exists())
+        self.assertEqual(ChoreAssignment.objects.filter(pk__gt=deleted).count(), 2)
+        call_command('rebuild_points_ledger', '--check', stdout=StringIO())
+
+    def test_invalid_rows_are_rejected_and_reported(self):
+        path = self.write(self.HEADER + 'Alice,Dishes,2024-03-01,true,2024-03-02\n'
+                                        'Zed,Dishes,2024-03-01,false,\n'
+                                        'Bob,Dishes,03/01/2024,false,\n'
+                                        'Bob,Dishes,2024-03-05,true,2024-03-01\n'
+                                        'Bob,Dishes,2024-03-05,maybe,\n')
+        rejects = os.path.join(os.path.dirname(path), 'rejects.ndjson')
+        call_command('import_assignments', path, rejects=rejects, stdout=StringIO(), stderr=StringIO())
+        with open(rejects) as f:
+            reported = [json.loads(line) for line in f]
+        self.assertEqual([reject['line'] for reject in reported], [3, 4, 5, 6])
+        self.assertEqual(reported[0]['errors'], ["Child 'Zed' does not exist."])
+        self.assertEqual(reported[2]['errors'], ["Date completed cannot be earlier than the date assigned."])
+        self.assertEqual(reported[3]['row']['completed'], 'maybe')
+        self.assertEqual(ChoreAssignment.objects.count(), 1)
+
+    def test_dry_run_writes_nothing(self):
+        path = self.write(self.HEADER + 'Alice,Dishes,2024-03-01,true,2024-03-02\n')
+        out = StringIO()
+        call_command('import_assignments', path, dry_run=True, stdout=out)
+        self.assertIn('Validated 1 assignments', out.getvalue())
+        self.assertFalse(ChoreAssignment.objects.exists())
+        self.assertFalse(PointsLedger.objects.exists())
+
+    def test_ambiguous_names_need_ids(self):
+        other_alice = Child.objects.create(name="Alice", age=12)
+        path = self.write(
+            '{"child_name": "Alice", "chore_name": "Dishes", "date_assigned": "2024-03-01"}\n'
+            f'{{"child_id": {other_alice.pk}, "chore_name": "Dishes", "date_assigned": "2024-03-01", '
+            '"completed": false}\n'
+            'not json\n',
+            suffix='.ndjson',
+        )
+        out, err = StringIO(), StringIO()
+        call_command('import_assignments', path, stdout=out, stderr=err)
+        self.assertIn('Imported 1 assignments', out.getvalue())
+        self.assertIn("Line 1: Child name 'Alice' is ambiguous", err.getvalue())
+        self.assertIn('Line 3: Invalid JSON', err.getvalue())
+        self.assertEqual(ChoreAssignment.objects.get().child, other_alice)
+
+    def test_ndjson_names_and_ids_must_be_scalars(self):
+        path = self.write(
+            '{"child_name": ["Alice"], "chore_name": "Dishes", "date_assigned": "2024-03-01"}\n'
+            '{"child_name": "Alice", "chore_name": {"name": "Dishes"}, "date_assigned": "2024-03-01"}\n'
+            f'{{"child_id": {self.alice.pk}.5, "chore_name": "Dishes", "date_assigned": "2024-03-01"}}\n'
+            '{"child_name": "Alice", "chore_id": true, "date_assigned": "2024-03-01"}\n'
+            f'{{"child_id": "{self.bob.pk}", "chore_id": {self.trash.pk}, "date_assigned": "2024-03-01"}}\n',
+            suffix='.ndjson',
+        )
+        rejects = os.path.join(os.path.dirname(path), 'rejects.ndjson')
+        out = StringIO()
+        call_command('import_assignments', path, rejects=rejects, stdout=out, stderr=StringIO())
+        with open(rejects) as f:
+            reported = [json.loads(line)['errors'] for line in f]
+        self.assertEqual(reported, [
+            ["Invalid value for child_name: ['Alice']"],
+            ["Invalid value for chore_name: {'name': 'Dishes'}"],
+            [f"Invalid value for child_id: {self.alice.pk}.5"],
+            ["Invalid value for chore_id: True"],
+        ])
+        self.assertEqual(ChoreAssignment.objects.get().child, self.bob)
+
+    def test_export_round_trips_through_import(self):
+        ChoreAssignment.objects.create(child=self.alice, chore=self.dishes, date_assigned=date(2024, 3, 1),
+                                       completed=True, date_completed=date(2024, 3, 1))
+        out = StringIO()
+        call_command('export_assignments', stdout=out)
+        path = self.write(out.getvalue())
+        call_command('import_assignments', path, stdout=StringIO())
+        self.assertEqual(ChoreAssignment.objects.filter(child=self.alice, completed=True).count(), 2)
+        self.assertEqual(self.alice.get_points(), 4)
+
+    def test_writes_are_batched(self):
+        path = self.write(self.HEADER + 'Alice,Dishes,2024-03-01,true,2024-03-01\n' * 50)
+        with CaptureQueriesContext(connection) as few:
+            call_command('import_assignments', path, batch_size=50, stdout=StringIO())
+        with CaptureQueriesContext(connection) as more:
+            call_command('import_assignments', path, batch_size=50, stdout=StringIO())
+        self.assertEqual(len(few), len(more))
+        self.assertEqual(self.alice.get_points(), 200)
+
+    def test_upload_view(self):
+        upload = SimpleUploadedFile('import.csv', (self.HEADER + 'Bob,Trash,2024-03-01,true,2024-03-01\n'
+                                                                 'Nobody,Trash,2024-03-01,false,\n').encode())
+        response = self.client.post(reverse('chore_assignment_import'), {'file': upload, 'format': 'csv'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['result'].imported, 1)
+        self.assertContains(response, "Child &#x27;Nobody&#x27; does not exist.")
+        self.assertEqual(self.bob.get_points(), 3)
+
+
+class FamilyGraphTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.chore = Chore.objects.create(name="Dishes", points=1)
+        self.alice = Child.objects.create(name="Alice", age=10)
+        self.bob = Child.objects.create(name="Bob", age=8)
+        self.carol = Child.objects.create(name="Carol", age=6)
+        for child, days_ago in [(self.alice, 0), (self.alice, 0), (self.alice, 2), (self.bob, 1), (self.carol, 3)]:
+            ChoreAssignment.objects.create(
+                child=child, chore=self.chore, date_assigned=self.today - timedelta(days=days_ago),
+                completed=True, date_completed=self.today - timedelta(days=days_ago),
+            )
+        self.url = reverse('family_graph_data')
+        self.range = {'start_date': (self.today - timedelta(days=2)).isoformat(), 'end_date': self.today.isoformat()}
+
+    def test_series_share_a_zero_filled_axis(self):
+        response = self.client.get(self.url, {'child': [self.alice.pk, self.bob.pk], **self.range})
+        data = json.loads(response.content)
+        self.assertEqual(data['labels'], [(self.today - timedelta(days=n)).isoformat() for n in (2, 1, 0)])
+        self.assertEqual([(d['label'], d['data']) for d in data['datasets']],
+                         [('Alice', [1, 0, 2]), ('Bob', [0, 1, 0])])
+        self.assertEqual(data['missing'], [])
+
+    def test_all_children_from_one_stats_query(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, self.range)
+        data = json.loads(response.content)
+        self.assertEqual([d['label'] for d in data['datasets']], ['Alice', 'Bob', 'Carol'])
+        self.assertEqual(data['datasets'][2]['data'], [0, 0, 0])
+        self.assertEqual(len({d['borderColor'] for d in data['datasets']}), 3)
+
+    def test_matches_the_single_child_graph(self):
+        single = json.loads(self.client.get(reverse('chore_graph_data', args=[self.alice.pk]), self.range).content)
+        family = json.loads(self.client.get(self.url, {'child': self.alice.pk, **self.range}).content)
+        self.assertEqual(single['labels'], family['labels'])
+        self.assertEqual(single['datasets'][0]['data'], family['datasets'][0]['data'])
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.get(self.url, {'child': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'start_date': self.today.isoformat(),
+                                                    'end_date': (self.today - timedelta(days=1)).isoformat()})
+                         .status_code, 400)
+        data = json.loads(self.client.get(self.url, {'child': [self.bob.pk, 999]}).content)
+        self.assertEqual(data['missing'], [999])
+
+    def test_family_graph_page(self):
+        response = self.client.get(reverse('family_graph'))
+        self.assertContains(response, 'id="child-%d"' % self.carol.pk)
+
+
+class AsyncViewTests(QueryBudgetTestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.today = timezone.now().date()
+        self.chore = Chore.objects.create(name="Dishes", points=3)
+        self.children = [Child.objects.create(name=f"Child {i}", age=9) for i in range(3)]
+        for i, child in enumerate(self.children):
+            for day in range(i + 1):
+                ChoreAssignment.objects.create(
+                    child=child, chore=self.chore, date_assigned=self.today - timedelta(days=day),
+                    completed=True, date_completed=self.today - timedelta(days=day),
+                )
+
+    async def test_async_graph_data_matches_the_sync_view(self):
+        child = self.children[2]
+        expected = await self.async_client.get(reverse('chore_graph_data', args=[child.pk]))
+        get_cache().clear()
+        response = await self.async_client.get(reverse('chore_graph_data_async', args=[child.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), json.loads(expected.content))
+        self.assertEqual(json.loads(response.content)['datasets'][0]['data'][-3:], [1, 1, 1])
+
+    async def test_async_graph_data_validates_input(self):
+        response = await self.async_client.get(reverse('chore_graph_data_async', args=[self.children[0].pk]),
+                                               {'start_date': 'soon'})
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.get(reverse('chore_graph_data_async', args=[999]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_async_calendar_data_matches_the_sync_view(self):
+        child = self.children[1]
+        args = [child.pk, self.today.year, self.today.month]
+        expected = await self.async_client.get(reverse('child_calendar_data_date', args=args))
+        get_cache().clear()
+        response = await self.async_client.get(reverse('child_calendar_data_async_date', args=args))
+        self.assertEqual(json.loads(response.content), json.loads(expected.content))
+        revalidated = await self.async_client.get(reverse('child_calendar_data_async_date', args=args),
+                                                  headers={'If-None-Match': response['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+
+    async def test_points_data(self):
+        child = self.children[2]
+        response = await self.async_client.get(reverse('child_points_data', args=[child.pk]))
+        data = json.loads(response.content)
+        self.assertEqual(data['child'], {'id': child.pk, 'name': child.name})
+        self.assertEqual(data['points'], {'day': 3, 'week': 9, 'month': 9, 'all': 9})
+
+    async def test_batch_graph_data_gathers_every_child(self):
+        ids = [child.pk for child in self.children]
+        response = await self.async_client.get(reverse('chore_graph_data_batch'), {'child': ids + [999]})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['missing'], [999])
+        self.assertEqual([sum(data['children'][str(pk)]['datasets'][0]['data']) for pk in ids], [1, 2, 3])
+
+        response = await self.async_client.get(reverse('chore_graph_data_batch'))
+        self.assertEqual(response.status_code, 400)
+
+    async def test_concurrent_requests(self):
+        urls = [reverse('chore_graph_data_async', args=[child.pk]) for child in self.children] * 5
+        responses = await asyncio.gather(*(self.async_client.get(url) for url in urls))
+        self.assertEqual({response.status_code for response in responses}, {200})
+        # Queries run on a worker thread are still attributed to their request
+        self.assertTrue(all('desc="0 queries"' not in response['Server-Timing'] for response in responses))
+
+
+class ResponseCacheTests(QueryBudgetTestCase):
+    def setUp(self):
+        get_cache().clear()
+        reset_cache_stats()
+        self.child = Child.objects.create(name="Test Child", age=10)
+        self.chore = Chore.objects.create(name="Test Chore", points=5)
+        self.today = timezone.now().date()
+        self.graph_url = reverse('chore_graph_data', args=[self.child.pk])
+        self.calendar_url = reverse('child_calendar_data_date', args=[self.child.pk, self.today.year, self.today.month])
+
+    def complete(self, chore=None):
+        return ChoreAssignment.objects.create(
+            child=self.child, chore=chore or self.chore, date_assigned=self.today,
+            completed=True, date_completed=self.today,
+        )
+
+    def graph_counts(self):
+        return [count for count in json.loads(self.client.get(self.graph_url).content)['datasets'][0]['data'] if count]
+
+    def test_repeated_graph_request_is_served_from_cache(self):
+        self.complete()
+        self.assertEqual(self.graph_counts(), [1])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.graph_counts(), [1])
+        self.assertEqual(cache_stats(), {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+    def test_completion_changes_invalidate_the_cache(self):
+        assignment = self.complete()
+        self.assertEqual(self.graph_counts(), [1])
+        self.complete()
+        self.assertEqual(self.graph_counts(), [2])
+        assignment.delete()
+        self.assertEqual(self.graph_counts(), [1])
+
+    def test_cascading_chore_delete_invalidates_the_cache(self):
+        other = Chore.objects.create(name="Other Chore", points=3)
+        self.complete()
+        self.complete(other)
+        self.assertEqual(self.graph_counts(), [2])
+        other.delete()
+        self.assertEqual(self.graph_counts(), [1])
+
+    def test_child_save_does_not_rewind_the_version(self):
+        stale = Child.objects.get(pk=self.child.pk)
+        self.complete()
+        stale.name = "Renamed"
+        stale.save()
+        self.child.refresh_from_db()
+        self.assertEqual((self.child.name, self.child.data_version), ("Renamed", 1))
+
+    def test_rebuilding_daily_stats_invalidates_the_cache(self):
+        self.complete()
+        self.graph_counts()
+        DailyChildStats.objects.update(completed_count=7)
+        call_command('rebuild_daily_stats', stdout=StringIO())
+        self.assertEqual(self.graph_counts(), [1])
+
+    def test_graph_revalidation_returns_not_modified(self):
+        self.complete()
+        response = self.client.get(self.graph_url)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+        with self.assertNumQueries(1):
+            revalidated = self.client.get(self.graph_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated['ETag'], response['ETag'])
+
+        self.complete()
+        self.assertEqual(self.client.get(self.graph_url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_calendar_data_revalidation_returns_not_modified(self):
+        self.complete()
+        response = self.client.get(self.calendar_url)
+        self.assertEqual(
+            self.client.get(self.calendar_url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304
+        )
+        self.child.name = "Renamed"
+        self.child.save()
+        self.assertEqual(
+            self.client.get(self.calendar_url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200
+        )
+
+
+class CalendarViewTests(QueryBudgetTestCase):
+    def setUp(self):
+        get_cache().clear()
         self.child = Child.objects.create(name="Test Child", age=10)
         self.chore = Chore.objects.create(name="Test Chore", points=5)
         self.today = timezone.now().date()
@@ -364,9 +1444,55 @@ class CalendarViewTests(TestCase):
     #     response = self.client.get(url)
     #     self.assertEqual(response.status_code, 404)
 
+    def complete_on(self, day, chore=None):
+        ChoreAssignment.objects.create(
+            child=self.child,
+            chore=chore or self.chore,
+            date_assigned=day,
+            completed=True,
+            date_completed=day
+        )
+
+    def test_calendar_view_sums_points_per_day(self):
+        first_of_month = self.today.replace(day=1)
+        self.complete_on(first_of_month)
+        self.complete_on(first_of_month, Chore.objects.create(name="Bigger Chore", points=7))
+        response = self.client.get(reverse('child_calendar', args=[self.child.id]))
+        cells = [day for week in response.context['calendar_data'] for day in week if day['day']]
+        self.assertEqual(cells[0], {'day': 1, 'points': 12})
+        self.assertEqual(sum(day['points'] for day in cells), 12)
 
-class GraphViewTests(TestCase):
+    def test_calendar_view_query_count_is_constant(self):
+        url = reverse('child_calendar', args=[self.child.id])
+        with CaptureQueriesContext(connection) as empty:
+            self.client.get(url)
+        for day in range(1, 8):
+            self.complete_on(self.today.replace(day=day))
+        with CaptureQueriesContext(connection) as busy:
+            self.client.get(url)
+        self.assertEqual(len(empty), len(busy))
+
+    def test_calendar_view_rejects_invalid_month(self):
+        url = reverse('child_calendar_date', args=[self.child.id, 2023, 13])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_calendar_data_view(self):
+        self.complete_on(date(2024, 2, 29))
+        url = reverse('child_calendar_data_date', args=[self.child.id, 2024, 2])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual((data['year'], data['month']), (2024, 2))
+        self.assertEqual(data['total_points'], 5)
+        self.assertEqual(data['weeks'][0][0], {'day': None, 'points': None})
+        self.assertIn({'day': 29, 'points': 5}, data['weeks'][-1])
+        self.assertEqual((data['prev']['year'], data['prev']['month']), (2024, 1))
+        self.assertEqual(data['next']['url'], reverse('child_calendar_data_date', args=[self.child.id, 2024, 3]))
+
+
+class GraphViewTests(QueryBudgetTestCase):
     def setUp(self):
+        get_cache().clear()
         self.child = Child.objects.create(name="Test Child", age=10)
         self.chore = Chore.objects.create(name="Test Chore", points=5)
         self.today = timezone.now().date()
@@ -401,8 +1527,9 @@ class GraphViewTests(TestCase):
         data = json.loads(response.content)
         self.assertIn('labels', data)
         self.assertIn('datasets', data)
-        self.assertEqual(len(data['labels']), 30)  # We created 30 days of data
-        self.assertEqual(len(data['datasets'][0]['data']), 30)
+        self.assertEqual(len(data['labels']), 31)  # Every day of the default range, today included
+        self.assertEqual(len(data['datasets'][0]['data']), 31)
+        self.assertEqual(data['datasets'][0]['data'][0], 0)  # Nothing was completed 30 days ago
 
     def test_graph_data_with_date_range(self):
         start_date = (self.today - timedelta(days=7)).strftime('%Y-%m-%d')
@@ -414,3 +1541,720 @@ class GraphViewTests(TestCase):
         data = json.loads(response.content)
         self.assertEqual(len(data['labels']), 8)  # 7 days + today
         self.assertEqual(len(data['datasets'][0]['data']), 8)
+
+    def test_graph_data_by_month_with_extra_series(self):
+        start_date = self.today - timedelta(days=29)
+        url = reverse('chore_graph_data', args=[self.child.id]) + (
+            f'?start_date={start_date}&end_date={self.today}&bucket=month&rolling=2&cumulative=true'
+        )
+        data = json.loads(self.client.get(url).content)
+
+        self.assertEqual(data['bucket'], 'month')
+        self.assertEqual(data['labels'][0], start_date.replace(day=1).isoformat())
+        completed, rolling, cumulative = data['datasets']
+        self.assertEqual(sum(completed['data']), 30)
+        self.assertEqual(len(rolling['data']), len(data['labels']))
+        self.assertEqual(cumulative['data'][-1], 150)
+        self.assertEqual(cumulative['yAxisID'], 'points')
+
+    def test_graph_data_rejects_bad_options(self):
+        url = reverse('chore_graph_data', args=[self.child.id])
+        self.assertEqual(self.client.get(url + '?bucket=year').status_code, 400)
+        self.assertEqual(self.client.get(url + '?rolling=-1').status_code, 400)
+        self.assertEqual(self.client.get(url + f'?start_date={self.today}&end_date={self.today - timedelta(days=1)}').status_code, 400)
+
+
+class TimeSeriesTests(QueryBudgetTestCase):
+    def test_dense_fills_gaps_with_zeros(self):
+        start = date(2024, 1, 1)
+        labels, (counts, points) = timeseries.dense(
+            [(date(2024, 1, 2), 2, 10), (date(2024, 1, 4), 1, 5), (date(2023, 12, 31), 9, 9)],
+            start, date(2024, 1, 5), columns=2,
+        )
+        self.assertEqual(labels, [start + timedelta(days=i) for i in range(5)])
+        self.assertEqual(list(counts), [0, 2, 0, 1, 0])
+        self.assertEqual(list(points), [0, 10, 0, 5, 0])
+
+    def test_weeks_start_on_monday(self):
+        # 2024-01-03 is a Wednesday
+        labels, (counts,) = timeseries.dense(
+            [(date(2024, 1, 3), 1), (date(2024, 1, 7), 1), (date(2024, 1, 8), 1)],
+            date(2024, 1, 3), date(2024, 1, 15), bucket='week',
+        )
+        self.assertEqual(labels, [date(2024, 1, 1), date(2024, 1, 8), date(2024, 1, 15)])
+        self.assertEqual(list(counts), [2, 1, 0])
+
+    def test_month_buckets_cross_years(self):
+        labels = timeseries.bucket_labels(date(2023, 11, 15), date(2024, 2, 1), 'month')
+        self.assertEqual(labels, [date(2023, 11, 1), date(2023, 12, 1), date(2024, 1, 1), date(2024, 2, 1)])
+
+    def test_unknown_bucket(self):
+        with self.assertRaises(ValueError):
+            timeseries.dense([], date(2024, 1, 1), date(2024, 1, 2), bucket='year')
+
+    def test_cumulative_and_rolling_mean(self):
+        self.assertEqual(list(timeseries.cumulative([1, 0, 2, 3])), [1, 1, 3, 6])
+        self.assertEqual(list(timeseries.rolling_mean([2, 4, 6, 8], 2)), [2.0, 3.0, 5.0, 7.0])
+        self.assertEqual(list(timeseries.rolling_mean([3], 5)), [3.0])
+
+
+class LeaderboardTests(QueryBudgetTestCase):
+    def setUp(self):
+        leaderboard.invalidate()
+        self.today = timezone.now().date()
+        self.chore = Chore.objects.create(name="Dishes", points=5)
+        self.alice = Child.objects.create(name="Alice", age=10)
+        self.bob = Child.objects.create(name="Bob", age=8)
+        self.cara = Child.objects.create(name="Cara", age=6)
+        self.complete(self.alice, self.today)
+        self.complete(self.alice, self.today - timedelta(days=20))
+        self.complete(self.bob, self.today - timedelta(days=1))
+
+    def complete(self, child, day):
+        return ChoreAssignment.objects.create(
+            child=child, chore=self.chore, date_assigned=day, completed=True, date_completed=day
+        )
+
+    def standings(self, period):
+        return [(entry.rank, entry.name, entry.points) for entry in leaderboard.get_leaderboard(period).entries]
+
+    def test_ranks_every_child_by_period(self):
+        self.assertEqual(self.standings('all'), [(1, 'Alice', 10), (2, 'Bob', 5), (3, 'Cara', 0)])
+        self.assertEqual(self.standings('week'), [(1, 'Alice', 5), (1, 'Bob', 5), (3, 'Cara', 0)])
+        self.assertEqual(self.standings('day'), [(1, 'Alice', 5), (2, 'Bob', 0), (2, 'Cara', 0)])
+
+    def test_top_and_rank_of(self):
+        board = leaderboard.get_leaderboard('all')
+        self.assertEqual([entry.name for entry in board.top(2)], ['Alice', 'Bob'])
+        self.assertEqual(board.rank_of(self.cara.pk).rank, 3)
+        self.assertIsNone(board.rank_of(0))
+
+    def test_cached_until_completions_change(self):
+        leaderboard.get_leaderboard('all')
+        with self.assertNumQueries(0):
+            leaderboard.get_leaderboard('all')
+
+        self.complete(self.cara, self.today)
+        self.complete(self.cara, self.today)
+        self.complete(self.cara, self.today)
+        self.assertEqual(self.standings('all')[0], (1, 'Cara', 15))
+
+        self.bob.name = "Robert"
+        self.bob.save()
+        self.assertIn((2, 'Robert', 5), self.standings('week'))
+
+    @override_settings(CHORE_TRACKER_LEADERBOARD_TTL=0)
+    def test_cache_can_be_disabled(self):
+        leaderboard.get_leaderboard('all')
+        with self.assertNumQueries(1):
+            leaderboard.get_leaderboard('all')
+
+    def test_data_view(self):
+        url = reverse('leaderboard_data')
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'period': 'all', 'limit': 1, 'child': self.bob.pk})
+        data = json.loads(response.content)
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(data['entries'], [
+            {'rank': 1, 'child': {'id': self.alice.pk, 'name': 'Alice'}, 'points': 10, 'completed': 2},
+        ])
+        self.assertEqual(data['child']['rank'], 2)
+
+        self.assertEqual(self.client.get(url, {'period': 'year'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'limit': 0}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'child': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'child': 0}).status_code, 404)
+
+    def test_page(self):
+        response = self.client.get(reverse('leaderboard'), {'period': 'month'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([entry.name for entry in response.context['leaderboard'].entries], ['Alice', 'Bob', 'Cara'])
+
+
+class ChildCounterTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.child = Child.objects.create(name="Test Child", age=10)
+        self.other = Child.objects.create(name="Other Child", age=8)
+        self.chore = Chore.objects.create(name="Dishes", points=5)
+        self.today = timezone.now().date()
+
+    def assertCounters(self, child, points, completed):
+        child.refresh_from_db()
+        self.assertEqual((child.total_points, child.completed_count), (points, completed))
+
+    def complete(self, child=None):
+        return ChoreAssignment.objects.create(child=child or self.child, chore=self.chore, date_assigned=self.today,
+                                              completed=True, date_completed=self.today)
+
+    def test_follow_completion_changes(self):
+        assignment = self.complete()
+        self.complete()
+        self.assertCounters(self.child, 10, 2)
+
+        assignment.completed = False
+        assignment.date_completed = None
+        assignment.save()
+        self.assertCounters(self.child, 5, 1)
+
+        assignment.completed = True
+        assignment.date_completed = self.today
+        assignment.child = self.other
+        assignment.save()
+        self.assertCounters(self.child, 5, 1)
+        self.assertCounters(self.other, 5, 1)
+
+        assignment.delete()
+        self.assertCounters(self.other, 0, 0)
+
+    def test_bulk_paths_update_counters(self):
+        ChoreAssignment.objects.bulk_assign([
+            {'child': self.child.pk, 'chore': self.chore.pk, 'completed': True, 'date_completed': self.today},
+            {'child': self.other.pk, 'chore': self.chore.pk, 'completed': True, 'date_completed': self.today},
+            {'child': self.other.pk, 'chore': self.chore.pk},
+        ])
+        self.assertCounters(self.child, 5, 1)
+        self.assertCounters(self.other, 5, 1)
+
+    def test_saving_a_stale_child_keeps_counters(self):
+        stale = Child.objects.get(pk=self.child.pk)
+        self.complete()
+        stale.name = "Renamed"
+        stale.save()
+        self.assertCounters(self.child, 5, 1)
+
+    def test_apply_points_retroactively(self):
+        kept = self.complete()
+        undone = self.complete()
+        undone.completed = False
+        undone.date_completed = None
+        undone.save()
+        self.complete(self.other)
+
+        self.chore.points = 8
+        self.chore.save()
+        self.assertCounters(self.child, 5, 1)
+        self.assertEqual(self.chore.apply_points_retroactively(), 2)
+        self.assertCounters(self.child, 8, 1)
+        self.assertCounters(self.other, 8, 1)
+        self.assertEqual(DailyChildStats.objects.get(child=self.child).points, 8)
+        self.assertEqual(self.chore.apply_points_retroactively(), 0)
+
+        # Un-completing reverses the repriced amount
+        kept.completed = False
+        kept.date_completed = None
+        kept.save()
+        self.assertCounters(self.child, 0, 0)
+
+    def test_chore_edit_can_apply_points_retroactively(self):
+        self.complete()
+        response = self.client.post(reverse('chore_edit', args=[self.chore.pk]), {
+            'name': 'Dishes', 'description': '', 'points': 3, 'apply_retroactively': 'on',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertCounters(self.child, 3, 1)
+
+    def test_list_shows_counters_without_extra_queries(self):
+        self.complete()
+        ChildFactory.create_batch(5)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('child_list'))
+        self.assertContains(response, '5 points')
+
+    def test_verify_counters(self):
+        self.complete()
+        call_command('verify_counters', stdout=StringIO())
+
+        Child.objects.filter(pk=self.child.pk).update(total_points=99)
+        with self.assertRaises(CommandError):
+            call_command('verify_counters', stdout=StringIO(), stderr=StringIO())
+
+        out = StringIO()
+        call_command('verify_counters', repair=True, stdout=out, stderr=StringIO())
+        self.assertIn('Repaired the counters of 1 child(ren)', out.getvalue())
+        self.assertCounters(self.child, 5, 1)
+        self.assertCounters(self.other, 0, 0)
+
+
+class SQLiteTuningTests(QueryBudgetTestCase):
+    def open(self, name):
+        wrapper = type(connections['default'])({**connection.settings_dict, 'NAME': name}, alias='tuning_test')
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        return wrapper.connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+    def test_file_databases_are_tuned(self):
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = self.open(os.path.join(directory, 'tuned.sqlite3'))
+            self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'wal')
+            self.assertEqual(self.pragma(wrapper, 'synchronous'), 1)  # NORMAL
+            self.assertEqual(self.pragma(wrapper, 'busy_timeout'), 5000)
+            self.assertEqual(self.pragma(wrapper, 'cache_size'), -16000)
+            wrapper.close()
+
+    def test_pragmas_come_from_settings(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(CHORE_TRACKER_SQLITE_PRAGMAS={'busy_timeout': 250, 'journal_mode': None}):
+            wrapper = self.open(os.path.join(directory, 'custom.sqlite3'))
+            self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'delete')
+            self.assertEqual(self.pragma(wrapper, 'busy_timeout'), 250)
+            wrapper.close()
+
+    def test_in_memory_databases_are_left_alone(self):
+        wrapper = self.open(':memory:')
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'memory')
+
+
+class RetryOnLockedTests(SimpleTestCase):
+    def flaky(self, *errors):
+        calls = []
+
+        @retry_on_locked
+        def write():
+            calls.append(1)
+            if len(calls) <= len(errors):
+                raise errors[len(calls) - 1]
+            return 'written'
+
+        return write, calls
+
+    @mock.patch('chore_tracker.db.time.sleep')
+    def test_retries_locked_writes(self, sleep):
+        write, calls = self.flaky(OperationalError('database is locked'), OperationalError('database is locked'))
+        self.assertEqual(write(), 'written')
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    @override_settings(CHORE_TRACKER_LOCKED_RETRIES=1)
+    @mock.patch('chore_tracker.db.time.sleep')
+    def test_gives_up_after_the_configured_retries(self, sleep):
+        write, calls = self.flaky(*[OperationalError('database is locked')] * 3)
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 2)
+
+    def test_other_errors_are_not_retried(self):
+        write, calls = self.flaky(OperationalError('no such table: chore_tracker_child'))
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 1)
+
+    @mock.patch('chore_tracker.db.transaction.get_connection')
+    def test_not_retried_inside_a_transaction(self, get_connection):
+        get_connection.return_value.in_atomic_block = True
+        write, calls = self.flaky(OperationalError('database is locked'))
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 1)
+
+
+@override_settings(CHORE_TRACKER_READ_REPLICA='replica')
+class ReplicaRoutingTests(QueryBudgetTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        get_cache().clear()
+        self.child = Child.objects.create(name="Primary Child", age=10)
+        self.chore = Chore.objects.create(name="Dishes", points=5)
+        # A stale replica: same child, different name, no completions yet
+        Child.objects.using('replica').bulk_create([Child(pk=self.child.pk, name="Replica Child", age=10)])
+        ChoreAssignment.objects.create(child=self.child, chore=self.chore, completed=True,
+                                       date_completed=timezone.now().date())
+
+    def test_reporting_views_read_from_the_replica(self):
+        response = self.client.get(reverse('child_points', args=[self.child.pk]))
+        self.assertContains(response, "Replica Child")
+        self.assertEqual(response.context['total_points'], 0)
+
+        data = json.loads(self.client.get(reverse('chore_graph_data', args=[self.child.pk])).content)
+        self.assertEqual(sum(data['datasets'][0]['data']), 0)
+
+    async def test_async_views_read_from_the_replica(self):
+        response = await self.async_client.get(reverse('child_points_data', args=[self.child.pk]))
+        self.assertEqual(json.loads(response.content)['child']['name'], "Replica Child")
+
+    def test_other_views_read_from_the_primary(self):
+        self.assertContains(self.client.get(reverse('child_list')), "Primary Child")
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        response = self.client.post(reverse('chore_create'), {'name': 'Laundry', 'description': '', 'points': 2})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(Chore.objects.using('replica').count(), 0)
+
+        response = self.client.get(reverse('child_points', args=[self.child.pk]))
+        self.assertContains(response, "Primary Child")
+        self.assertEqual(response.context['total_points'], 5)
+
+    def test_rejected_writes_do_not_pin(self):
+        response = self.client.post(reverse('chore_assignment_bulk_api'), 'not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    @override_settings(CHORE_TRACKER_READ_REPLICA=None)
+    def test_without_a_replica_everything_reads_from_the_primary(self):
+        self.assertContains(self.client.get(reverse('child_points', args=[self.child.pk])), "Primary Child")
+        response = self.client.post(reverse('chore_create'), {'name': 'Laundry', 'description': '', 'points': 2})
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_backup_copies_the_primary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # The test databases live in memory inside a transaction, so copy a file database instead
+            source = type(connections['default'])(
+                {**connection.settings_dict, 'NAME': os.path.join(directory, 'primary.sqlite3')}, alias='primary_copy'
+            )
+            source.ensure_connection()
+            source.connection.execute('CREATE TABLE chores (name TEXT)')
+            source.connection.execute("INSERT INTO chores VALUES ('Dishes')")
+            source.connection.commit()
+
+            target = os.path.join(directory, 'replica.sqlite3')
+            backup_sqlite(source, target)
+            source.close()
+            copy = sqlite3.connect(target)
+            try:
+                self.assertEqual(copy.execute('SELECT name FROM chores').fetchall(), [('Dishes',)])
+            finally:
+                copy.close()
+
+    def test_refresh_replica_refuses_unusable_targets(self):
+        with self.assertRaises(CommandError):
+            call_command('refresh_replica', stdout=StringIO())  # the test replica is in memory
+        with self.assertRaises(CommandError):
+            call_command('refresh_replica', replica='default', stdout=StringIO())
+
+
+class ChoreAssignmentBulkActionTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.child = Child.objects.create(name="Alice", age=10)
+        self.other = Child.objects.create(name="Bob", age=8)
+        self.chore = Chore.objects.create(name="Dishes", points=5)
+        self.pending = [
+            ChoreAssignment.objects.create(child=self.child, chore=self.chore, date_assigned=self.today - timedelta(days=i))
+            for i in range(3)
+        ]
+        self.done = ChoreAssignment.objects.create(child=self.child, chore=self.chore, date_assigned=self.today,
+                                                   completed=True, date_completed=self.today)
+        self.future = ChoreAssignment.objects.create(child=self.child, chore=self.chore,
+                                                     date_assigned=self.today + timedelta(days=2))
+
+    def assertConsistent(self):
+        call_command('rebuild_points_ledger', '--check', stdout=StringIO())
+        call_command('verify_counters', stdout=StringIO())
+
+    def updates(self, queries):
+        return [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "chore_tracker_choreassignment"')]
+
+    def test_complete(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(ChoreAssignment.objects.all().complete(), [a.pk for a in self.pending])
+        self.assertEqual(len(self.updates(queries)), 1)
+        self.assertFalse(ChoreAssignment.objects.get(pk=self.future.pk).completed)
+        self.assertEqual(set(ChoreAssignment.objects.filter(completed=True).values_list('date_completed', flat=True)),
+                         {self.today})
+        self.child.refresh_from_db()
+        self.assertEqual(self.child.total_points, 20)
+        self.assertConsistent()
+        self.assertEqual(ChoreAssignment.objects.all().complete(), [])
+
+    def test_complete_without_update_returning(self):
+        with mock.patch.object(connection, 'vendor', 'mysql'), CaptureQueriesContext(connection) as queries:
+            self.assertEqual(ChoreAssignment.objects.all().complete(), [a.pk for a in self.pending])
+        self.assertFalse([q for q in self.updates(queries) if 'RETURNING' in q])
+        self.child.refresh_from_db()
+        self.assertEqual(self.child.total_points, 20)
+        self.assertConsistent()
+
+    def test_reassign(self):
+        with CaptureQueriesContext(connection) as queries:
+            moved = ChoreAssignment.objects.filter(pk__in=[self.pending[0].pk, self.done.pk]).reassign(self.other)
+        self.assertEqual(moved, 2)
+        self.assertEqual(len(self.updates(queries)), 1)
+        self.assertEqual(ChoreAssignment.objects.filter(child=self.other).count(), 2)
+        self.other.refresh_from_db()
+        self.assertEqual((self.other.total_points, self.other.completed_count), (5, 1))
+        self.assertConsistent()
+
+    def test_bulk_delete(self):
+        ChoreAssignment.objects.filter(pk=self.pending[0].pk).complete()
+        # Savepoint, credits, detach, reversals, stats, counters, delete, release
+        with self.assertNumQueries(8):
+            deleted = ChoreAssignment.objects.filter(date_assigned__lte=self.today).bulk_delete()
+        self.assertEqual(deleted, 4)
+        self.assertEqual(list(ChoreAssignment.objects.values_list('pk', flat=True)), [self.future.pk])
+        self.child.refresh_from_db()
+        self.assertEqual((self.child.total_points, self.child.completed_count), (0, 0))
+        self.assertConsistent()
+
+
+class ChoreAssignmentAdminTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'adminpass123')
+        self.client.force_login(self.user)
+        self.child = Child.objects.create(name="Alice", age=10)
+        self.other = Child.objects.create(name="Bob", age=8)
+        self.chore = Chore.objects.create(name="Dishes", points=5)
+        self.changelist = reverse('admin:chore_tracker_choreassignment_changelist')
+
+    def add_assignments(self, count):
+        return ChoreAssignment.objects.bulk_create(
+            ChoreAssignment(child=self.child, chore=self.chore, date_assigned=timezone.now().date())
+            for _ in range(count)
+        )
+
+    def query_count(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.add_assignments(3)
+        few = self.query_count(self.changelist)
+        self.add_assignments(40)
+        self.assertEqual(self.query_count(self.changelist), few)
+
+    def test_row_count_is_capped(self):
+        self.add_assignments(5)
+        with mock.patch.object(CappedCountPaginator, 'max_count', 3):
+            response = self.client.get(self.changelist)
+        self.assertEqual(response.context['cl'].result_count, 3)
+
+    def test_change_form_does_not_list_every_child(self):
+        response = self.client.get(reverse('admin:chore_tracker_choreassignment_add'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Bob")
+
+    def test_mark_completed_action(self):
+        assignments = self.add_assignments(2)
+        response = self.client.post(self.changelist, {
+            'action': 'mark_completed', '_selected_action': [a.pk for a in assignments],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.child.refresh_from_db()
+        self.assertEqual(self.child.total_points, 10)
+
+    def test_reassign_action_asks_for_the_child(self):
+        assignments = self.add_assignments(2)
+        data = {'action': 'reassign', '_selected_action': [a.pk for a in assignments]}
+        response = self.client.post(self.changelist, data)
+        self.assertTemplateUsed(response, 'admin/chore_tracker/choreassignment/confirm_action.html')
+
+        response = self.client.post(self.changelist, {**data, 'apply': '1', 'child': self.other.pk})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(ChoreAssignment.objects.filter(child=self.other).count(), 2)
+
+    def test_delete_action_confirms_first(self):
+        assignments = self.add_assignments(3)
+        data = {'action': 'delete_assignments', '_selected_action': [a.pk for a in assignments[:2]]}
+        response = self.client.post(self.changelist, data)
+        self.assertContains(response, "This will apply to 2 chore assignments.")
+        self.assertEqual(ChoreAssignment.objects.count(), 3)
+
+        self.client.post(self.changelist, {**data, 'apply': '1'})
+        self.assertEqual(list(ChoreAssignment.objects.values_list('pk', flat=True)), [assignments[2].pk])
+
+
+class CachedChoiceTests(QueryBudgetTestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.alice = Child.objects.create(name="Alice", age=10)
+        self.bob = Child.objects.create(name="Bob", age=8)
+        self.malia = Child.objects.create(name="Malia", age=6)
+        self.dishes = Chore.objects.create(name="Dishes", points=5)
+        self.today = timezone.now().date()
+
+    def data(self, **overrides):
+        return {'child': self.bob.pk, 'chore': self.dishes.pk, 'date_assigned': self.today, **overrides}
+
+    def table_queries(self, queries):
+        return [q['sql'] for q in queries.captured_queries
+                if 'FROM "chore_tracker_child"' in q['sql'] or 'FROM "chore_tracker_chore"' in q['sql']]
+
+    def test_choices_are_read_from_the_cache(self):
+        url = reverse('chore_assignment_create')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(self.table_queries(queries), [])
+        self.assertContains(response, f'<option value="{self.malia.pk}">Malia</option>', html=True)
+
+    def test_validation_does_not_query(self):
+        ChoreAssignmentForm(data=self.data()).is_valid()
+        with self.assertNumQueries(0):
+            form = ChoreAssignmentForm(data=self.data())
+            self.assertTrue(form.is_valid())
+
+        assignment = form.save()
+        self.assertEqual((assignment.child_id, assignment.chore_id), (self.bob.pk, self.dishes.pk))
+
+    def test_rows_missing_from_a_stale_cache_are_looked_up(self):
+        ChoreAssignmentForm(data=self.data()).is_valid()
+        # Added by another process, whose invalidation never reaches this process's cache
+        with mock.patch('chore_tracker.signals.invalidate_choices'):
+            cara = Child.objects.create(name="Cara", age=7)
+        with self.assertNumQueries(1):
+            self.assertTrue(ChoreAssignmentForm(data=self.data(child=cara.pk)).is_valid())
+        self.assertIn(cara.pk, cached_choices(Child))
+
+        form = ChoreAssignmentForm(data=self.data(child=cara.pk + 1))
+        self.assertFalse(form.is_valid())
+        self.assertIn('child', form.errors)
+
+    def test_rows_deleted_behind_a_stale_cache_are_form_errors(self):
+        assignment = ChoreAssignment.objects.create(child=self.alice, chore=self.dishes, date_assigned=self.today)
+        for url in (reverse('chore_assignment_create'), reverse('chore_assignment_edit', args=[assignment.pk])):
+            gone = Child.objects.create(name="Gone", age=9)
+            self.assertIn(gone.pk, cached_choices(Child))
+            # Deleted by another process, whose invalidation never reaches this process's cache
+            with mock.patch('chore_tracker.signals.invalidate_choices'):
+                Child.objects.filter(pk=gone.pk).delete()
+            self.assertIn(gone.pk, cached_choices(Child))
+
+            response = self.client.post(url, self.data(child=gone.pk))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context['form'].errors['child'],
+                             [CachedChoiceField.default_error_messages['invalid_choice']])
+            self.assertNotIn(gone.pk, cached_choices(Child))
+        self.assertEqual(ChoreAssignment.objects.get().child, self.alice)
+
+    def test_saves_and_deletes_refresh_the_choices(self):
+        self.assertTrue(ChoreAssignmentForm(data=self.data()).is_valid())
+        self.bob.name = "Robert"
+        self.bob.save()
+        self.assertContains(self.client.get(reverse('chore_assignment_create')), "Robert")
+
+        self.dishes.delete()
+        form = ChoreAssignmentForm(data=self.data())
+        self.assertFalse(form.is_valid())
+        self.assertIn('chore', form.errors)
+        self.assertFalse(ChoreAssignmentForm(data=self.data(chore='dishes')).is_valid())
+
+    def test_edit_keeps_the_current_choices(self):
+        assignment = ChoreAssignment.objects.create(child=self.alice, chore=self.dishes, date_assigned=self.today)
+        form = ChoreAssignmentForm(instance=assignment)
+        self.assertEqual((form['child'].value(), form['chore'].value()), (self.alice.pk, self.dishes.pk))
+
+        response = self.client.post(reverse('chore_assignment_edit', args=[assignment.pk]), self.data())
+        self.assertEqual(response.status_code, 302)
+        assignment.refresh_from_db()
+        self.assertEqual(assignment.child, self.bob)
+
+    @override_settings(CHORE_TRACKER_CHOICES_SELECT_LIMIT=2)
+    def test_long_lists_switch_to_autocomplete(self):
+        assignment = ChoreAssignment.objects.create(child=self.alice, chore=self.dishes, date_assigned=self.today)
+        response = self.client.get(reverse('chore_assignment_edit', args=[assignment.pk]))
+        self.assertContains(response, reverse('choice_autocomplete', args=['child']))
+        self.assertContains(response, f'value="Alice (#{self.alice.pk})"')
+        self.assertNotContains(response, "Malia")
+        # Chores are still few enough for a select
+        self.assertContains(response, f'<option value="{self.dishes.pk}" selected>Dishes</option>', html=True)
+
+    def test_autocomplete(self):
+        url = reverse('choice_autocomplete', args=['child'])
+        self.client.get(url, {'q': 'a'})
+        with self.assertNumQueries(0):
+            data = json.loads(self.client.get(url, {'q': 'a'}).content)
+        # Names starting with the term come first
+        self.assertEqual([result['text'] for result in data['results']], ['Alice', 'Malia'])
+        self.assertFalse(data['more'])
+
+        with mock.patch.object(views.ChoiceAutocompleteView, 'max_results', 1):
+            data = json.loads(self.client.get(url, {'q': 'a'}).content)
+        self.assertEqual(data['results'], [{'id': self.alice.pk, 'text': 'Alice'}])
+        self.assertTrue(data['more'])
+
+        self.assertEqual(self.client.get(reverse('choice_autocomplete', args=['user'])).status_code, 404)
+
+
+class ChoreAssignmentCompleteAPITests(QueryBudgetTestCase):
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.child = Child.objects.create(name="Alice", age=10)
+        self.chore = Chore.objects.create(name="Dishes", points=5)
+        self.pending = [
+            ChoreAssignment.objects.create(child=self.child, chore=self.chore, date_assigned=self.today)
+            for _ in range(3)
+        ]
+        self.done = ChoreAssignment.objects.create(child=self.child, chore=self.chore, date_assigned=self.today,
+                                                   completed=True, date_completed=self.today)
+        self.future = ChoreAssignment.objects.create(child=self.child, chore=self.chore,
+                                                     date_assigned=self.today + timedelta(days=2))
+        self.url = reverse('chore_assignment_complete_api')
+
+    def post(self, payload, key=None):
+        headers = {'Idempotency-Key': key} if key else {}
+        return self.client.post(self.url, json.dumps(payload), content_type='application/json', headers=headers)
+
+    def test_completes_batch_with_one_update(self):
+        ids = [a.pk for a in self.pending] + [self.done.pk, self.future.pk, 9999]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post({'ids': ids})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'completed': [a.pk for a in self.pending],
+            'already_completed': [self.done.pk],
+            'not_due': [self.future.pk],
+            'not_found': [9999],
+        })
+        updates = [q['sql'] for q in queries.captured_queries
+                   if q['sql'].startswith('UPDATE "chore_tracker_choreassignment"')]
+        self.assertEqual(len(updates), 1)
+        self.child.refresh_from_db()
+        self.assertEqual((self.child.total_points, self.child.completed_count), (20, 4))
+        call_command('rebuild_points_ledger', '--check', stdout=StringIO())
+
+    def test_repeat_without_key_is_a_no_op(self):
+        ids = [self.pending[0].pk]
+        self.post({'ids': ids})
+        response = self.post({'ids': ids})
+        self.assertEqual(response.json()['already_completed'], ids)
+        self.assertEqual(PointsLedger.objects.filter(assignment=self.pending[0]).count(), 1)
+
+    def test_idempotency_key_replays_response(self):
+        payload = {'ids': [self.pending[0].pk], 'date_completed': self.today.isoformat()}
+        first = self.post(payload, key='abc')
+        with self.assertNumQueries(1):
+            retry = self.post(payload, key='abc')
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry.json()['completed'], [self.pending[0].pk])
+
+        other = self.post({'ids': [self.pending[1].pk]}, key='abc')
+        self.assertEqual(other.status_code, 422)
+        self.assertFalse(ChoreAssignment.objects.get(pk=self.pending[1].pk).completed)
+
+    def test_expired_key_is_used_afresh(self):
+        self.post({'ids': [self.pending[0].pk]}, key='abc')
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        response = self.post({'ids': [self.pending[1].pk]}, key='abc')
+        self.assertEqual(response.json()['completed'], [self.pending[1].pk])
+        self.assertNotIn('Idempotent-Replayed', response)
+
+        IdempotencyKey.objects.create(key='old', fingerprint='', status_code=200, response={})
+        IdempotencyKey.objects.filter(key='old').update(created_at=timezone.now() - timedelta(days=2))
+        call_command('prune_idempotency_keys', stdout=StringIO())
+        self.assertEqual(list(IdempotencyKey.objects.values_list('key', flat=True)), ['abc'])
+
+    def test_invalid_requests(self):
+        for payload in ({}, {'ids': []}, {'ids': ['1']}, {'ids': [1], 'date_completed': 'soon'}, []):
+            self.assertEqual(self.post(payload).status_code, 400, payload)
+        self.assertEqual(self.post({'ids': [1]}, key='k' * 256).status_code, 400)
+        with mock.patch.object(views.ChoreAssignmentCompleteAPIView, 'max_ids', 2):
+            self.assertEqual(self.post({'ids': [1, 2, 3]}).status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_complete_view(self):
+        url = reverse('chore_assignment_complete', args=[self.pending[0].pk])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(url)
+        # Completed by the conditional UPDATE alone, without loading the assignment first
+        self.assertEqual([q['sql'].split()[0] for q in queries.captured_queries
+                          if '"chore_tracker_choreassignment"' in q['sql']], ['UPDATE'])
+        self.assertEqual(self.client.post(url).status_code, 302)
+        self.assertEqual(PointsLedger.objects.filter(assignment=self.pending[0]).count(), 1)
+        self.assertEqual(self.client.post(reverse('chore_assignment_complete', args=[9999])).status_code, 404)
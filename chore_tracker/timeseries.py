@@ -0,0 +1,73 @@
+from array import array
+from datetime import date, timedelta
+from itertools import accumulate
+
+BUCKETS = ('day', 'week', 'month')
+
+
+def _month_number(day):
+    return day.year * 12 + day.month - 1
+
+
+def bucket_start(day, bucket):
+    """Return the first day of the bucket containing ``day``; weeks start on Monday."""
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def bucket_labels(start_date, end_date, bucket='day'):
+    """Return the first day of every bucket overlapping start_date..end_date."""
+    first = bucket_start(start_date, bucket)
+    if bucket == 'month':
+        months = range(_month_number(first), _month_number(end_date) + 1)
+        return [date(month // 12, month % 12 + 1, 1) for month in months]
+    step = 7 if bucket == 'week' else 1
+    return [first + timedelta(days=offset) for offset in range(0, (end_date - first).days + 1, step)]
+
+
+def bucket_indexer(start_date, bucket='day'):
+    """Return a function mapping a date to its bucket's position in ``bucket_labels``."""
+    first = bucket_start(start_date, bucket)
+    if bucket == 'month':
+        first_month = _month_number(first)
+        return lambda day: _month_number(day) - first_month
+    if bucket == 'week':
+        return lambda day: (day - first).days // 7
+    return lambda day: (day - first).days
+
+
+def dense(rows, start_date, end_date, bucket='day', columns=1):
+    """Sum ``(date, value, ...)`` rows into zero-filled arrays, one per value column.
+
+    Returns ``(labels, [array, ...])``; rows outside the range are ignored.
+    Each row costs one index computation, so the work depends on the number
+    of aggregate rows and buckets rather than on the assignments behind them.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket {bucket!r}")
+    labels = bucket_labels(start_date, end_date, bucket)
+    index = bucket_indexer(start_date, bucket)
+    series = [array('q', bytes(8 * len(labels))) for _ in range(columns)]
+    for row in rows:
+        if start_date <= row[0] <= end_date:
+            position = index(row[0])
+            for values, value in zip(series, row[1:]):
+                values[position] += value
+    return labels, series
+
+
+def cumulative(values):
+    return array('q', accumulate(values))
+
+
+def rolling_mean(values, window):
+    """Trailing mean over ``window`` buckets; the first buckets average what is available."""
+    if window < 1:
+        raise ValueError('window must be at least 1')
+    sums = array('q', [0]) + cumulative(values)
+    return array('d', (
+        (sums[i + 1] - sums[max(0, i + 1 - window)]) / min(i + 1, window) for i in range(len(values))
+    ))
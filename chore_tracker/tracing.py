@@ -0,0 +1,127 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import uuid
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_trace_id = ContextVar('chore_tracker_trace_id', default=None)
+
+TRACE_HEADER = 'X-Chore-Trace'
+
+
+def tracing_enabled():
+    return _trace_id.get() is not None
+
+
+def trace(msg, *args):
+    """Log a trace message for the current request if it is being traced.
+
+    Arguments are only formatted when the message is emitted, so pass
+    objects such as querysets rather than pre-built strings: an untraced
+    request pays for one context variable lookup and nothing else.
+    """
+    if _trace_id.get() is not None:
+        logger.debug(msg, *args)
+
+
+def start_trace(trace_id=None):
+    """Trace everything in the current context; returns a token for ``stop_trace``."""
+    return _trace_id.set(trace_id or uuid.uuid4().hex)
+
+
+def stop_trace(token):
+    _trace_id.reset(token)
+
+
+def should_trace(request):
+    """Trace a request that carries the configured trace token, or a random sample of the rest."""
+    token = getattr(settings, 'CHORE_TRACKER_TRACE_TOKEN', None)
+    if token and request.headers.get(TRACE_HEADER) == token:
+        return True
+    rate = getattr(settings, 'CHORE_TRACKER_TRACE_SAMPLE_RATE', 0)
+    return rate > 0 and random.random() < rate
+
+
+class TracingMiddleware:
+    """Turn tracing on for sampled requests and for requests sent with the trace header.
+
+    Traced responses carry an ``X-Trace-Id`` header matching the ``trace_id``
+    on every log record written while handling them.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not should_trace(request):
+            return self.get_response(request)
+
+        token = self.start(request)
+        try:
+            return self.finish(self.get_response(request))
+        finally:
+            stop_trace(token)
+
+    async def __acall__(self, request):
+        if not should_trace(request):
+            return await self.get_response(request)
+
+        token = self.start(request)
+        try:
+            return self.finish(await self.get_response(request))
+        finally:
+            stop_trace(token)
+
+    def start(self, request):
+        token = start_trace()
+        trace('Tracing %s %s', request.method, request.get_full_path())
+        return token
+
+    def finish(self, response):
+        response['X-Trace-Id'] = _trace_id.get()
+        return response
+
+
+class TraceContextFilter(logging.Filter):
+    """Attach the current trace id (or ``-``) to every record as ``trace_id``."""
+
+    def filter(self, record):
+        record.trace_id = _trace_id.get() or '-'
+        return True
+
+
+class QueueFileHandler(logging.handlers.QueueHandler):
+    """Write log records to a file from a background thread.
+
+    Records are formatted on the logging thread and handed over through an
+    unbounded queue, so a slow disk never blocks a request.
+    """
+
+    def __init__(self, filename, mode='a', encoding=None, delay=True):
+        super().__init__(queue.SimpleQueue())
+        self.file_handler = logging.FileHandler(filename, mode, encoding, delay)
+        self.listener = logging.handlers.QueueListener(self.queue, self.file_handler)
+        self.listener.start()
+        self._stopped = False
+        atexit.register(self.close)
+
+    def close(self):
+        if not self._stopped:
+            self._stopped = True
+            self.listener.stop()
+            self.file_handler.close()
+        super().close()
@@ -7,14 +7,31 @@ urlpatterns = [
   path('children/<int:pk>/points/', views.ChildPointsView.as_view(), name='child_points'),
   path('children/<int:child_id>/calendar/', views.CalendarView.as_view(), name='child_calendar'),
   path('children/<int:child_id>/calendar/<int:year>/<int:month>/', views.CalendarView.as_view(), name='child_calendar_date'),
+  path('children/<int:child_id>/calendar/data/', views.CalendarDataView.as_view(), name='child_calendar_data'),
+  path('children/<int:child_id>/calendar/<int:year>/<int:month>/data/', views.CalendarDataView.as_view(), name='child_calendar_data_date'),
   path('children/<int:child_id>/graph/', views.ChoreGraphView.as_view(), name='chore_graph'),
   path('children/<int:child_id>/graph/data/', views.ChoreGraphDataView.as_view(), name='chore_graph_data'),
+  path('children/graph/', views.FamilyGraphView.as_view(), name='family_graph'),
+  path('children/graph/data/', views.FamilyGraphDataView.as_view(), name='family_graph_data'),
+  path('api/children/<int:child_id>/graph/', views.AsyncChoreGraphDataView.as_view(), name='chore_graph_data_async'),
+  path('api/children/<int:child_id>/calendar/', views.AsyncCalendarDataView.as_view(), name='child_calendar_data_async'),
+  path('api/children/<int:child_id>/calendar/<int:year>/<int:month>/', views.AsyncCalendarDataView.as_view(), name='child_calendar_data_async_date'),
+  path('api/children/<int:pk>/points/', views.ChildPointsDataView.as_view(), name='child_points_data'),
+  path('api/graph/', views.ChoreGraphBatchView.as_view(), name='chore_graph_data_batch'),
+  path('leaderboard/', views.LeaderboardView.as_view(), name='leaderboard'),
+  path('leaderboard/data/', views.LeaderboardDataView.as_view(), name='leaderboard_data'),
   path('child/add/', views.ChildCreateView.as_view(), name='child_create'),
   path('child/<int:pk>/edit/', views.ChildUpdateView.as_view(), name='child_edit'),
   path('children/<int:pk>/delete/', views.ChildDeleteView.as_view(), name='child_delete'),
 
   path('assignments/', views.ChoreAssignmentListView.as_view(), name='chore_assignment_list'),
   path('assignments/create/', views.ChoreAssignmentCreateView.as_view(), name='chore_assignment_create'),
+  path('assignments/bulk/', views.ChoreAssignmentBulkCreateView.as_view(), name='chore_assignment_bulk_create'),
+  path('assignments/import/', views.ChoreAssignmentImportView.as_view(), name='chore_assignment_import'),
+  path('assignments/export/', views.ChoreAssignmentExportView.as_view(), name='chore_assignment_export'),
+  path('api/assignments/bulk/', views.ChoreAssignmentBulkAPIView.as_view(), name='chore_assignment_bulk_api'),
+  path('api/assignments/complete/', views.ChoreAssignmentCompleteAPIView.as_view(), name='chore_assignment_complete_api'),
+  path('autocomplete/<str:kind>/', views.ChoiceAutocompleteView.as_view(), name='choice_autocomplete'),
   path('assignments/<int:pk>/edit/', views.ChoreAssignmentUpdateView.as_view(), name='chore_assignment_edit'),
   path('assignments/<int:pk>/delete/', views.ChoreAssignmentDeleteView.as_view(), name='chore_assignment_delete'),
   path('assignments/<int:pk>/complete/', views.ChoreAssignmentCompleteView.as_view(), name='chore_assignment_complete'),
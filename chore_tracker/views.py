@@ -1,109 +1,289 @@
+import asyncio
 import calendar
+import csv
+import io
+import itertools
+import json
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 from django.contrib import messages
-from django.db import connection
-from django.db.models import Count
-from django.db.models.functions import TruncDate
-from django.http import JsonResponse
-from django.shortcuts import render, get_object_or_404
-from django.urls import reverse_lazy
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connections, transaction
+from django.db.models import FilteredRelation
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect
+from django.template.response import TemplateResponse
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone
 from django.views import View
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView
-
-from .forms import ChoreForm, ChoreAssignmentForm
-from .models import Child, Chore, ChoreAssignment
+from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView, FormView
+
+from .cache import aget_or_set, child_key, child_validators, get_or_set, not_modified, set_validators
+from .choices import CHOICE_MODELS, invalidate_choices, search_choices
+from .exports import EXPORT_FORMATS, export_queryset
+from .imports import IMPORT_FORMATS, AssignmentImporter
+from .leaderboard import get_leaderboard
+from .forms import AssignmentExportForm, AssignmentImportForm, BulkChoreAssignmentForm, ChoreForm, ChoreAssignmentForm
+from .db import retry_on_locked
+from .models import (
+    POINT_PERIODS, Child, Chore, ChoreAssignment, DailyChildStats, IdempotencyKey, period_point_sums,
+)
+from .pagination import InvalidCursor, KeysetPaginator
+from .replicas import ReplicaReadMixin
+from .timeseries import BUCKETS, bucket_labels, cumulative as cumulative_sum, dense, rolling_mean
+from .tracing import trace
+
+# Longest range, in days, and rolling window, in buckets, a graph may ask for
+MAX_GRAPH_DAYS = 3660
+MAX_ROLLING_WINDOW = 366
 
 logger = logging.getLogger(__name__)
 
 
 class ChoreGraphView(View):
+    query_budget = 1
+
     def get(self, request, child_id):
         child = get_object_or_404(Child, pk=child_id)
-        return render(request, 'chore_tracker/chore_graph.html', {'child': child})
-
+        return TemplateResponse(request, 'chore_tracker/chore_graph.html', {'child': child})
+
+
+async def alist(queryset):
+    return [row async for row in queryset]
+
+
+def graph_date_range(request):
+    """Return the (start_date, end_date) query parameters, defaulting to the last 30 days."""
+    end_date = request.GET.get('end_date')
+    start_date = request.GET.get('start_date')
+
+    if not end_date:
+        end_date = timezone.now().date()
+    else:
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+
+    if not start_date:
+        start_date = end_date - timedelta(days=30)
+    else:
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+
+    if not 0 <= (end_date - start_date).days < MAX_GRAPH_DAYS:
+        raise ValueError(f"The date range must cover 1 to {MAX_GRAPH_DAYS} days")
+    return start_date, end_date
+
+
+def graph_options(request):
+    """Return the bucket, rolling window and cumulative flag requested for a graph."""
+    bucket = request.GET.get('bucket') or 'day'
+    if bucket not in BUCKETS:
+        raise ValueError(f"bucket must be one of {', '.join(BUCKETS)}")
+    rolling = int(request.GET.get('rolling') or 0)
+    if not 0 <= rolling <= MAX_ROLLING_WINDOW:
+        raise ValueError(f"rolling must be between 0 (no rolling average) and {MAX_ROLLING_WINDOW}")
+    cumulative_points = request.GET.get('cumulative', '').lower() in ('1', 'true', 'yes')
+    return {'bucket': bucket, 'rolling': rolling, 'cumulative': cumulative_points}
+
+
+def graph_queryset(child, start_date, end_date):
+    # Read the per-day rollup instead of re-aggregating raw assignments
+    return DailyChildStats.objects.filter(
+        child=child,
+        date__range=[start_date, end_date],
+        completed_count__gt=0
+    ).values_list('date', 'completed_count', 'points').order_by('date')
+
+
+def graph_response_data(rows, start_date, end_date, bucket='day', rolling=0, cumulative=False):
+    """Chart.js data for per-day ``(date, completed_count, points)`` rows, zero-filled over the whole range."""
+    labels, (counts, points) = dense(rows, start_date, end_date, bucket, columns=2)
+    datasets = [{
+        'label': 'Chores Completed',
+        'data': counts.tolist(),
+        'fill': False,
+        'borderColor': 'rgb(75, 192, 192)',
+        'tension': 0.1
+    }]
+    if rolling:
+        datasets.append({
+            'label': f'{rolling} {bucket} average',
+            'data': [round(value, 2) for value in rolling_mean(counts, rolling)],
+            'fill': False,
+            'borderColor': 'rgb(153, 102, 255)',
+            'borderDash': [5, 5],
+            'tension': 0.1
+        })
+    if cumulative:
+        datasets.append({
+            'label': 'Cumulative Points',
+            'data': cumulative_sum(points).tolist(),
+            'fill': False,
+            'borderColor': 'rgb(255, 159, 64)',
+            'tension': 0.1,
+            'yAxisID': 'points'
+        })
+    return {'labels': labels, 'bucket': bucket, 'datasets': datasets}
+
+
+class ChoreGraphDataView(ReplicaReadMixin, View):
+    query_budget = 2
 
-class ChoreGraphDataView(View):
     def get(self, request, child_id):
         try:
             child = get_object_or_404(Child, pk=child_id)
-
-            # Get the date range from query parameters, default to last 30 days
-            end_date = request.GET.get('end_date')
-            start_date = request.GET.get('start_date')
-
-            if not end_date:
-                end_date = timezone.now().date()
-            else:
-                end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-
-            if not start_date:
-                start_date = end_date - timedelta(days=30)
-            else:
-                start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-
-            print(f"Date range: {start_date} to {end_date}")
-
-            # Convert dates to strings for SQLite compatibility
-            start_date_str = start_date.strftime('%Y-%m-%d')
-            end_date_str = end_date.strftime('%Y-%m-%d')
-
-            # Query the database for completed chores
-            if connection.vendor == 'sqlite':
-                chore_data = ChoreAssignment.objects.filter(
-                    child=child,
-                    completed=True,
-                    date_completed__gte=start_date_str,
-                    date_completed__lte=end_date_str
-                ).extra(
-                    select={'date': "date(date_completed)"}
-                ).values('date').annotate(
-                    count=Count('id')
-                ).order_by('date')
-            else:
-                chore_data = ChoreAssignment.objects.filter(
-                    child=child,
-                    completed=True,
-                    date_completed__range=[start_date, end_date]
-                ).annotate(
-                    date=TruncDate('date_completed')
-                ).values('date').annotate(
-                    count=Count('id')
-                ).order_by('date')
-
-            print(f"Raw SQL query: {chore_data.query}")
-            results = list(chore_data)
-            print(f"Query results: {results}")
-
-            # Prepare data for the graph
-            dates = [item['date'] for item in results]
-            counts = [item['count'] for item in results]
-
-            response_data = {
-                'labels': dates,
-                'datasets': [{
-                    'label': 'Chores Completed',
-                    'data': counts,
-                    'fill': False,
-                    'borderColor': 'rgb(75, 192, 192)',
-                    'tension': 0.1
-                }]
-            }
-
-            print(f"Response data prepared: {response_data}")
-            return JsonResponse(response_data)
+            try:
+                start_date, end_date = graph_date_range(request)
+                options = graph_options(request)
+            except ValueError as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            trace('Graph data for child %s from %s to %s', child.pk, start_date, end_date)
+
+            etag, last_modified = child_validators(child, start_date, end_date, *options.values())
+            response = not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+
+            chore_data = graph_queryset(child, start_date, end_date)
+
+            def fetch():
+                results = list(chore_data)
+                # The query is only compiled to SQL again if this request is traced
+                trace('Graph data query %s returned %s rows', chore_data.query, len(results))
+                return results
+
+            results = get_or_set(child_key('graph-days', child, start_date, end_date), fetch)
+            data = graph_response_data(results, start_date, end_date, **options)
+            return set_validators(JsonResponse(data), etag, last_modified)
 
         except Exception as e:
-            print(f"Error in ChoreGraphDataView: {str(e)}")
+            logger.exception('Error in ChoreGraphDataView')
             return JsonResponse({'error': f'An error occurred: {str(e)}'}, status=500)
 
 
+class FamilyGraphView(View):
+    query_budget = 1
+
+    def get(self, request):
+        children = Child.objects.order_by('name', 'pk')
+        return TemplateResponse(request, 'chore_tracker/family_graph.html', {'children': children})
+
+
+class FamilyGraphDataView(ReplicaReadMixin, View):
+    """Completions per day for several children (``?child=1&child=2``, or every child) from one query.
+
+    Every series is zero-filled onto the same day-by-day axis so they can be
+    drawn together; the datasets are in the same Chart.js format as
+    ChoreGraphDataView's.
+    """
+    query_budget = 2
+    max_children = 50
+    colors = [
+        'rgb(75, 192, 192)', 'rgb(255, 99, 132)', 'rgb(54, 162, 235)',
+        'rgb(255, 159, 64)', 'rgb(153, 102, 255)', 'rgb(201, 203, 207)',
+    ]
+
+    def get(self, request):
+        try:
+            child_ids = {int(child_id) for child_id in request.GET.getlist('child')}
+            start_date, end_date = graph_date_range(request)
+            bucket = graph_options(request)['bucket']
+        except ValueError:
+            return JsonResponse({'error': 'child must be an id, dates YYYY-MM-DD and bucket day, week or month.'},
+                                status=400)
+
+        children = Child.objects.order_by('name', 'pk')
+        if child_ids:
+            children = children.filter(pk__in=child_ids)
+        children = list(children[:self.max_children + 1])
+        if len(children) > self.max_children:
+            return JsonResponse({'error': f'At most {self.max_children} children at a time.'}, status=400)
+
+        rows = {child.pk: [] for child in children}
+        completions = DailyChildStats.objects.filter(
+            child__in=list(rows), date__range=[start_date, end_date], completed_count__gt=0
+        ).values_list('child_id', 'date', 'completed_count')
+        for child_id, day, count in completions:
+            rows[child_id].append((day, count))
+        series = {child_id: dense(child_rows, start_date, end_date, bucket)[1][0] for child_id, child_rows in rows.items()}
+
+        return JsonResponse({
+            'labels': bucket_labels(start_date, end_date, bucket),
+            'bucket': bucket,
+            'datasets': [{
+                'label': child.name,
+                'data': series[child.pk].tolist(),
+                'fill': False,
+                'borderColor': self.colors[i % len(self.colors)],
+                'tension': 0.1
+            } for i, child in enumerate(children)],
+            'missing': sorted(child_ids - set(rows)),
+        })
+
+
+class AsyncChoreGraphDataView(ReplicaReadMixin, View):
+    """ChoreGraphDataView for ASGI: waits on the database without holding a worker thread."""
+    query_budget = 2
+
+    async def get(self, request, child_id):
+        try:
+            start_date, end_date = graph_date_range(request)
+            options = graph_options(request)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        child = await aget_object_or_404(Child, pk=child_id)
+
+        etag, last_modified = child_validators(child, start_date, end_date, *options.values())
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        results = await aget_or_set(
+            child_key('graph-days', child, start_date, end_date),
+            lambda: alist(graph_queryset(child, start_date, end_date)),
+        )
+        data = graph_response_data(results, start_date, end_date, **options)
+        return set_validators(JsonResponse(data), etag, last_modified)
+
+
+class ChoreGraphBatchView(ReplicaReadMixin, View):
+    """Graph data for several children (``?child=1&child=2``), fetched concurrently."""
+    max_children = 50
+
+    async def get(self, request):
+        try:
+            child_ids = {int(child_id) for child_id in request.GET.getlist('child')}
+            start_date, end_date = graph_date_range(request)
+            options = graph_options(request)
+        except ValueError:
+            return JsonResponse({'error': 'child must be an id, dates YYYY-MM-DD, and bucket and rolling valid.'},
+                                status=400)
+        if not child_ids or len(child_ids) > self.max_children:
+            return JsonResponse({'error': f'Give between 1 and {self.max_children} children.'}, status=400)
+
+        children = [child async for child in Child.objects.filter(pk__in=child_ids).order_by('pk')]
+        results = await asyncio.gather(*(
+            aget_or_set(
+                child_key('graph-days', child, start_date, end_date),
+                lambda child=child: alist(graph_queryset(child, start_date, end_date)),
+            )
+            for child in children
+        ))
+        return JsonResponse({
+            'start_date': start_date,
+            'end_date': end_date,
+            'children': {
+                child.pk: graph_response_data(rows, start_date, end_date, **options)
+                for child, rows in zip(children, results)
+            },
+            'missing': sorted(child_ids - {child.pk for child in children}),
+        })
+
+
 class ChildListView(ListView):
     model = Child
     template_name = 'chore_tracker/child_list.html'
     context_object_name = 'children'
+    query_budget = 1
 
 
 class ChildCreateView(CreateView):
@@ -134,6 +314,7 @@ class ChoreListView(ListView):
     model = Chore
     template_name = 'chore_tracker/chore_list.html'
     context_object_name = 'chores'
+    query_budget = 1
 
 
 class ChoreCreateView(CreateView):
@@ -149,6 +330,13 @@ class ChoreUpdateView(UpdateView):
     template_name = 'chore_tracker/chore_form.html'
     success_url = reverse_lazy('chore_list')
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        if form.cleaned_data['apply_retroactively']:
+            adjusted = self.object.apply_points_retroactively()
+            messages.success(self.request, f"Updated the points of {adjusted} completed chore assignments.")
+        return response
+
 
 class ChoreDeleteView(DeleteView):
     model = Chore
@@ -156,24 +344,100 @@ class ChoreDeleteView(DeleteView):
     success_url = reverse_lazy('chore_list')
 
 
+def sqlite_name_ordering(queryset, relation):
+    """Order assignments by the name of their ``relation``, child or chore, in a form SQLite reads from indexes.
+
+    Names are not unique, so SQLite can only follow the name index and then
+    each row's assignment index if the ordering says which row comes first
+    among equal names. Django compiles ``<relation>__id`` to the assignment's
+    own ``<relation>_id`` column, which SQLite does not connect to the joined
+    table's order, so the relation is joined again through a FilteredRelation,
+    which Django doesn't trim. Without ANALYZE statistics SQLite still
+    prefers scanning the assignments; an always true range on the name makes
+    it start from the name index instead. Both plans are compared in
+    QueryPlanTests.test_name_orderings_need_the_sqlite_form.
+
+    Returns the queryset and the ordering to use with it.
+    """
+    alias = f'sort_{relation}'
+    queryset = queryset.alias(**{alias: FilteredRelation(relation)}).filter(**{f'{alias}__name__gte': ''})
+    return queryset, (f'{alias}__name', f'{alias}__id', '-date_assigned', '-id')
+
+
 class ChoreAssignmentListView(ListView):
     model = ChoreAssignment
     template_name = 'chore_tracker/chore_assignment_list.html'
     context_object_name = 'chore_assignments'
+    paginate_by = 25
+    # A page is one query, plus one for each leading sort column whose value changes within it
+    query_budget = 3
+    # Every ordering ends in id so keyset pagination has a unique position per row
+    orderings = {
+        'date_assigned': ('date_assigned', 'id'),
+        '-date_assigned': ('-date_assigned', '-id'),
+        # By child (chore) name, newest first: assignment_child_order_idx (assignment_chore_order_idx)
+        # holds each child's (chore's) assignments in that order
+        'child_name': ('child__name', '-date_assigned', '-id'),
+        'chore_name': ('chore__name', '-date_assigned', '-id'),
+        'completed': ('completed', '-date_assigned', '-id'),
+    }
+    # Orderings by the name of a relation, which SQLite needs spelled out; see sqlite_name_ordering()
+    name_orderings = {
+        'child_name': 'child',
+        'chore_name': 'chore',
+    }
+
+    def get_ordering_key(self):
+        ordering = self.request.GET.get('order_by', '-date_assigned')
+        if ordering not in self.orderings:
+            ordering = '-date_assigned'
+        return ordering
 
     def get_queryset(self):
+        ordering = self.get_ordering_key()
         queryset = super().get_queryset().select_related('child', 'chore')
-        ordering = self.request.GET.get('order_by', '-date_assigned')
-        if ordering not in ['date_assigned', '-date_assigned', 'child_name', 'chore_name', 'completed']:
-            ordering = '-date_assigned'
-        if ordering == 'child_name':
-            return queryset.order_by('child__name', '-date_assigned')
-        elif ordering == 'chore_name':
-            return queryset.order_by('chore__name', '-date_assigned')
-        return queryset.order_by(ordering, '-date_assigned')
+        self.ordering_fields = self.orderings[ordering]
+        if ordering in self.name_orderings and connections[queryset.db].vendor == 'sqlite':
+            queryset, self.ordering_fields = sqlite_name_ordering(queryset, self.name_orderings[ordering])
+        return queryset.order_by(*self.ordering_fields)
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, self.ordering_fields, page_size)
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404("Invalid page cursor")
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['current_ordering'] = self.get_ordering_key()
+        return context
+
 
+class ChoreAssignmentFormMixin:
+    """Save a ChoreAssignmentForm, showing it again if its child or chore was deleted meanwhile.
 
-class ChoreAssignmentCreateView(CreateView):
+    The form checks the child and chore against this process's cached
+    choices, which a delete in another process does not invalidate; the
+    model's full_clean() on save is what notices the row has gone.
+    """
+
+    def form_valid(self, form):
+        try:
+            return super().form_valid(form)
+        except ValidationError as error:
+            gone = [name for name in ('child', 'chore') if name in getattr(error, 'error_dict', {})]
+            if not gone:
+                raise
+            for name in gone:
+                field = form.fields[name]
+                invalidate_choices(field.model)
+                form.add_error(name, ValidationError(field.error_messages['invalid_choice'], code='invalid_choice'))
+            return self.form_invalid(form)
+
+
+class ChoreAssignmentCreateView(ChoreAssignmentFormMixin, CreateView):
     model = ChoreAssignment
     form_class = ChoreAssignmentForm
     template_name = 'chore_tracker/chore_assignment_form.html'
@@ -183,7 +447,186 @@ class ChoreAssignmentCreateView(CreateView):
         return self.render_to_response(self.get_context_data(form=form))
 
 
-class ChoreAssignmentUpdateView(UpdateView):
+class ChoiceAutocompleteView(View):
+    """Children or chores whose name contains ``?q=``, for the assignment form's autocomplete inputs.
+
+    Matches come from the cached choice lists, so typing never queries the
+    database while the list is current.
+    """
+    query_budget = 1
+    max_results = 20
+
+    def get(self, request, kind):
+        model = CHOICE_MODELS.get(kind)
+        if model is None:
+            raise Http404("Unknown choice list")
+        matches = search_choices(model, request.GET.get('q', ''), self.max_results)
+        return JsonResponse({
+            'results': [{'id': pk, 'text': name} for pk, name in matches[:self.max_results]],
+            'more': len(matches) > self.max_results,
+        })
+
+
+class ChoreAssignmentBulkCreateView(FormView):
+    form_class = BulkChoreAssignmentForm
+    template_name = 'chore_tracker/chore_assignment_bulk_form.html'
+    success_url = reverse_lazy('chore_assignment_list')
+
+    def form_valid(self, form):
+        created, errors = ChoreAssignment.objects.bulk_assign(form.get_rows())
+        if errors:
+            for error in errors[:10]:
+                form.add_error(None, f"Row {error['row'] + 1}: {' '.join(error['errors'])}")
+            return self.form_invalid(form)
+        messages.success(self.request, f"Created {len(created)} chore assignments.")
+        return super().form_valid(form)
+
+
+class ChoreAssignmentBulkAPIView(View):
+    max_rows = 10000
+
+    def post(self, request):
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'error': 'Request body must be JSON.'}, status=400)
+        if not isinstance(payload, dict):
+            return JsonResponse({'error': 'Request body must be a JSON object.'}, status=400)
+
+        if 'assignments' in payload:
+            rows = payload['assignments']
+            if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                return JsonResponse({'error': 'assignments must be a list of objects.'}, status=400)
+        else:
+            form = BulkChoreAssignmentForm(data=payload)
+            if not form.is_valid():
+                return JsonResponse({'errors': form.errors}, status=400)
+            # A date range times the children and chores can be huge: stop generating past the limit
+            rows = list(itertools.islice(form.get_rows(), self.max_rows + 1))
+
+        if len(rows) > self.max_rows:
+            return JsonResponse({'error': f'At most {self.max_rows} assignments per request.'}, status=400)
+
+        created, errors = ChoreAssignment.objects.bulk_assign(rows)
+        if errors:
+            return JsonResponse({'created': 0, 'errors': errors}, status=400)
+        return JsonResponse({'created': len(created), 'ids': [a.pk for a in created]}, status=201)
+
+
+class ChoreAssignmentCompleteAPIView(View):
+    """Complete a batch of assignments: ``{"ids": [...], "date_completed": "YYYY-MM-DD"}``.
+
+    The pending assignments among ``ids`` are completed and credited by one
+    conditional UPDATE in one transaction; the response says what became of
+    every id. With an ``Idempotency-Key`` header the response is stored in
+    that transaction and a retry with the same key gets it back, marked by
+    an ``Idempotent-Replayed`` header, without touching the assignments.
+    """
+    max_ids = 1000
+
+    def post(self, request):
+        key = request.headers.get('Idempotency-Key', '')
+        if len(key) > IdempotencyKey._meta.get_field('key').max_length:
+            return JsonResponse({'error': 'Idempotency-Key is too long.'}, status=400)
+        fingerprint = IdempotencyKey.fingerprint_of(request)
+        if key:
+            stored = IdempotencyKey.objects.filter(key=key).first()
+            if stored and not stored.is_expired():
+                return self.replay(stored, fingerprint)
+            if stored:
+                stored.delete()
+
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'error': 'Request body must be JSON.'}, status=400)
+        if not isinstance(payload, dict):
+            return JsonResponse({'error': 'Request body must be a JSON object.'}, status=400)
+        ids = payload.get('ids')
+        if not isinstance(ids, list) or not ids or not all(type(pk) is int for pk in ids):
+            return JsonResponse({'error': 'ids must be a non-empty list of assignment ids.'}, status=400)
+        if len(ids) > self.max_ids:
+            return JsonResponse({'error': f'At most {self.max_ids} assignments per request.'}, status=400)
+        try:
+            day = date.fromisoformat(payload['date_completed']) if payload.get('date_completed') else None
+        except (TypeError, ValueError):
+            return JsonResponse({'error': 'date_completed must be an ISO date.'}, status=400)
+
+        try:
+            body = self.complete(set(ids), day, key, fingerprint)
+        except IntegrityError:
+            # A concurrent request with the same key committed first
+            stored = IdempotencyKey.objects.filter(key=key).first() if key else None
+            if stored is None:
+                raise
+            return self.replay(stored, fingerprint)
+        return JsonResponse(body)
+
+    @retry_on_locked
+    def complete(self, ids, day, key, fingerprint):
+        with transaction.atomic():
+            completed = ChoreAssignment.objects.filter(pk__in=ids).complete(day)
+            body = {'completed': completed, 'already_completed': [], 'not_due': [], 'not_found': []}
+            rest = ids.difference(completed)
+            if rest:
+                found = dict(ChoreAssignment.objects.filter(pk__in=rest).values_list('pk', 'completed'))
+                for pk in sorted(rest):
+                    if pk not in found:
+                        body['not_found'].append(pk)
+                    else:
+                        body['already_completed' if found[pk] else 'not_due'].append(pk)
+            if key:
+                IdempotencyKey.objects.create(key=key, fingerprint=fingerprint, status_code=200, response=body)
+        return body
+
+    def replay(self, stored, fingerprint):
+        if stored.fingerprint != fingerprint:
+            return JsonResponse({'error': 'Idempotency-Key was already used for a different request.'}, status=422)
+        response = JsonResponse(stored.response, status=stored.status_code)
+        response['Idempotent-Replayed'] = 'true'
+        return response
+
+
+class ChoreAssignmentImportView(FormView):
+    form_class = AssignmentImportForm
+    template_name = 'chore_tracker/chore_assignment_import.html'
+
+    def form_valid(self, form):
+        # Parse the upload as it is read instead of loading it into memory
+        file = io.TextIOWrapper(form.cleaned_data['file'], encoding='utf-8', newline='')
+        importer = AssignmentImporter(dry_run=form.cleaned_data['dry_run'])
+        try:
+            result = importer.run(IMPORT_FORMATS[form.cleaned_data['format']](file))
+        except (UnicodeDecodeError, csv.Error) as e:
+            form.add_error('file', f"Could not read the file: {e}")
+            return self.form_invalid(form)
+        finally:
+            file.detach()
+
+        if result.imported and not form.cleaned_data['dry_run']:
+            messages.success(self.request, f"Imported {result.imported} chore assignments.")
+        return self.render_to_response(self.get_context_data(form=form, result=result))
+
+
+class ChoreAssignmentExportView(View):
+    chunk_size = 2000
+
+    def get(self, request):
+        form = AssignmentExportForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors}, status=400)
+
+        export_format = form.cleaned_data['format'] or 'csv'
+        encode, content_type = EXPORT_FORMATS[export_format]
+        # Rows are read and encoded chunk by chunk as the response is sent
+        response = StreamingHttpResponse(
+            encode(export_queryset(**form.get_filters()), self.chunk_size), content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="chore-assignments.{export_format}"'
+        return response
+
+
+class ChoreAssignmentUpdateView(ChoreAssignmentFormMixin, UpdateView):
     model = ChoreAssignment
     form_class = ChoreAssignmentForm
     template_name = 'chore_tracker/chore_assignment_form.html'
@@ -196,86 +639,211 @@ class ChoreAssignmentDeleteView(DeleteView):
     success_url = reverse_lazy('chore_assignment_list')
 
 
-class ChoreAssignmentCompleteView(UpdateView):
-    model = ChoreAssignment
-    fields = ['completed', 'date_completed']
+class ChoreAssignmentCompleteView(View):
+    """The Mark Complete button: one conditional UPDATE, so a double submit completes the chore once."""
 
-    def form_valid(self, form):
-        form.instance.completed = True
-        form.instance.date_completed = form.cleaned_data.get('date_completed') or timezone.now().date()
-        return super().form_valid(form)
+    def post(self, request, pk):
+        try:
+            day = date.fromisoformat(request.POST['date_completed']) if request.POST.get('date_completed') else None
+        except ValueError:
+            messages.error(request, "Enter a valid completion date.")
+            return redirect('chore_assignment_list')
 
-    def get_success_url(self):
-        return reverse_lazy('chore_assignment_list')
+        if ChoreAssignment.objects.filter(pk=pk).complete(day):
+            messages.success(request, "Chore marked complete.")
+        elif not ChoreAssignment.objects.filter(pk=pk).exists():
+            raise Http404("No chore assignment found")
+        else:
+            messages.info(request, "That chore was already completed or is not due yet.")
+        return redirect('chore_assignment_list')
 
 
-class ChildPointsView(DetailView):
+class ChildPointsView(ReplicaReadMixin, DetailView):
     model = Child
     template_name = 'chore_tracker/child_points.html'
     context_object_name = 'child'
+    query_budget = 1
+
+    def get_queryset(self):
+        return Child.objects.with_point_totals()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         child = self.object
-        context['daily_points'] = child.get_points(period='day')
-        context['weekly_points'] = child.get_points(period='week')
-        context['monthly_points'] = child.get_points(period='month')
-        context['total_points'] = child.get_points(period='all')
+        context['daily_points'] = child.points_day
+        context['weekly_points'] = child.points_week
+        context['monthly_points'] = child.points_month
+        context['total_points'] = child.points_all
         return context
 
 
-class CalendarView(View):
-    def get(self, request, child_id, year=None, month=None):
-        child = get_object_or_404(Child, pk=child_id)
+def leaderboard_entry(entry):
+    return {'rank': entry.rank, 'child': {'id': entry.child_id, 'name': entry.name},
+            'points': entry.points, 'completed': entry.completed}
 
-        if year is None:
-            year = timezone.now().year
-        if month is None:
-            month = timezone.now().month
-
-        # Create a calendar object
-        cal = calendar.monthcalendar(year, month)
-
-        # Get all completed chore assignments for the month
-        start_date = datetime(year, month, 1)
-        end_date = start_date + timedelta(days=calendar.monthrange(year, month)[1])
-        assignments = ChoreAssignment.objects.filter(
-            child=child,
-            completed=True,
-            date_completed__range=[start_date, end_date]
-        )
 
-        # Create a dictionary of daily points
-        daily_points = {}
-        for assignment in assignments:
-            date = assignment.date_completed
-            if date in daily_points:
-                daily_points[date] += assignment.chore.points
-            else:
-                daily_points[date] = assignment.chore.points
-
-        # Create calendar data
-        calendar_data = []
-        for week in cal:
-            week_data = []
-            for day in week:
-                if day == 0:
-                    week_data.append({'day': '', 'points': ''})
-                else:
-                    date = datetime(year, month, day).date()
-                    points = daily_points.get(date, 0)
-                    week_data.append({'day': day, 'points': points})
-            calendar_data.append(week_data)
-
-        # Get previous and next month links
-        prev_month = datetime(year, month, 1) - timedelta(days=1)
-        next_month = datetime(year, month, 1) + timedelta(days=31)
-
-        context = {
-            'child': child,
-            'calendar_data': calendar_data,
-            'month': datetime(year, month, 1),
-            'prev_month': prev_month,
-            'next_month': next_month,
+class LeaderboardView(View):
+    """Children ranked by points for a period (``?period=day|week|month|all``)."""
+    query_budget = 1
+    period_labels = [('day', 'Today'), ('week', 'Last 7 Days'), ('month', 'Last 30 Days'), ('all', 'All Time')]
+
+    def get(self, request):
+        period = request.GET.get('period', 'week')
+        if period not in POINT_PERIODS:
+            period = 'week'
+        leaderboard = get_leaderboard(period)
+        return TemplateResponse(request, 'chore_tracker/leaderboard.html', {
+            'period': period,
+            'periods': self.period_labels,
+            'leaderboard': leaderboard,
+        })
+
+
+class LeaderboardDataView(View):
+    """The top ``limit`` children for a period as JSON, plus the standing of ``?child=`` if given.
+
+    Rankings are computed in one query and shared by every request until the
+    data changes, so neither the top-K nor the rank of a single child looks
+    at more than the entries it returns.
+    """
+    query_budget = 1
+    default_limit = 10
+    max_limit = 100
+
+    def get(self, request):
+        period = request.GET.get('period', 'all')
+        try:
+            limit = int(request.GET.get('limit', self.default_limit))
+            child_id = int(request.GET['child']) if request.GET.get('child') else None
+        except ValueError:
+            return JsonResponse({'error': 'limit and child must be integers.'}, status=400)
+        if period not in POINT_PERIODS:
+            return JsonResponse({'error': f"period must be one of {', '.join(POINT_PERIODS)}."}, status=400)
+        if not 1 <= limit <= self.max_limit:
+            return JsonResponse({'error': f'limit must be between 1 and {self.max_limit}.'}, status=400)
+
+        leaderboard = get_leaderboard(period)
+        data = {
+            'period': period,
+            'start_date': leaderboard.start_date,
+            'end_date': leaderboard.end_date,
+            'total': len(leaderboard),
+            'entries': [leaderboard_entry(entry) for entry in leaderboard.top(limit)],
         }
-        return render(request, 'chore_tracker/calendar.html', context)
+        if child_id is not None:
+            entry = leaderboard.rank_of(child_id)
+            if entry is None:
+                return JsonResponse({'error': f'Child {child_id} does not exist.'}, status=404)
+            data['child'] = leaderboard_entry(entry)
+        return JsonResponse(data)
+
+
+def month_bounds(year=None, month=None):
+    """Return the first and last day of a month, defaulting to the current one."""
+    today = timezone.now().date()
+    year = year or today.year
+    month = month or today.month
+    try:
+        first_day = date(year, month, 1)
+    except ValueError:
+        raise Http404("Invalid month")
+    return first_day, first_day.replace(day=calendar.monthrange(year, month)[1])
+
+
+def calendar_context(child, first_day, last_day, daily_points):
+    # Build the grid in a single pass over the month's calendar dates
+    calendar_data = [
+        [
+            {'day': day.day, 'points': daily_points.get(day, 0)} if day.month == first_day.month
+            else {'day': None, 'points': None}
+            for day in week
+        ]
+        for week in calendar.Calendar().monthdatescalendar(first_day.year, first_day.month)
+    ]
+
+    return {
+        'child': child,
+        'calendar_data': calendar_data,
+        'month': first_day,
+        'prev_month': first_day - timedelta(days=1),
+        'next_month': last_day + timedelta(days=1),
+    }
+
+
+def calendar_response(request, context):
+    """Render a calendar context as JSON, or a 304 if the client's copy is current."""
+    child = context['child']
+    etag, last_modified = child_validators(child, context['month'])
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    prev_month, next_month = context['prev_month'], context['next_month']
+    return set_validators(JsonResponse({
+        'child': {'id': child.id, 'name': child.name},
+        'year': context['month'].year,
+        'month': context['month'].month,
+        'weeks': context['calendar_data'],
+        'total_points': sum(day['points'] or 0 for week in context['calendar_data'] for day in week),
+        'prev': {
+            'year': prev_month.year,
+            'month': prev_month.month,
+            'url': reverse('child_calendar_data_date', args=[child.id, prev_month.year, prev_month.month]),
+        },
+        'next': {
+            'year': next_month.year,
+            'month': next_month.month,
+            'url': reverse('child_calendar_data_date', args=[child.id, next_month.year, next_month.month]),
+        },
+    }), etag, last_modified)
+
+
+class CalendarView(ReplicaReadMixin, View):
+    query_budget = 2
+
+    def get_calendar(self, child_id, year=None, month=None):
+        child = get_object_or_404(Child, pk=child_id)
+        first_day, last_day = month_bounds(year, month)
+
+        # One rollup row per day with completions, instead of one row per assignment
+        daily_points = get_or_set(child_key('calendar', child, first_day), lambda: dict(
+            child.daily_stats.filter(date__range=[first_day, last_day]).values_list('date', 'points')
+        ))
+        return calendar_context(child, first_day, last_day, daily_points)
+
+    def get(self, request, child_id, year=None, month=None):
+        context = self.get_calendar(child_id, year, month)
+        return TemplateResponse(request, 'chore_tracker/calendar.html', context)
+
+
+class CalendarDataView(CalendarView):
+    def get(self, request, child_id, year=None, month=None):
+        return calendar_response(request, self.get_calendar(child_id, year, month))
+
+
+class AsyncCalendarDataView(ReplicaReadMixin, View):
+    query_budget = 2
+
+    async def get(self, request, child_id, year=None, month=None):
+        child = await aget_object_or_404(Child, pk=child_id)
+        first_day, last_day = month_bounds(year, month)
+
+        async def fetch():
+            rows = child.daily_stats.filter(date__range=[first_day, last_day]).values_list('date', 'points')
+            return {day: points async for day, points in rows}
+
+        daily_points = await aget_or_set(child_key('calendar', child, first_day), fetch)
+        return calendar_response(request, calendar_context(child, first_day, last_day, daily_points))
+
+
+class ChildPointsDataView(ReplicaReadMixin, View):
+    """Points per reporting period for one child as JSON, from a single async aggregate."""
+    query_budget = 2
+
+    async def get(self, request, pk):
+        child = await aget_object_or_404(Child, pk=pk)
+        totals = await child.ledger_entries.aaggregate(**period_point_sums())
+        return JsonResponse({
+            'child': {'id': child.id, 'name': child.name},
+            'points': {period: totals[f'points_{period}'] for period in POINT_PERIODS},
+        })